@@ -9,14 +9,16 @@ from langchain_core.tools import tool
 from src.config import settings
 
 
-async def _api_request(method: str, endpoint: str, data: dict | None = None) -> dict:
+async def _api_request(
+    method: str, endpoint: str, data: dict | None = None, params: dict | None = None
+) -> dict:
     """Make request to I-Mart API."""
     url = f"{settings.IMART_API_URL}{endpoint}"
     async with aiohttp.ClientSession() as session:
-        async with session.request(method, url, json=data) as response:
+        async with session.request(method, url, json=data, params=params) as response:
             if response.status == 200:
                 return await response.json()
-            return {"error": f"API error: {response.status}"}
+            return {"error": f"API error: {response.status}", "status": response.status}
 
 
 @tool
@@ -31,11 +33,15 @@ async def search_products(query: str, category: str | None = None) -> str:
     Returns:
         List of matching products with name, price, and availability.
     """
-    params = {"q": query}
+    params = {"q": query, "mode": "semantic"}
     if category:
         params["category"] = category
 
-    result = await _api_request("GET", f"/api/products/search?q={query}")
+    result = await _api_request("GET", "/api/products/search", params=params)
+    if result.get("status") == 503:
+        # Semantic index not built yet; substring matching still works
+        params["mode"] = "keyword"
+        result = await _api_request("GET", "/api/products/search", params=params)
 
     if "error" in result:
         return f"Sorry, I couldn't search for products right now. {result['error']}"
@@ -76,6 +82,33 @@ async def get_product_details(product_id: str) -> str:
     )
 
 
+@tool
+async def get_recommendations(product_id: str) -> str:
+    """
+    Get products that customers frequently buy together with a product.
+
+    Args:
+        product_id: The unique identifier of the product.
+
+    Returns:
+        A short list of related products with name and price.
+    """
+    result = await _api_request("GET", f"/api/products/{product_id}/recommendations")
+
+    if "error" in result:
+        return "Sorry, I couldn't fetch recommendations right now."
+
+    products = result.get("products", [])
+    if not products:
+        return "I don't have any recommendations for this product yet."
+
+    response = "Customers who bought this also bought:\n"
+    for p in products:
+        response += f"- {p['name']}: ₹{p['price']}\n"
+
+    return response
+
+
 @tool
 async def add_to_cart(product_id: str, quantity: int = 1) -> str:
     """
@@ -177,6 +210,7 @@ async def get_categories() -> str:
 ALL_TOOLS = [
     search_products,
     get_product_details,
+    get_recommendations,
     add_to_cart,
     get_cart,
     get_order_status,
@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
 
 from core.config import settings
 from db.models.base import Base
-from db.models.users import User  # noqa: F401 - import models for autogenerate
+import db.models  # noqa: F401 - import models for autogenerate
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,36 @@
+"""order number sequence added
+
+Revision ID: 57a258a477a6
+Revises: 5c0e8a1f2d47
+Create Date: 2026-10-19 11:52:03.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57a258a477a6'
+down_revision: Union[str, Sequence[str], None] = '5c0e8a1f2d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('order_number_seq', start=100000)))
+    op.alter_column(
+        'order',
+        'order_number',
+        server_default=sa.text(
+            "'ORD-' || to_char(now(), 'YYMMDD') || '-' || nextval('order_number_seq')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('order', 'order_number', server_default=None)
+    op.execute(sa.schema.DropSequence(sa.Sequence('order_number_seq')))
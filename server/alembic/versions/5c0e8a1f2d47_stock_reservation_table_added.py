@@ -0,0 +1,46 @@
+"""stock reservation table added
+
+Revision ID: 5c0e8a1f2d47
+Revises: b1da97d7894f
+Create Date: 2026-10-19 11:14:37.581902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e8a1f2d47'
+down_revision: Union[str, Sequence[str], None] = 'b1da97d7894f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product', sa.Column('reserved_quantity', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('stock_reservation',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('product_id', sa.Uuid(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stock_reservation_expires_at'), 'stock_reservation', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_stock_reservation_user_id'), 'stock_reservation', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_stock_reservation_user_id'), table_name='stock_reservation')
+    op.drop_index(op.f('ix_stock_reservation_expires_at'), table_name='stock_reservation')
+    op.drop_table('stock_reservation')
+    op.drop_column('product', 'reserved_quantity')
@@ -0,0 +1,28 @@
+"""order user created_at index added
+
+Revision ID: 9e4b3c7d1a05
+Revises: 57a258a477a6
+Create Date: 2026-10-19 12:31:48.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b3c7d1a05'
+down_revision: Union[str, Sequence[str], None] = '57a258a477a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_user_id_created_at', 'order', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_user_id_created_at', table_name='order')
@@ -0,0 +1,36 @@
+"""product recommendation table added
+
+Revision ID: a4e7d2c9f813
+Revises: e5f19c2a8d64
+Create Date: 2026-10-19 16:12:05.481903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e7d2c9f813'
+down_revision: Union[str, Sequence[str], None] = 'e5f19c2a8d64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_recommendation',
+    sa.Column('product_id', sa.Uuid(), nullable=False),
+    sa.Column('rank', sa.SmallInteger(), nullable=False),
+    sa.Column('recommended_product_id', sa.Uuid(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+    sa.ForeignKeyConstraint(['recommended_product_id'], ['product.id'], ),
+    sa.PrimaryKeyConstraint('product_id', 'rank')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_recommendation')
@@ -0,0 +1,37 @@
+"""rate limit bucket table added
+
+Revision ID: b1da97d7894f
+Revises: 76bcf5e87ceb
+Create Date: 2026-10-19 10:02:11.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1da97d7894f'
+down_revision: Union[str, Sequence[str], None] = '76bcf5e87ceb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Unlogged: bucket state is disposable and must not add WAL traffic per request
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE rate_limit_bucket (
+            key VARCHAR(255) PRIMARY KEY,
+            tokens DOUBLE PRECISION NOT NULL,
+            allowed BOOLEAN NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rate_limit_bucket')
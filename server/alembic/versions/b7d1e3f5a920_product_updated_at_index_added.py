@@ -0,0 +1,28 @@
+"""product updated_at index added
+
+Revision ID: b7d1e3f5a920
+Revises: a4e7d2c9f813
+Create Date: 2026-10-19 16:48:31.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1e3f5a920'
+down_revision: Union[str, Sequence[str], None] = 'a4e7d2c9f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_product_updated_at', 'product', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_updated_at', table_name='product')
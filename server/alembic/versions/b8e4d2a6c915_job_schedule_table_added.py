@@ -0,0 +1,32 @@
+"""job schedule table added
+
+Revision ID: b8e4d2a6c915
+Revises: f6c2d8e4a193
+Create Date: 2026-10-19 21:12:40.518304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4d2a6c915'
+down_revision: Union[str, Sequence[str], None] = 'f6c2d8e4a193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_schedule',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_schedule')
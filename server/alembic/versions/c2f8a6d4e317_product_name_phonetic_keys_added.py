@@ -0,0 +1,163 @@
+"""product name phonetic keys added
+
+Revision ID: c2f8a6d4e317
+Revises: b7d1e3f5a920
+Create Date: 2026-10-19 17:21:44.063518
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8a6d4e317'
+down_revision: Union[str, Sequence[str], None] = 'b7d1e3f5a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of utils.phonetics as of this revision, so the backfill
+# produces the same keys however that module changes later.
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_VOWELS = frozenset("aeiou")
+_SILENT_STARTS = ("kn", "gn", "pn", "wr", "ps")
+_MAX_KEY_LENGTH = 6
+
+
+def _phonetic_key(word: str) -> str:
+    """
+    Metaphone-style sound key for one word: "Fillips" and "Philips" both give
+    "flps", "Nykaa" and "Nikka" both give "nk". Digits pass through unchanged
+    so model numbers still have to match exactly.
+    """
+    w = word.lower()
+    if not w:
+        return ""
+    if w.isdigit():
+        return w
+    if w.startswith(_SILENT_STARTS):
+        w = w[1:]
+    elif w.startswith("x"):
+        w = "s" + w[1:]
+    elif w.startswith("wh"):
+        w = "w" + w[2:]
+
+    out: list[str] = []
+    i, n = 0, len(w)
+    while i < n:
+        c = w[i]
+        nxt = w[i + 1] if i + 1 < n else ""
+        after = w[i + 2] if i + 2 < n else ""
+        code = ""
+        step = 1
+
+        if c in _VOWELS:
+            # Vowels only matter as a leading sound
+            code = "a" if i == 0 else ""
+        elif c.isdigit():
+            code = c
+        elif c == "b":
+            # Silent in a trailing "mb" ("thumb")
+            code = "" if i == n - 1 and i > 0 and w[i - 1] == "m" else "p"
+        elif c == "c":
+            if nxt == "h":
+                code, step = "x", 2
+            elif nxt in ("i", "e", "y"):
+                code = "s"
+            elif nxt == "k":
+                code, step = "k", 2
+            else:
+                code = "k"
+        elif c == "d":
+            if nxt == "g" and after in ("e", "i", "y"):
+                code, step = "j", 2
+            else:
+                code = "t"
+        elif c == "g":
+            if nxt == "h":
+                # "gh" is silent mid-word ("light") and hard at the start ("ghost")
+                code, step = ("k" if i == 0 else ""), 2
+            elif nxt in ("e", "i", "y"):
+                code = "j"
+            elif nxt == "n" and i + 2 >= n:
+                code = ""
+            else:
+                code = "k"
+        elif c == "h":
+            prev = w[i - 1] if i > 0 else ""
+            code = "h" if nxt in _VOWELS and prev not in _VOWELS else ""
+        elif c == "p":
+            code, step = ("f", 2) if nxt == "h" else ("p", 1)
+        elif c == "q":
+            code = "k"
+        elif c == "s":
+            if nxt == "h" or (nxt == "i" and after in ("o", "a")):
+                code, step = "x", 2
+            elif nxt == "c" and after == "h":
+                code, step = "sk", 3
+            else:
+                code = "s"
+        elif c == "t":
+            if nxt == "h":
+                code, step = "0", 2
+            elif nxt == "i" and after in ("o", "a"):
+                code = "x"
+            else:
+                code = "t"
+        elif c == "v":
+            code = "f"
+        elif c in ("w", "y"):
+            code = c if nxt in _VOWELS else ""
+        elif c == "x":
+            code = "ks"
+        elif c == "z":
+            code = "s"
+        else:
+            code = c
+
+        for ch in code:
+            # Doubled letters sound once ("Nikka" / "Nika")
+            if not out or out[-1] != ch:
+                out.append(ch)
+        i += step
+
+    return "".join(out)[:_MAX_KEY_LENGTH]
+
+
+def _phonetic_keys(text: str) -> list[str]:
+    """
+    Keys for every word and every adjacent word pair joined, so a brand that
+    speech-to-text splits ("air pods") still meets the one-word form
+    ("airpods") and vice versa.
+    """
+    words = _WORD_RE.findall(text.lower())
+    keys = {_phonetic_key(w) for w in words}
+    keys.update(_phonetic_key(a + b) for a, b in zip(words, words[1:]))
+    # Single consonants match far too much to be useful
+    return sorted(key for key in keys if len(key) > 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product', sa.Column('name_phonetic_keys', postgresql.ARRAY(sa.String(length=16)), server_default='{}', nullable=False))
+
+    # Keys are computed in Python, so backfill existing names here
+    bind = op.get_bind()
+    product = sa.table('product', sa.column('id', sa.Uuid()), sa.column('name', sa.String()), sa.column('name_phonetic_keys', postgresql.ARRAY(sa.String(length=16))))
+    rows = bind.execute(sa.select(product.c.id, product.c.name)).all()
+    update = product.update().where(product.c.id == sa.bindparam('product_id')).values(name_phonetic_keys=sa.bindparam('keys'))
+    for i in range(0, len(rows), 1000):
+        bind.execute(update, [{'product_id': row.id, 'keys': _phonetic_keys(row.name)} for row in rows[i:i + 1000]])
+
+    op.add_column('product_archive', sa.Column('name_phonetic_keys', postgresql.ARRAY(sa.String(length=16)), server_default='{}', nullable=False))
+    op.create_index('ix_product_name_phonetic_keys', 'product', ['name_phonetic_keys'], unique=False, postgresql_using='gin', postgresql_where=sa.text('is_active AND NOT is_deleted'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_name_phonetic_keys', table_name='product', postgresql_using='gin', postgresql_where=sa.text('is_active AND NOT is_deleted'))
+    op.drop_column('product_archive', 'name_phonetic_keys')
+    op.drop_column('product', 'name_phonetic_keys')
@@ -0,0 +1,49 @@
+"""job table added
+
+Revision ID: c83f1e9a6b20
+Revises: 9e4b3c7d1a05
+Create Date: 2026-10-19 13:40:22.316570
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c83f1e9a6b20'
+down_revision: Union[str, Sequence[str], None] = '9e4b3c7d1a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('priority', sa.SmallInteger(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_claim', 'job', ['priority', 'run_at'], unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+    op.create_index('ix_job_locked_at', 'job', ['locked_at'], unique=False, postgresql_where=sa.text("status = 'RUNNING'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_locked_at', table_name='job', postgresql_where=sa.text("status = 'RUNNING'"))
+    op.drop_index('ix_job_claim', table_name='job', postgresql_where=sa.text("status = 'PENDING'"))
+    op.drop_table('job')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=False)
@@ -0,0 +1,68 @@
+"""partial indexes and archive tables
+
+Revision ID: d2a7f4b91c3e
+Revises: c83f1e9a6b20
+Create Date: 2026-10-19 15:06:51.774120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4b91c3e'
+down_revision: Union[str, Sequence[str], None] = 'c83f1e9a6b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text('NOT is_deleted')
+LISTED = sa.text('is_active AND NOT is_deleted')
+
+
+def _create_archive_table(live: str) -> None:
+    # Same columns as the live table, without indexes or constraints
+    op.execute(f'CREATE TABLE "{live}_archive" (LIKE "{live}" INCLUDING DEFAULTS)')
+    op.add_column(
+        f'{live}_archive',
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_product_name', table_name='product')
+    op.create_index('ix_product_name', 'product', ['name'], unique=False, postgresql_where=LIVE)
+    op.drop_index('ix_product_slug', table_name='product')
+    op.create_index('ix_product_slug', 'product', ['slug'], unique=True, postgresql_where=LIVE)
+    op.create_index('ix_product_listing', 'product', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_where=LISTED)
+    op.create_index('ix_product_category_listing', 'product', ['category_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_where=LISTED)
+
+    op.drop_index('ix_category_slug', table_name='category')
+    op.create_index('ix_category_slug', 'category', ['slug'], unique=True, postgresql_where=LIVE)
+
+    op.drop_index('ix_order_user_id_created_at', table_name='order')
+    op.create_index('ix_order_user_id_created_at', 'order', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_where=LIVE)
+
+    for live in ('cart_item', 'product', 'address'):
+        _create_archive_table(live)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for live in ('address', 'product', 'cart_item'):
+        op.drop_table(f'{live}_archive')
+
+    op.drop_index('ix_order_user_id_created_at', table_name='order')
+    op.create_index('ix_order_user_id_created_at', 'order', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+    op.drop_index('ix_category_slug', table_name='category')
+    op.create_index('ix_category_slug', 'category', ['slug'], unique=True)
+
+    op.drop_index('ix_product_category_listing', table_name='product')
+    op.drop_index('ix_product_listing', table_name='product')
+    op.drop_index('ix_product_slug', table_name='product')
+    op.create_index('ix_product_slug', 'product', ['slug'], unique=True)
+    op.drop_index('ix_product_name', table_name='product')
+    op.create_index('ix_product_name', 'product', ['name'], unique=False)
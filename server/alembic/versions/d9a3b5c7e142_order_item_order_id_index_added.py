@@ -0,0 +1,28 @@
+"""order item order_id index added
+
+Revision ID: d9a3b5c7e142
+Revises: c2f8a6d4e317
+Create Date: 2026-10-19 18:05:12.650391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b5c7e142'
+down_revision: Union[str, Sequence[str], None] = 'c2f8a6d4e317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_item_order_id', 'order_item', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_item_order_id', table_name='order_item')
@@ -0,0 +1,63 @@
+"""sales rollup tables added
+
+Revision ID: e3b6f1a8c527
+Revises: d9a3b5c7e142
+Create Date: 2026-10-19 19:02:41.317254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b6f1a8c527'
+down_revision: Union[str, Sequence[str], None] = 'd9a3b5c7e142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table('sales_daily_category',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.Uuid(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ),
+    sa.PrimaryKeyConstraint('day', 'category_id')
+    )
+    op.create_table('sales_daily_product',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Uuid(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+    sa.PrimaryKeyConstraint('day', 'product_id')
+    )
+    op.create_table('rollup_watermark',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index('ix_order_updated_at', 'order', ['updated_at'], unique=False)
+    # Refreshes start from here; earlier days come from `workers.sales_rollups backfill`
+    op.execute("INSERT INTO rollup_watermark (name, value) VALUES ('sales', now())")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_updated_at', table_name='order')
+    op.drop_table('rollup_watermark')
+    op.drop_table('sales_daily_product')
+    op.drop_table('sales_daily_category')
+    op.drop_table('sales_daily')
@@ -0,0 +1,146 @@
+"""partition order tables by month
+
+Revision ID: e5f19c2a8d64
+Revises: d2a7f4b91c3e
+Create Date: 2026-10-19 16:48:09.530271
+
+Rebuilds "order" and order_item as RANGE-partitioned tables. Existing rows
+are copied into monthly partitions covering their created_at, plus three
+future months; the partition maintenance worker keeps creating months after
+that. The copy holds an exclusive lock on both tables for its duration, so
+run it in a maintenance window.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f19c2a8d64'
+down_revision: Union[str, Sequence[str], None] = 'd2a7f4b91c3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_COLUMNS = (
+    'user_id, order_number, status, total, shipping_address_id, notes, '
+    'id, created_at, updated_at, is_deleted'
+)
+ORDER_ITEM_COLUMNS = (
+    'order_id, product_id, quantity, unit_price, total_price, '
+    'id, created_at, updated_at, is_deleted'
+)
+
+# Monthly partitions <table>_yYYYYmMM covering [first of month, first of next
+# month) in UTC, from the oldest order's month through three months ahead.
+# Must stay in step with the names db.partitions gives later months.
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    month timestamp;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', coalesce(
+                (SELECT min(created_at) FROM order_unpartitioned), now()
+            ) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+            interval '1 month'
+        )
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF "order" FOR VALUES FROM (%L) TO (%L)',
+            'order' || to_char(month, '"_y"YYYY"m"MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF order_item FOR VALUES FROM (%L) TO (%L)',
+            'order_item' || to_char(month, '"_y"YYYY"m"MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END
+$$
+"""
+
+
+def _create_order_constraints(partitioned: bool) -> None:
+    op.create_foreign_key('order_user_id_fkey', 'order', 'user', ['user_id'], ['id'])
+    op.create_foreign_key('order_shipping_address_id_fkey', 'order', 'address', ['shipping_address_id'], ['id'])
+    op.create_foreign_key('order_item_product_id_fkey', 'order_item', 'product', ['product_id'], ['id'])
+    if partitioned:
+        op.create_foreign_key(
+            'order_item_order_id_order_created_at_fkey', 'order_item', 'order',
+            ['order_id', 'order_created_at'], ['id', 'created_at'],
+        )
+        op.create_index('ix_order_order_number', 'order', ['order_number'], unique=False)
+    else:
+        op.create_foreign_key('order_item_order_id_fkey', 'order_item', 'order', ['order_id'], ['id'])
+        op.create_index('ix_order_order_number', 'order', ['order_number'], unique=True)
+    op.create_index(
+        'ix_order_user_id_created_at', 'order',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False, postgresql_where=sa.text('NOT is_deleted'),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('ALTER TABLE order_item RENAME TO order_item_unpartitioned')
+    op.execute('ALTER TABLE "order" RENAME TO order_unpartitioned')
+    op.execute('ALTER INDEX ix_order_order_number RENAME TO ix_order_unpartitioned_order_number')
+    op.execute('ALTER INDEX ix_order_user_id_created_at RENAME TO ix_order_unpartitioned_user_id_created_at')
+
+    op.execute(
+        'CREATE TABLE "order" (LIKE order_unpartitioned INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (created_at)'
+    )
+    op.execute('ALTER TABLE "order" ADD CONSTRAINT order_pkey_partitioned PRIMARY KEY (id, created_at)')
+    op.execute(
+        'CREATE TABLE order_item (LIKE order_item_unpartitioned INCLUDING DEFAULTS, '
+        'order_created_at TIMESTAMP WITH TIME ZONE NOT NULL) '
+        'PARTITION BY RANGE (order_created_at)'
+    )
+    op.execute('ALTER TABLE order_item ADD CONSTRAINT order_item_pkey_partitioned PRIMARY KEY (id, order_created_at)')
+
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+    op.execute(f'INSERT INTO "order" ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM order_unpartitioned')
+    op.execute(
+        f'INSERT INTO order_item ({ORDER_ITEM_COLUMNS}, order_created_at) '
+        f'SELECT {", ".join("oi." + c.strip() for c in ORDER_ITEM_COLUMNS.split(","))}, o.created_at '
+        'FROM order_item_unpartitioned oi JOIN order_unpartitioned o ON o.id = oi.order_id'
+    )
+
+    op.drop_table('order_item_unpartitioned')
+    op.drop_table('order_unpartitioned')
+    op.execute('ALTER TABLE "order" RENAME CONSTRAINT order_pkey_partitioned TO order_pkey')
+    op.execute('ALTER TABLE order_item RENAME CONSTRAINT order_item_pkey_partitioned TO order_item_pkey')
+    _create_order_constraints(partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER TABLE order_item RENAME TO order_item_partitioned')
+    op.execute('ALTER TABLE "order" RENAME TO order_partitioned')
+    op.execute('ALTER INDEX ix_order_order_number RENAME TO ix_order_partitioned_order_number')
+    op.execute('ALTER INDEX ix_order_user_id_created_at RENAME TO ix_order_partitioned_user_id_created_at')
+
+    op.execute('CREATE TABLE "order" (LIKE order_partitioned INCLUDING DEFAULTS)')
+    op.execute('ALTER TABLE "order" ADD CONSTRAINT order_pkey_unpartitioned PRIMARY KEY (id)')
+    op.execute('CREATE TABLE order_item (LIKE order_item_partitioned INCLUDING DEFAULTS)')
+    op.execute('ALTER TABLE order_item DROP COLUMN order_created_at')
+    op.execute('ALTER TABLE order_item ADD CONSTRAINT order_item_pkey_unpartitioned PRIMARY KEY (id)')
+
+    op.execute(f'INSERT INTO "order" ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM order_partitioned')
+    op.execute(f'INSERT INTO order_item ({ORDER_ITEM_COLUMNS}) SELECT {ORDER_ITEM_COLUMNS} FROM order_item_partitioned')
+
+    # Dropping a partitioned table drops its partitions
+    op.drop_table('order_item_partitioned')
+    op.drop_table('order_partitioned')
+    op.execute('ALTER TABLE "order" RENAME CONSTRAINT order_pkey_unpartitioned TO order_pkey')
+    op.execute('ALTER TABLE order_item RENAME CONSTRAINT order_item_pkey_unpartitioned TO order_item_pkey')
+    _create_order_constraints(partitioned=False)
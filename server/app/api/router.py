@@ -1,9 +1,15 @@
 from fastapi import APIRouter
 
+from api.routes.admin import router as admin_router
 from api.routes.auth import router as auth_router
+from api.routes.cart import router as cart_router
+from api.routes.orders import router as orders_router
 from api.routes.products import router as products_router
 
 router = APIRouter(prefix="/api")
 
+router.include_router(admin_router)
 router.include_router(auth_router)
+router.include_router(cart_router)
+router.include_router(orders_router)
 router.include_router(products_router)
@@ -0,0 +1,184 @@
+import logging
+from datetime import date, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.deps import get_current_admin
+from core.result_cache import product_list_cache
+from db.query_stats import query_stats
+from db.session import get_db
+from middleware.query_budget import query_budget
+from schemas.admin import (
+    CategorySalesReportResponse,
+    CategorySalesResponse,
+    DailySalesReportResponse,
+    DailySalesResponse,
+    ProductSalesReportResponse,
+    ProductSalesResponse,
+    QueryStatResponse,
+    QueryStatsResponse,
+    ResultCacheStatsResponse,
+)
+from services.sales_rollup import SalesRollupService, today
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/query-stats", response_model=QueryStatsResponse)
+async def get_query_stats(
+    _admin=Depends(get_current_admin),
+    limit: int = Query(20, ge=1, le=200, description="Number of statements to return"),
+    order_by: Literal["total", "p95", "count", "max"] = Query(
+        "total", description="Ranking of the statements"
+    ),
+):
+    """
+    Top sampled statements of this worker process, grouped by normalised SQL (admin only).
+    """
+    return QueryStatsResponse(
+        sample_rate=query_stats.sample_rate,
+        slow_threshold_ms=query_stats.slow_threshold_ms,
+        dropped=query_stats.dropped,
+        statements=[
+            QueryStatResponse(
+                fingerprint=fingerprint,
+                count=stats.count,
+                total_ms=round(stats.total_ms, 3),
+                mean_ms=round(stats.total_ms / stats.count, 3),
+                p95_ms=round(stats.p95_ms, 3),
+                max_ms=round(stats.max_ms, 3),
+            )
+            for fingerprint, stats in query_stats.top(limit, order_by)
+        ],
+    )
+
+
+@router.delete("/query-stats", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_stats(_admin=Depends(get_current_admin)):
+    """Clear this worker's query statistics (admin only)."""
+    logger.info("Query statistics reset")
+    query_stats.reset()
+
+
+@router.get("/cache-stats", response_model=ResultCacheStatsResponse)
+async def get_cache_stats(_admin=Depends(get_current_admin)):
+    """
+    Product listing result cache counters of this worker process (admin only).
+    Coalesced lookups waited on an in-flight load and count as hits.
+    """
+    stats = product_list_cache.stats()
+    return ResultCacheStatsResponse(
+        hits=stats.hits,
+        misses=stats.misses,
+        coalesced=stats.coalesced,
+        hit_ratio=round(stats.hit_ratio, 4),
+        entries=stats.entries,
+        bytes=stats.bytes,
+        max_bytes=stats.max_bytes,
+        catalog_version=stats.version,
+    )
+
+
+def _report_range(
+    start: date | None = Query(None, description="First day (default: 29 days before end)"),
+    end: date | None = Query(
+        None, description="Last day, inclusive (default: today in SALES_ROLLUP_TIMEZONE)"
+    ),
+) -> tuple[date, date]:
+    end = end or today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    return start, end
+
+
+# Sales reports read only the daily rollups (workers.sales_rollups), never
+# order_item. Statements: admin lookup, watermark, report.
+@router.get("/sales/daily", response_model=DailySalesReportResponse)
+@query_budget(3)
+async def get_daily_sales(
+    _admin=Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+    report_range: tuple[date, date] = Depends(_report_range),
+):
+    """Orders, units and revenue per day (admin only)."""
+    start, end = report_range
+    service = SalesRollupService(db)
+    return DailySalesReportResponse(
+        start=start,
+        end=end,
+        rollup_watermark=await service.watermark(),
+        days=[
+            DailySalesResponse(
+                day=totals.key,
+                order_count=totals.order_count,
+                units=totals.units,
+                revenue=totals.revenue,
+            )
+            for totals in await service.daily(start, end)
+        ],
+    )
+
+
+# Admin lookup, watermark, report
+@router.get("/sales/categories", response_model=CategorySalesReportResponse)
+@query_budget(3)
+async def get_category_sales(
+    _admin=Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+    report_range: tuple[date, date] = Depends(_report_range),
+    limit: int = Query(20, ge=1, le=100, description="Number of categories to return"),
+):
+    """Categories with the highest revenue over the range (admin only)."""
+    start, end = report_range
+    service = SalesRollupService(db)
+    return CategorySalesReportResponse(
+        start=start,
+        end=end,
+        rollup_watermark=await service.watermark(),
+        categories=[
+            CategorySalesResponse(
+                category_id=totals.key,
+                name=totals.name,
+                units=totals.units,
+                revenue=totals.revenue,
+            )
+            for totals in await service.top_categories(start, end, limit)
+        ],
+    )
+
+
+# Admin lookup, watermark, report
+@router.get("/sales/products", response_model=ProductSalesReportResponse)
+@query_budget(3)
+async def get_product_sales(
+    _admin=Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+    report_range: tuple[date, date] = Depends(_report_range),
+    limit: int = Query(20, ge=1, le=100, description="Number of products to return"),
+):
+    """Products with the highest revenue over the range (admin only)."""
+    start, end = report_range
+    service = SalesRollupService(db)
+    return ProductSalesReportResponse(
+        start=start,
+        end=end,
+        rollup_watermark=await service.watermark(),
+        products=[
+            ProductSalesResponse(
+                product_id=totals.key,
+                name=totals.name,
+                order_count=totals.order_count,
+                units=totals.units,
+                revenue=totals.revenue,
+            )
+            for totals in await service.top_products(start, end, limit)
+        ],
+    )
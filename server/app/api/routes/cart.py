@@ -0,0 +1,85 @@
+import logging
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.deps import get_current_user_id
+from db.session import get_db
+from schemas.cart import AddCartItemRequest, CartReservationResponse, CartResponse
+from services.cart import CartService
+from services.inventory import InsufficientStockError, InventoryService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/cart", tags=["cart"])
+
+
+@router.get("", response_model=CartResponse)
+async def get_cart(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the current user's cart with current prices and totals.
+    """
+    logger.info("Fetching cart for user_id=%s", user_id)
+    return await CartService(db).get_cart(user_id)
+
+
+@router.post("/items", response_model=CartResponse)
+async def add_cart_item(
+    request: AddCartItemRequest,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Add a product to the current user's cart, increasing the quantity if it is already there.
+    """
+    logger.info(
+        "Adding product_id=%s x%d to cart for user_id=%s",
+        request.product_id,
+        request.quantity,
+        user_id,
+    )
+    cart_service = CartService(db)
+
+    if not await cart_service.add_item(user_id, request.product_id, request.quantity):
+        logger.warning("Add to cart failed: product not available product_id=%s", request.product_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found",
+        )
+
+    return await cart_service.get_cart(user_id)
+
+
+@router.post("/reserve", response_model=CartReservationResponse)
+async def reserve_cart(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Hold stock for everything in the cart while the user completes checkout.
+    Holds expire automatically; calling this again refreshes them.
+    """
+    logger.info("Reserving cart for user_id=%s", user_id)
+
+    try:
+        expires_at = await InventoryService(db).reserve_cart(user_id)
+    except InsufficientStockError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": str(e),
+                "product_ids": [str(product_id) for product_id in e.product_ids],
+            },
+        )
+    except ValueError as e:
+        logger.warning("Cart reservation failed: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return CartReservationResponse(expires_at=expires_at)
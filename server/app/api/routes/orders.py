@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncGenerator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.deps import get_current_admin, get_current_user_id
+from core.config import settings
+from core.events import order_event_broker
+from db.session import get_db
+from middleware.query_budget import query_budget
+from schemas.order import (
+    CheckoutRequest,
+    OrderListResponse,
+    OrderResponse,
+    OrderStatusUpdateRequest,
+)
+from services.inventory import InsufficientStockError
+from services.order import OrderService
+from utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+
+@router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+async def checkout(
+    request: CheckoutRequest,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Place an order for everything in the current user's cart.
+    Stock for all lines is decremented atomically; if any line is short, nothing is ordered.
+    """
+    logger.info("Checkout attempt started for user_id=%s", user_id)
+    order_service = OrderService(db)
+
+    try:
+        order = await order_service.checkout(
+            user_id, request.shipping_address_id, request.notes
+        )
+    except InsufficientStockError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": str(e),
+                "product_ids": [str(product_id) for product_id in e.product_ids],
+            },
+        )
+    except ValueError as e:
+        logger.warning("Checkout failed: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    logger.info("Checkout successful: order_number=%s", order.order_number)
+    return OrderResponse.model_validate(order)
+
+
+# Orders, then their items and the items' products, one IN query each
+@router.get("", response_model=OrderListResponse)
+@query_budget(3)
+async def get_orders(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(20, ge=1, le=50, description="Number of orders to return"),
+    cursor: str | None = Query(None, description="Cursor for pagination"),
+):
+    """
+    Get the current user's order history, newest first, with cursor-based pagination.
+    """
+    logger.info("Fetching orders for user_id=%s with limit=%d, cursor=%s", user_id, limit, cursor)
+
+    after = None
+    if cursor:
+        after = decode_cursor(cursor)
+        if after is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    # Fetch one extra to determine has_more
+    orders = await OrderService(db).list_orders(user_id, limit + 1, after)
+
+    has_more = len(orders) > limit
+    if has_more:
+        orders = orders[:limit]
+
+    next_cursor = None
+    if has_more and orders:
+        last_order = orders[-1]
+        next_cursor = encode_cursor(last_order.created_at, last_order.id)
+
+    logger.info("Found %d orders (has_more: %s)", len(orders), has_more)
+
+    return OrderListResponse(
+        orders=[OrderResponse.model_validate(o) for o in orders],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+async def _order_event_stream(user_id: uuid.UUID) -> AsyncGenerator[bytes, None]:
+    subscription = order_event_broker.subscribe(user_id)
+    try:
+        # Tells EventSource clients how long to wait before reconnecting
+        yield b"retry: 5000\n\n"
+        while not subscription.overflowed:
+            try:
+                yield await asyncio.wait_for(
+                    subscription.queue.get(), settings.SSE_HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                # Keeps proxies from closing idle connections and detects gone clients
+                yield b": ping\n\n"
+        logger.warning("Order event stream overflowed for user_id=%s", user_id)
+    finally:
+        order_event_broker.unsubscribe(subscription)
+
+
+# Declared before /{order_id} so "events" is not parsed as an order ID
+@router.get("/events")
+async def stream_order_events(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+):
+    """
+    Stream the current user's order status changes as Server-Sent Events.
+    """
+    logger.info("Order event stream opened for user_id=%s", user_id)
+    return StreamingResponse(
+        _order_event_stream(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Order, items, products
+@router.get("/{order_id}", response_model=OrderResponse)
+@query_budget(3)
+async def get_order_details(
+    order_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get one of the current user's orders with its items.
+    """
+    logger.info("Fetching order details for order_id=%s", order_id)
+
+    order = await OrderService(db).get_order(user_id, order_id)
+    if order is None:
+        logger.warning("Order not found: order_id=%s", order_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found",
+        )
+
+    return OrderResponse.model_validate(order)
+
+
+@router.patch("/{order_id}/status", response_model=OrderResponse)
+async def update_order_status(
+    order_id: uuid.UUID,
+    request: OrderStatusUpdateRequest,
+    _admin=Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Change an order's status (admin only). The owner is notified over /orders/events.
+    """
+    order = await OrderService(db).set_status(order_id, request.status)
+    if order is None:
+        logger.warning("Order not found: order_id=%s", order_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found",
+        )
+
+    return OrderResponse.model_validate(order)
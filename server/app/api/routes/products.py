@@ -1,124 +1,299 @@
-import base64
 import json
 import logging
 import uuid
-from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy import or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
+from api.deps import get_current_admin
+from core.cache import LocalCache, register_cache
+from core.config import settings
+from core.result_cache import product_list_cache
 from db.models.product import Product
 from db.session import get_db
-from schemas.product import ProductDetailResponse, ProductListResponse, ProductResponse
+from middleware.compression import PrecompressedResponse
+from middleware.query_budget import query_budget
+from schemas.product import (
+    ProductBulkUpdateRequest,
+    ProductBulkUpdateResponse,
+    ProductDetailResponse,
+    ProductListResponse,
+    ProductRecommendationsResponse,
+    ProductResponse,
+    ProductSearchResponse,
+    sparse_product_model,
+)
+from services.catalog import CatalogService
+from services.recommendations import RecommendationService
+from services.search import ProductSearchService, SemanticIndexUnavailableError
+from utils.compression import CompressedPayload
+from utils.pagination import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Keyed by str(product_id); holds serialized, lazily compressed responses.
+# Evicted on every worker by product writes.
+product_detail_cache = register_cache("product", LocalCache(maxsize=10_000, ttl=60))
 
-def encode_cursor(created_at: datetime, product_id: uuid.UUID) -> str:
-    """Encode created_at and product_id into a cursor string."""
-    data = {"created_at": created_at.isoformat(), "id": str(product_id)}
-    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
 
-
-def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID] | None:
-    """Decode cursor string into created_at and product_id."""
-    try:
-        data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
-        return datetime.fromisoformat(data["created_at"]), uuid.UUID(data["id"])
-    except (ValueError, KeyError, json.JSONDecodeError):
+def _parse_fields(fields: str | None, allowed: dict) -> tuple[str, ...] | None:
+    """Validate a comma-separated `fields=` value against a response model's fields."""
+    if fields is None:
         return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(requested.difference(allowed))
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields given",
+        )
+    # Canonical order, so equivalent requests share cache entries
+    return tuple(name for name in allowed if name in requested)
+
+
+def _product_columns(fields: tuple[str, ...], include_category: bool) -> list:
+    """Product columns needed to render `fields` and page the listing."""
+    names = {"id", "created_at", *fields}
+    if "available_quantity" in names:
+        names.discard("available_quantity")
+        names.update(("stock_quantity", "reserved_quantity"))
+    if include_category:
+        names.add("category_id")
+    return [getattr(Product, name) for name in sorted(names)]
+
+
+def cache_product_detail(product: Product) -> CompressedPayload:
+    """Serialize a product (with its category loaded) into the detail cache."""
+    payload = CompressedPayload(
+        ProductDetailResponse.model_validate(product).model_dump_json().encode()
+    )
+    product_detail_cache.set(str(product.id), payload)
+    return payload
 
 
+def _detail_response(
+    payload: CompressedPayload, fields: tuple[str, ...] | None, accept_encoding: str
+) -> Response:
+    if fields is None:
+        return PrecompressedResponse(payload, accept_encoding)
+    # Project from the cached full document rather than querying again
+    document = json.loads(payload.body)
+    return Response(
+        json.dumps({name: document[name] for name in fields}, separators=(",", ":")),
+        media_type="application/json",
+    )
+
+
+# One statement, plus one for include=category
 @router.get("", response_model=ProductListResponse)
+@query_budget(2)
 async def get_all_products(
     db: AsyncSession = Depends(get_db),
     limit: int = Query(20, ge=1, le=100, description="Number of products to return"),
     cursor: str | None = Query(None, description="Cursor for pagination"),
     category_id: uuid.UUID | None = Query(None, description="Filter by category ID"),
     search: str | None = Query(None, description="Search products by name or description"),
+    fields: str | None = Query(
+        None, description="Comma-separated product fields to return, e.g. id,name,price"
+    ),
+    include: Literal["category"] | None = Query(
+        None, description="Embed each product's category"
+    ),
+    accept_encoding: str = Header("", include_in_schema=False),
 ):
     """
     Get all active products with cursor-based pagination and optional filtering.
+    `fields` limits both the columns read and the payload; `include=category`
+    loads the page's categories in one extra query. Pages are served from a
+    result cache that any product or category write invalidates.
     """
     logger.info("Fetching products with limit=%d, cursor=%s, search=%s", limit, cursor, search)
 
-    query = select(Product).where(
-        Product.is_deleted == False,
-        Product.is_active == True,
-    )
-
-    if category_id is not None:
-        query = query.where(Product.category_id == category_id)
-
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                Product.name.ilike(search_pattern),
-                Product.description.ilike(search_pattern),
-            )
-        )
+    selected = _parse_fields(fields, ProductResponse.model_fields)
+    include_category = include == "category"
+    # ILIKE ignores case, so these spellings share one cache entry
+    search = " ".join(search.split()).lower() if search else None
 
-    # Apply cursor filter if provided
+    after = None
     if cursor:
-        decoded = decode_cursor(cursor)
-        if decoded is None:
+        after = decode_cursor(cursor)
+        if after is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid cursor",
             )
-        cursor_created_at, cursor_id = decoded
-        # Get items with created_at < cursor OR (created_at == cursor AND id < cursor_id)
-        query = query.where(
-            or_(
-                Product.created_at < cursor_created_at,
-                tuple_(Product.created_at, Product.id) < tuple_(cursor_created_at, cursor_id),
+
+    async def load_page() -> CompressedPayload:
+        query = select(Product).where(Product.is_active == True)
+        if selected is not None:
+            query = query.options(load_only(*_product_columns(selected, include_category)))
+        if include_category:
+            query = query.options(selectinload(Product.category))
+
+        if category_id is not None:
+            query = query.where(Product.category_id == category_id)
+
+        if search:
+            search_pattern = f"%{search}%"
+            query = query.where(
+                or_(
+                    Product.name.ilike(search_pattern),
+                    Product.description.ilike(search_pattern),
+                )
+            )
+
+        # Apply cursor filter if provided
+        if after is not None:
+            cursor_created_at, cursor_id = after
+            # Get items with created_at < cursor OR (created_at == cursor AND id < cursor_id)
+            query = query.where(
+                or_(
+                    Product.created_at < cursor_created_at,
+                    tuple_(Product.created_at, Product.id) < tuple_(cursor_created_at, cursor_id),
+                )
             )
+
+        # Fetch one extra to determine has_more
+        query = query.order_by(Product.created_at.desc(), Product.id.desc()).limit(limit + 1)
+        result = await db.execute(query)
+        products = list(result.scalars().all())
+
+        # Check if there are more items
+        has_more = len(products) > limit
+        if has_more:
+            products = products[:limit]
+
+        # Generate next cursor from last item
+        next_cursor = None
+        if has_more and products:
+            last_product = products[-1]
+            next_cursor = encode_cursor(last_product.created_at, last_product.id)
+
+        logger.info("Found %d products (has_more: %s)", len(products), has_more)
+
+        if selected is not None or include_category:
+            model = sparse_product_model(
+                selected or tuple(ProductResponse.model_fields), include_category
+            )
+            body = {
+                "products": [model.model_validate(p).model_dump(mode="json") for p in products],
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+            }
+            return CompressedPayload(json.dumps(body, separators=(",", ":")).encode())
+
+        return CompressedPayload(
+            ProductListResponse(
+                products=[ProductResponse.model_validate(p) for p in products],
+                next_cursor=next_cursor,
+                has_more=has_more,
+            )
+            .model_dump_json()
+            .encode()
         )
 
-    # Fetch one extra to determine has_more
-    query = query.order_by(Product.created_at.desc(), Product.id.desc()).limit(limit + 1)
-    result = await db.execute(query)
-    products = list(result.scalars().all())
+    if settings.RESULT_CACHE_ENABLED:
+        key = (limit, cursor, category_id, search, selected, include_category)
+        payload = await product_list_cache.get_or_compute(key, load_page)
+    else:
+        payload = await load_page()
+    return PrecompressedResponse(payload, accept_encoding)
 
-    # Check if there are more items
-    has_more = len(products) > limit
-    if has_more:
-        products = products[:limit]
 
-    # Generate next cursor from last item
-    next_cursor = None
-    if has_more and products:
-        last_product = products[-1]
-        next_cursor = encode_cursor(last_product.created_at, last_product.id)
+# Admin lookup, one UPDATE per 5,000 rows, miss lookup, NOTIFY
+@router.patch("/bulk", response_model=ProductBulkUpdateResponse)
+@query_budget(5)
+async def bulk_update_products(
+    request: ProductBulkUpdateRequest,
+    _admin=Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Update price, compare price and stock for a batch of products by SKU (admin only).
+    Each row gets its own result; rows that cannot be applied do not fail the batch.
+    """
+    logger.info("Bulk product update requested for %d item(s)", len(request.items))
+
+    results = await CatalogService(db).bulk_update(request.items)
+
+    return ProductBulkUpdateResponse(
+        updated=sum(1 for r in results if r.status == "updated"),
+        results=results,
+    )
+
 
-    logger.info("Found %d products (has_more: %s)", len(products), has_more)
+# Primary search plus the phonetic fallback
+@router.get("/search", response_model=ProductSearchResponse)
+@query_budget(2)
+async def search_products(
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    mode: Literal["keyword", "semantic"] = Query(
+        "keyword", description="keyword matches substrings; semantic matches meaning"
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Number of products to return"),
+):
+    """
+    Search active products. Semantic mode suits natural-language queries such
+    as "something to keep my coffee hot". When nothing matches, falls back to
+    names that sound like the query.
+    """
+    logger.info("Searching products with q=%s, mode=%s, limit=%d", q, mode, limit)
+
+    service = ProductSearchService(db)
+    if mode == "semantic":
+        try:
+            products = await service.semantic(q, limit)
+        except SemanticIndexUnavailableError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+            )
+    else:
+        products = await service.keyword(q, limit)
+    if not products:
+        # Voice queries often carry a misheard brand name; try how it sounds
+        products = await service.phonetic(q, limit)
 
-    return ProductListResponse(
+    logger.info("Search found %d products", len(products))
+
+    return ProductSearchResponse(
+        query=q,
+        mode=mode,
         products=[ProductResponse.model_validate(p) for p in products],
-        next_cursor=next_cursor,
-        has_more=has_more,
     )
 
 
 @router.get("/{product_id}", response_model=ProductDetailResponse)
+@query_budget(2)
 async def get_product_details(
     product_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
+    accept_encoding: str = Header("", include_in_schema=False),
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return, e.g. id,name,price,category"
+    ),
 ):
     """
     Get detailed information about a specific product including its category.
     """
     logger.info("Fetching product details for product_id=%s", product_id)
 
+    selected = _parse_fields(fields, ProductDetailResponse.model_fields)
+
+    cached = product_detail_cache.get(str(product_id))
+    if cached is not None:
+        return _detail_response(cached, selected, accept_encoding)
+
     query = (
         select(Product)
         .options(selectinload(Product.category))
-        .where(Product.id == product_id, Product.is_deleted == False)
+        .where(Product.id == product_id)
     )
     result = await db.execute(query)
     product = result.scalar_one_or_none()
@@ -132,4 +307,24 @@ async def get_product_details(
 
     logger.info("Product found: product_id=%s, name=%s", product_id, product.name)
 
-    return ProductDetailResponse.model_validate(product)
+    return _detail_response(cache_product_detail(product), selected, accept_encoding)
+
+
+@router.get("/{product_id}/recommendations", response_model=ProductRecommendationsResponse)
+@query_budget(2)
+async def get_product_recommendations(
+    product_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(5, ge=1, le=20, description="Number of recommendations to return"),
+):
+    """
+    Get products frequently bought together with the given product.
+    """
+    logger.info("Fetching recommendations for product_id=%s", product_id)
+
+    products = await RecommendationService(db).recommend(product_id, limit)
+
+    return ProductRecommendationsResponse(
+        product_id=product_id,
+        products=[ProductResponse.model_validate(p) for p in products],
+    )
@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with a per-entry TTL.
+
+    Each uvicorn worker has its own copy, so every cache must be registered
+    under an entity type; writes publish invalidations for that entity type
+    (see core.invalidation) and every worker evicts the matching keys.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def evict(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# entity type -> caches holding data derived from that entity
+_registry: dict[str, list[LocalCache]] = {}
+
+
+def register_cache(entity: str, cache: LocalCache) -> LocalCache:
+    """Register `cache` to be invalidated by writes to `entity`."""
+    _registry.setdefault(entity, []).append(cache)
+    return cache
+
+
+def evict(entity: str, keys: list[str] | None = None) -> None:
+    """Evict `keys` from every cache of `entity`, or clear them all if keys is None."""
+    for cache in _registry.get(entity, ()):
+        if keys is None:
+            cache.clear()
+        else:
+            for key in keys:
+                cache.evict(key)
+
+
+def clear_all() -> None:
+    for caches in _registry.values():
+        for cache in caches:
+            cache.clear()
@@ -1,8 +1,22 @@
 from functools import lru_cache
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class RateLimitRule(BaseModel):
+    """Token bucket applied to requests to `prefix` or any path below it.
+
+    `rate` is tokens refilled per second and `burst` the bucket capacity.
+    When `query_param` is set, the rule only applies if that parameter is present.
+    """
+
+    prefix: str
+    rate: float
+    burst: int
+    query_param: str | None = None
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -23,6 +37,20 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str 
 
+    # Serving (see serve.py); WEB_CONCURRENCY defaults to the usable CPU count
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int | None = None
+    GRACEFUL_SHUTDOWN_SECONDS: int = 30
+
+    # Connection pool, per worker process
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_WARM_CONNECTIONS: int = 5
+
+    # Startup cache warming
+    STARTUP_WARM_PRODUCTS: int = 200
+
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
 
@@ -30,6 +58,113 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 12
     REFRESH_TOKEN_EXPIRE_DAYS: int = 2
 
+    # Stock reservations
+    RESERVATION_TTL_MINUTES: int = 15
+    RESERVATION_SWEEPER_ENABLED: bool = True
+    RESERVATION_SWEEP_INTERVAL_SECONDS: float = 30
+    RESERVATION_SWEEP_BATCH_SIZE: int = 500
+
+    # Cross-worker cache invalidation
+    CACHE_LISTENER_ENABLED: bool = True
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+
+    # Order status events (Server-Sent Events)
+    ORDER_EVENTS_ENABLED: bool = True
+    ORDER_EVENTS_CHANNEL: str = "order_status"
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_QUEUE_SIZE: int = 16
+
+    # Order table partitioning
+    PARTITION_MAINTENANCE_ENABLED: bool = True
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 6 * 60 * 60
+    ORDER_PARTITION_MONTHS_AHEAD: int = 3
+    ORDER_PARTITION_RETENTION_MONTHS: int | None = None
+    ORDER_PARTITION_ARCHIVE_TABLESPACE: str | None = None
+
+    # Soft-delete archival
+    SOFT_DELETE_ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 1000
+
+    # Background job queue
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_BATCH_SIZE: int = 20
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_LOCK_TIMEOUT_SECONDS: int = 300
+    # How often each worker process checks for due periodic jobs (workers.scheduler)
+    JOB_SCHEDULER_INTERVAL_SECONDS: float = 5.0
+
+    # Response compression (brotli is used when the optional package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "text/plain",
+        "text/html",
+        "text/css",
+        "application/javascript",
+    ]
+
+    # Rate limiting ("memory" is per-process, "postgres" is shared across workers)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_RULES: list[RateLimitRule] = [
+        RateLimitRule(prefix="/api/auth", rate=0.2, burst=10),
+        RateLimitRule(prefix="/api/products/search", rate=5, burst=30),
+        RateLimitRule(prefix="/api/products", rate=5, burst=30, query_param="search"),
+    ]
+    RATE_LIMIT_PURGE_INTERVAL_SECONDS: float = 300
+    RATE_LIMIT_PURGE_BATCH_SIZE: int = 1000
+
+    # Co-purchase recommendations
+    RECOMMENDATIONS_TOP_K: int = 20
+    RECOMMENDATIONS_MIN_CO_COUNT: int = 2
+    RECOMMENDATIONS_REBUILD_INTERVAL_SECONDS: float = 6 * 60 * 60
+
+    # Semantic product search (offline TF-IDF + LSA index, memory-mapped)
+    SEMANTIC_SEARCH_ENABLED: bool = True
+    SEMANTIC_SEARCH_INDEX_DIR: str = "data/search"
+    SEMANTIC_SEARCH_DIMENSIONS: int = 256
+    SEMANTIC_SEARCH_REFRESH_INTERVAL_SECONDS: float = 30
+    SEMANTIC_SEARCH_REBUILD_INTERVAL_SECONDS: float = 24 * 60 * 60
+
+    # Query statistics (every statement is timed; a sample is aggregated)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_STATS_SAMPLE_RATE: float = 0.1
+    QUERY_STATS_MAX_STATEMENTS: int = 1000
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+
+    # Per-request query budgets (development and CI)
+    QUERY_BUDGET_ENABLED: bool = False
+    QUERY_BUDGET_ENFORCE: bool = False
+    QUERY_BUDGET_REPEAT_THRESHOLD: int = 3
+
+    # Product listing result cache (invalidated by catalog version)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RESULT_CACHE_TTL_SECONDS: float = 300
+
+    # Idempotency-Key support on retried POSTs (exact paths)
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_PATHS: list[str] = ["/api/cart/items", "/api/cart/reserve", "/api/orders"]
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 60 * 60
+    # A claim still running after this is treated as abandoned (crashed worker)
+    IDEMPOTENCY_LOCK_SECONDS: float = 60
+    # How long a duplicate waits for the in-flight request before a 409
+    IDEMPOTENCY_WAIT_SECONDS: float = 10
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 10 * 60
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 1000
+
+    # Daily sales rollups (admin reports read only these)
+    SALES_ROLLUP_ENABLED: bool = True
+    SALES_ROLLUP_INTERVAL_SECONDS: float = 60
+    # How far the watermark trails now(), so in-flight order writes commit first
+    SALES_ROLLUP_LAG_SECONDS: float = 120
+    SALES_ROLLUP_TIMEZONE: str = "UTC"
+    SALES_ROLLUP_BACKFILL_DAYS_PER_BATCH: int = 31
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,105 @@
+"""
+In-process fan-out of order status changes for Server-Sent Events.
+
+Writers call `publish_order_status` inside their transaction. Each worker
+holds one LISTEN connection (see db.listen) and hands every notification to
+the subscribers of the affected user, so any number of idle SSE clients share
+a single database connection.
+"""
+import asyncio
+import json
+import logging
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.listen import listen_forever
+from db.models.order import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+
+async def publish_order_status(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    order_id: uuid.UUID,
+    order_number: str,
+    status: OrderStatus,
+) -> None:
+    """Notify the user's subscribers once the current transaction commits."""
+    payload = {
+        "user_id": str(user_id),
+        "order_id": str(order_id),
+        "order_number": order_number,
+        "status": status.value,
+    }
+    await db.execute(
+        select(func.pg_notify(settings.ORDER_EVENTS_CHANNEL, json.dumps(payload)))
+    )
+
+
+class Subscription:
+    """One SSE client: a small bounded queue of already-encoded events."""
+
+    __slots__ = ("user_id", "queue", "overflowed")
+
+    def __init__(self, user_id: str, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+
+class OrderEventBroker:
+    def __init__(self, channel: str = settings.ORDER_EVENTS_CHANNEL):
+        self.channel = channel
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, user_id: uuid.UUID) -> Subscription:
+        subscription = Subscription(str(user_id), settings.SSE_QUEUE_SIZE)
+        self._subscribers.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            user_id = json.loads(payload)["user_id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed order event payload: %r", payload)
+            return
+        subscriptions = self._subscribers.get(user_id)
+        if not subscriptions:
+            return
+        # Encoded once and shared by every subscriber of this user
+        event = f"event: order_status\ndata: {payload}\n\n".encode()
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: end its stream so the client reconnects and refetches
+                subscription.overflowed = True
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(listen_forever(self.channel, self._dispatch))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+order_event_broker = OrderEventBroker()
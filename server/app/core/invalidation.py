@@ -0,0 +1,78 @@
+"""
+Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Writers call `publish` inside their transaction; Postgres delivers the
+notification only if that transaction commits. Every worker runs one
+`InvalidationListener` on a dedicated asyncpg connection that evicts the
+matching keys from its local caches. If the connection drops, notifications
+sent meanwhile are lost, so the listener clears every cache on reconnect.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import cache
+from core.config import settings
+from db.listen import listen_forever
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads are limited to 8000 bytes; 36-char UUIDs fit ~150 per message
+_MAX_KEYS_PER_MESSAGE = 150
+
+
+async def publish(db: AsyncSession, entity: str, keys: Iterable[object] | None = None) -> None:
+    """
+    Invalidate `keys` of `entity` (all of them if keys is None) in every worker
+    once the current transaction commits. The local caches are evicted at once.
+    """
+    key_list = None if keys is None else [str(key) for key in keys]
+    cache.evict(entity, key_list)
+
+    if key_list is None:
+        messages = [{"entity": entity, "keys": None}]
+    elif not key_list:
+        return
+    else:
+        messages = [
+            {"entity": entity, "keys": key_list[i:i + _MAX_KEYS_PER_MESSAGE]}
+            for i in range(0, len(key_list), _MAX_KEYS_PER_MESSAGE)
+        ]
+    for message in messages:
+        await db.execute(
+            select(func.pg_notify(settings.CACHE_INVALIDATION_CHANNEL, json.dumps(message)))
+        )
+
+
+def _on_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+        cache.evict(message["entity"], message["keys"])
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed invalidation payload: %r", payload)
+
+
+class InvalidationListener:
+    def __init__(self, channel: str = settings.CACHE_INVALIDATION_CHANNEL):
+        self.channel = channel
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        # Anything published while we were not listening was missed
+        self._task = asyncio.create_task(
+            listen_forever(self.channel, _on_notification, on_connect=cache.clear_all)
+        )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
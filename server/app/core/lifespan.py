@@ -1,14 +1,53 @@
+import asyncio
+import contextlib
+import logging
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from core.config import settings
+from core.events import order_event_broker
+from core.warmup import warm_up
+from core.invalidation import InvalidationListener
+from db.query_stats import query_stats
 from db.session import engine
+from workers.search_index import run_search_index_refresher
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
+    started = time.perf_counter()
+    if settings.QUERY_STATS_ENABLED:
+        query_stats.install(engine.sync_engine)
+    invalidation_listener = InvalidationListener()
+    if settings.CACHE_LISTENER_ENABLED:
+        invalidation_listener.start()
+    if settings.ORDER_EVENTS_ENABLED:
+        order_event_broker.start()
+
+    # Maintenance (sweeps, purges, rollups, index builds) runs in the job
+    # worker tier (workers.scheduler). Only this process's own copy of the
+    # semantic index is kept current here.
+    background_tasks: list[asyncio.Task] = []
+    if settings.SEMANTIC_SEARCH_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                run_search_index_refresher(settings.SEMANTIC_SEARCH_REFRESH_INTERVAL_SECONDS)
+            )
+        )
+    await warm_up()
+    logger.info("Startup completed in %.1f ms", (time.perf_counter() - started) * 1000)
     yield
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await order_event_broker.stop()
+    await invalidation_listener.stop()
     await engine.dispose()
@@ -0,0 +1,141 @@
+"""
+Versioned cache for computed responses such as product listing pages.
+
+Entries are keyed by (catalog version, normalised request parameters). The
+cache registers itself for the catalog entities, so any product or category
+invalidation (local or from another worker) just bumps the version: O(1),
+however many pages are cached. Entries of old versions are never hit again
+and age out of the LRU under the byte budget.
+
+Concurrent misses for one key share a single computation (single-flight),
+so a popular page expiring does not stampede the database.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+from core.cache import register_cache
+from core.config import settings
+from utils.compression import CompressedPayload
+
+
+@dataclass
+class ResultCacheStats:
+    hits: int
+    misses: int
+    # Misses that waited for an in-flight computation instead of running one
+    coalesced: int
+    entries: int
+    bytes: int
+    max_bytes: int
+    version: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+class VersionedResultCache:
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = 0
+        self._data: OrderedDict[Hashable, tuple[float, CompressedPayload]] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    # core.cache calls these on invalidation; any change retires every entry
+    def evict(self, key: Hashable) -> None:
+        self.version += 1
+
+    def clear(self) -> None:
+        self.version += 1
+
+    def _get(self, key: Hashable) -> CompressedPayload | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            self._discard(key)
+            return None
+        self._data.move_to_end(key)
+        return payload
+
+    def _discard(self, key: Hashable) -> None:
+        _, payload = self._data.pop(key)
+        self._bytes -= len(payload.body)
+
+    def _set(self, key: Hashable, payload: CompressedPayload) -> None:
+        # Budget counts uncompressed bodies; compressed variants are smaller
+        size = len(payload.body)
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self._discard(key)
+        self._data[key] = (time.monotonic() + self.ttl, payload)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._discard(next(iter(self._data)))
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[CompressedPayload]]
+    ) -> CompressedPayload:
+        version = self.version
+        versioned_key = (version, key)
+        payload = self._get(versioned_key)
+        if payload is not None:
+            self.hits += 1
+            return payload
+
+        pending = self._inflight.get(versioned_key)
+        if pending is not None:
+            self.coalesced += 1
+            # Shielded so one waiter being cancelled does not cancel the others
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        # Consume the exception if nobody was waiting, to avoid "never retrieved" noise
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[versioned_key] = future
+        try:
+            payload = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(versioned_key, None)
+
+        # A write during the computation may have made this result stale
+        if self.version == version:
+            self._set(versioned_key, payload)
+        future.set_result(payload)
+        return payload
+
+    def stats(self) -> ResultCacheStats:
+        return ResultCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            coalesced=self.coalesced,
+            entries=len(self._data),
+            bytes=self._bytes,
+            max_bytes=self.max_bytes,
+            version=self.version,
+        )
+
+
+product_list_cache = VersionedResultCache(
+    settings.RESULT_CACHE_MAX_BYTES, settings.RESULT_CACHE_TTL_SECONDS
+)
+register_cache("product", product_list_cache)
+register_cache("category", product_list_cache)
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
+
+from core.config import settings
+from db.models.product import Product
+from db.session import AsyncSessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_pool(connections: int) -> None:
+    """Open `connections` pooled connections up front so early requests skip the handshake."""
+    # Held open together; opened one after another they would reuse a single connection
+    async def hold(ready: asyncio.Barrier) -> None:
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await ready.wait()
+        except Exception:
+            # Release the others instead of leaving them waiting forever
+            await ready.abort()
+            raise
+
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return
+    ready = asyncio.Barrier(connections)
+    await asyncio.gather(*(hold(ready) for _ in range(connections)))
+
+
+async def warm_caches(products: int) -> None:
+    """Fill the product detail cache with the newest products."""
+    from api.routes.products import cache_product_detail
+
+    if products <= 0:
+        return
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Product)
+            .options(selectinload(Product.category))
+            .where(Product.is_active == True)
+            .order_by(Product.created_at.desc(), Product.id.desc())
+            .limit(products)
+        )
+        for product in result.scalars():
+            cache_product_detail(product)
+
+
+async def warm_up() -> None:
+    """Best-effort: a failure is logged and startup continues cold."""
+    started = time.perf_counter()
+    try:
+        await warm_pool(settings.DB_POOL_WARM_CONNECTIONS)
+        await warm_caches(settings.STARTUP_WARM_PRODUCTS)
+    except Exception:
+        logger.exception("Startup warm-up failed")
+        return
+    logger.info("Startup warm-up finished in %.1f ms", (time.perf_counter() - started) * 1000)
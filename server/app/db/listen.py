@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+
+from db.session import engine
+
+logger = logging.getLogger(__name__)
+
+_HEALTH_CHECK_SECONDS = 30.0
+_MAX_RETRY_DELAY_SECONDS = 30.0
+
+NotificationCallback = Callable[[str], None]
+
+
+def asyncpg_dsn() -> str:
+    """DATABASE_URL without the SQLAlchemy driver suffix, as asyncpg expects."""
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def _listen_once(
+    channel: str,
+    callback: NotificationCallback,
+    on_connect: Callable[[], Awaitable[None] | None] | None,
+) -> None:
+    connection = await asyncpg.connect(asyncpg_dsn())
+    lost = asyncio.Event()
+    connection.add_termination_listener(lambda _: lost.set())
+    try:
+        await connection.add_listener(
+            channel, lambda _conn, _pid, _channel, payload: callback(payload)
+        )
+        if on_connect is not None:
+            result = on_connect()
+            if result is not None:
+                await result
+        logger.info("Listening on channel %s", channel)
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), _HEALTH_CHECK_SECONDS)
+            except TimeoutError:
+                # Half-open TCP connections never fire the termination listener
+                await connection.execute("SELECT 1")
+        logger.warning("Connection for channel %s lost", channel)
+    finally:
+        if not connection.is_closed():
+            await connection.close()
+
+
+async def listen_forever(
+    channel: str,
+    callback: NotificationCallback,
+    on_connect: Callable[[], Awaitable[None] | None] | None = None,
+) -> None:
+    """
+    Hold a dedicated LISTEN connection on `channel` and pass every payload to
+    `callback`, reconnecting with exponential backoff. `on_connect` runs after
+    each (re)connect, once listening; notifications sent while disconnected
+    are lost, so it is the place to resynchronise.
+    """
+    delay = 1.0
+    while True:
+        try:
+            await _listen_once(channel, callback, on_connect)
+            delay = 1.0
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Listener on %s failed; retrying in %.0fs", channel, delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _MAX_RETRY_DELAY_SECONDS)
@@ -1,17 +1,29 @@
 from db.models.users import User, UserRole
 from db.models.category import Category
 from db.models.product import Product
+from db.models.product_recommendation import ProductRecommendation
 from db.models.address import Address, AddressType
 from db.models.cart import Cart
 from db.models.cart_item import CartItem
 from db.models.order import Order, OrderStatus
 from db.models.order_item import OrderItem
+from db.models.stock_reservation import StockReservation
+from db.models.job import Job, JobPriority, JobSchedule, JobStatus
+from db.models.idempotency_key import IdempotencyKey
+from db.models.sales_rollup import (
+    RollupWatermark,
+    SalesDaily,
+    SalesDailyCategory,
+    SalesDailyProduct,
+)
+from db.models.archive import address_archive, cart_item_archive, product_archive
 
 __all__ = [
     "User",
     "UserRole",
     "Category",
     "Product",
+    "ProductRecommendation",
     "Address",
     "AddressType",
     "Cart",
@@ -19,4 +31,17 @@ __all__ = [
     "Order",
     "OrderStatus",
     "OrderItem",
+    "StockReservation",
+    "Job",
+    "JobPriority",
+    "JobSchedule",
+    "JobStatus",
+    "IdempotencyKey",
+    "RollupWatermark",
+    "SalesDaily",
+    "SalesDailyCategory",
+    "SalesDailyProduct",
+    "address_archive",
+    "cart_item_archive",
+    "product_archive",
 ]
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, Table, func
+
+from db.models.address import Address
+from db.models.base import Base
+from db.models.cart_item import CartItem
+from db.models.product import Product
+
+
+def _archive_table(live: Table) -> Table:
+    """Unindexed, constraint-free copy of `live` plus the time it was archived."""
+    return Table(
+        f"{live.name}_archive",
+        Base.metadata,
+        *(Column(column.name, column.type, nullable=column.nullable) for column in live.c),
+        Column("archived_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    )
+
+
+cart_item_archive = _archive_table(CartItem.__table__)
+product_archive = _archive_table(Product.__table__)
+address_archive = _archive_table(Address.__table__)
@@ -4,6 +4,8 @@ from datetime import datetime
 from sqlalchemy import DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
+from utils.ids import uuid7
+
 
 class Base(DeclarativeBase):
     pass
@@ -17,9 +19,11 @@ class BaseModel(Base):
         name = cls.__name__
         return "".join(["_" + c.lower() if c.isupper() else c for c in name]).lstrip("_")
 
+    # Time-ordered so inserts append to the primary key index. Rows created
+    # before the switch keep their uuid4 IDs; both share the uuid column type.
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
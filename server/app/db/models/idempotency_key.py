@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, LargeBinary, SmallInteger, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    One retried-POST key per user (see middleware.idempotency). A row with no
+    status_code is a claim held by the request executing it until
+    locked_until; after that a retry may take it over.
+    """
+
+    __tablename__ = "idempotency_key"
+    __table_args__ = (
+        # Serves the purge: WHERE expires_at < now()
+        Index("ix_idempotency_key_expires_at", "expires_at"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # SHA-256 of method, path, query and body; a reused key must match
+    request_hash: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    status_code: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    response_body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    locked_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,71 @@
+from datetime import datetime
+from enum import Enum, IntEnum
+from typing import Any
+
+from sqlalchemy import DateTime, Index, Integer, SmallInteger, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.models.base import Base, BaseModel
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+
+
+class JobPriority(IntEnum):
+    """Priority lanes; lower values are claimed first."""
+
+    HIGH = 0
+    NORMAL = 5
+    LOW = 9
+
+
+class Job(BaseModel):
+    """
+    A unit of background work. Completed jobs are deleted, so the table only
+    holds pending, running and permanently failed jobs.
+    """
+
+    __table_args__ = (
+        # Claim order; partial so finished and failed rows never bloat it
+        Index(
+            "ix_job_claim",
+            "priority",
+            "run_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # Finds running jobs whose worker died
+        Index(
+            "ix_job_locked_at",
+            "locked_at",
+            postgresql_where=text("status = 'RUNNING'"),
+        ),
+    )
+
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict, nullable=False)
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.PENDING)
+    priority: Mapped[int] = mapped_column(SmallInteger, default=JobPriority.NORMAL, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5, nullable=False)
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class JobSchedule(Base):
+    """
+    When each periodic job (see workers.scheduler) is next due. Schedulers
+    advance next_run_at and enqueue the job in one transaction, so however
+    many run, each due run is enqueued once.
+    """
+
+    __tablename__ = "job_schedule"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,12 +1,13 @@
 import uuid
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Numeric, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, Sequence, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from db.models.base import BaseModel
+from db.models.base import Base, BaseModel
 
 if TYPE_CHECKING:
     from db.models.users import User
@@ -23,10 +24,48 @@ class OrderStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Backs Order.order_number; sequence values never repeat, so inserts need no uniqueness retries
+order_number_seq = Sequence("order_number_seq", start=100000, metadata=Base.metadata)
+
+
 class Order(BaseModel):
+    """
+    Range-partitioned by month of created_at (see db.partitions). Postgres
+    requires the partition key in every unique constraint, so the primary key
+    is (id, created_at); queries that can bound created_at touch only the
+    matching partitions.
+    """
+
+    __table_args__ = (
+        Index("ix_order_order_number", "order_number"),
+        # Serves order history: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_order_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # Finds orders changed since the sales rollup watermark
+        Index("ix_order_updated_at", "updated_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+    )
+
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"), nullable=False)
+    # e.g. ORD-261019-100042, assigned by the database in the INSERT itself.
+    # Unique by construction; a unique index would have to include created_at.
     order_number: Mapped[str] = mapped_column(
-        String(50), unique=True, nullable=False, index=True
+        String(50),
+        nullable=False,
+        server_default=text(
+            "'ORD-' || to_char(now(), 'YYMMDD') || '-' || nextval('order_number_seq')"
+        ),
     )
     status: Mapped[OrderStatus] = mapped_column(default=OrderStatus.PENDING)
     total: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
@@ -1,8 +1,9 @@
 import uuid
+from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, Numeric
+from sqlalchemy import DateTime, ForeignKey, ForeignKeyConstraint, Index, Integer, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.models.base import BaseModel
@@ -13,7 +14,24 @@ if TYPE_CHECKING:
 
 
 class OrderItem(BaseModel):
-    order_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("order.id"), nullable=False)
+    """
+    Range-partitioned by order_created_at, its order's partition key, so an
+    order and its items share a month and are pruned together.
+    """
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "order_created_at"], ["order.id", "order.created_at"]
+        ),
+        # Item loads filter on order_id alone (selectinload), not the partition key
+        Index("ix_order_item_order_id", "order_id"),
+        {"postgresql_partition_by": "RANGE (order_created_at)"},
+    )
+
+    order_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    order_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
     product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("product.id"), nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     unit_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
@@ -2,10 +2,12 @@ import uuid
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, Numeric, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, Text, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from db.models.base import BaseModel
+from utils.phonetics import phonetic_keys
 
 if TYPE_CHECKING:
     from db.models.category import Category
@@ -14,16 +16,61 @@ if TYPE_CHECKING:
 
 
 class Product(BaseModel):
-    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    slug: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    # Partial on live rows so soft-deleted products drop out of the hot indexes
+    __table_args__ = (
+        Index("ix_product_name", "name", postgresql_where=text("NOT is_deleted")),
+        Index("ix_product_slug", "slug", unique=True, postgresql_where=text("NOT is_deleted")),
+        # Serves the listing keyset: ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_product_listing",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("is_active AND NOT is_deleted"),
+        ),
+        Index(
+            "ix_product_category_listing",
+            "category_id",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("is_active AND NOT is_deleted"),
+        ),
+        # Change feed for the semantic search refresher; covers deleted rows too
+        Index("ix_product_updated_at", "updated_at"),
+        Index(
+            "ix_product_name_phonetic_keys",
+            "name_phonetic_keys",
+            postgresql_using="gin",
+            postgresql_where=text("is_active AND NOT is_deleted"),
+        ),
+    )
+
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    slug: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     compare_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
     sku: Mapped[str | None] = mapped_column(String(100), unique=True, nullable=True)
     stock_quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Sum of live StockReservation quantities, maintained incrementally
+    reserved_quantity: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     is_active: Mapped[bool] = mapped_column(default=True)
     image_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     category_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("category.id"), nullable=False)
+    # Sound keys of the name, for matching misheard voice queries; derived from `name`
+    name_phonetic_keys: Mapped[list[str]] = mapped_column(
+        ARRAY(String(16)), default=list, server_default="{}", nullable=False
+    )
+
+    @validates("name")
+    def _set_name_phonetic_keys(self, key: str, name: str) -> str:
+        self.name_phonetic_keys = phonetic_keys(name)
+        return name
+
+    @property
+    def available_quantity(self) -> int:
+        return self.stock_quantity - self.reserved_quantity
 
     # Relationships
     category: Mapped["Category"] = relationship("Category", back_populates="products")
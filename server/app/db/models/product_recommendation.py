@@ -0,0 +1,23 @@
+import uuid
+
+from sqlalchemy import Float, ForeignKey, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.models.base import Base
+
+
+class ProductRecommendation(Base):
+    """
+    Precomputed "customers also bought" list: the `rank`-th best co-purchase of
+    `product_id`. Derived data, fully rewritten by each rebuild, so it skips
+    the BaseModel bookkeeping columns.
+    """
+
+    __tablename__ = "product_recommendation"
+
+    product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("product.id"), primary_key=True)
+    rank: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    recommended_product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("product.id"), nullable=False
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
@@ -0,0 +1,48 @@
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.models.base import Base
+
+# Derived tables rebuilt day by day from order/order_item (workers.rollups),
+# so they skip the BaseModel bookkeeping columns. Days are in SALES_ROLLUP_TIMEZONE.
+
+
+class SalesDaily(Base):
+    __tablename__ = "sales_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    units: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+
+
+class SalesDailyCategory(Base):
+    __tablename__ = "sales_daily_category"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    category_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("category.id"), primary_key=True)
+    units: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+
+
+class SalesDailyProduct(Base):
+    __tablename__ = "sales_daily_product"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("product.id"), primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    units: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+
+
+class RollupWatermark(Base):
+    """How far (by order.updated_at) a rollup has consumed order changes."""
+
+    __tablename__ = "rollup_watermark"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
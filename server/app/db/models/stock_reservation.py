@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from db.models.base import BaseModel
+
+if TYPE_CHECKING:
+    from db.models.product import Product
+
+
+class StockReservation(BaseModel):
+    """
+    A temporary hold on product stock between "proceed to checkout" and payment.
+    Rows exist only while the hold is live; releasing a hold deletes the row and
+    gives its quantity back through Product.reserved_quantity.
+    """
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id"), nullable=False, index=True
+    )
+    product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("product.id"), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+    # Relationships
+    product: Mapped["Product"] = relationship("Product")
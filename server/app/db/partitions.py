@@ -0,0 +1,59 @@
+"""
+Monthly RANGE partitions for the order tables.
+
+`order` is partitioned by created_at and `order_item` by order_created_at
+(a copy of its order's created_at), so an order and its items always live in
+the same month and a bounded query on either prunes to the same partitions.
+Partitions are named <table>_yYYYYmMM and cover [first of month, first of
+next month) in UTC.
+"""
+from datetime import date, datetime, timezone
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "order": "created_at",
+    "order_item": "order_created_at",
+}
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """CREATE TABLE statement for the partition of `table` holding `month`."""
+    lower = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    upper_month = add_months(month, 1)
+    upper = datetime(upper_month.year, upper_month.month, 1, tzinfo=timezone.utc)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, month)}" '
+        f'PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+def detach_partition_sql(table: str, month: date) -> str:
+    """
+    DETACH ... CONCURRENTLY only takes a SHARE UPDATE EXCLUSIVE lock on the
+    parent, so reads and writes continue. It cannot run inside a transaction.
+    """
+    return f'ALTER TABLE "{table}" DETACH PARTITION "{partition_name(table, month)}" CONCURRENTLY'
+
+
+def months_between(first: date, last: date) -> list[date]:
+    """Every month from `first` to `last`, inclusive."""
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
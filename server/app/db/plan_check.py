@@ -0,0 +1,440 @@
+"""
+Query plan regression check for the hot read paths.
+
+Seeds a realistic catalog, carts and order history inside one transaction,
+runs the real route and service code against it, and captures every SELECT
+it sends. Each statement is re-run under EXPLAIN (FORMAT JSON) and checked
+for the plan properties we rely on (index used, no sort, row estimates).
+The plan shapes are also compared with a stored baseline so any change shows
+up as a readable diff. The transaction is rolled back, so nothing persists.
+
+    python -m db.plan_check             # check against db/plan_baseline.txt
+    python -m db.plan_check --update    # accept the current plans as baseline
+
+Exits non-zero when a check fails or a plan differs from the baseline. The
+same checks run under pytest (tests/integration/test_query_plans.py) when
+TEST_DATABASE_URL is set.
+"""
+import argparse
+import asyncio
+import difflib
+import json
+import re
+import sys
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import cache
+from core.config import settings
+from db.partitions import PARTITIONED_TABLES, add_months, create_partition_sql, months_between
+from db.session import AsyncSessionLocal, engine
+
+BASELINE_PATH = Path(__file__).with_name("plan_baseline.txt")
+
+SEED_CATEGORIES = 50
+SEED_PRODUCTS = 50_000
+SEED_USERS = 2_000
+SEED_ORDERS = 100_000
+SEED_MONTHS = 6
+
+_SEED_SQL = [
+    f"""
+    INSERT INTO category (id, name, slug, created_at, updated_at, is_deleted)
+    SELECT gen_random_uuid(), 'plan-check-category-' || g, 'plan-check-category-' || g,
+           now(), now(), false
+    FROM generate_series(1, {SEED_CATEGORIES}) AS g
+    """,
+    f"""
+    INSERT INTO product (id, name, slug, description, price, sku, stock_quantity,
+                         reserved_quantity, is_active, category_id, created_at, updated_at,
+                         is_deleted)
+    SELECT gen_random_uuid(), 'Plan check product ' || g, 'plan-check-product-' || g,
+           'Seeded for plan checks', (random() * 5000)::numeric(10, 2), 'PLAN-' || g,
+           (random() * 100)::int, 0, g % 20 <> 0,
+           (SELECT id FROM category
+            WHERE slug = 'plan-check-category-' || (g % {SEED_CATEGORIES} + 1)),
+           now() - random() * interval '365 days', now(), g % 50 = 0
+    FROM generate_series(1, {SEED_PRODUCTS}) AS g
+    """,
+    f"""
+    INSERT INTO "user" (id, name, email, role, created_at, updated_at, is_deleted)
+    SELECT gen_random_uuid(), 'Plan check user ' || g, 'plan-check-' || g || '@example.com',
+           'USER', now(), now(), false
+    FROM generate_series(1, {SEED_USERS}) AS g
+    """,
+    """
+    INSERT INTO address (id, user_id, type, street, city, state, postal_code, country,
+                         is_default, created_at, updated_at, is_deleted)
+    SELECT gen_random_uuid(), u.id, 'SHIPPING', '1 Plan Street', 'Pune', 'MH', '411001',
+           'India', true, now(), now(), false
+    FROM "user" u WHERE u.email LIKE 'plan-check-%'
+    """,
+    """
+    INSERT INTO cart (id, user_id, created_at, updated_at, is_deleted)
+    SELECT gen_random_uuid(), u.id, now(), now(), false
+    FROM "user" u WHERE u.email LIKE 'plan-check-%'
+    """,
+    """
+    INSERT INTO cart_item (id, cart_id, product_id, quantity, created_at, updated_at, is_deleted)
+    SELECT gen_random_uuid(), c.id, p.id, 1, now(), now(), false
+    FROM cart c
+    JOIN "user" u ON u.id = c.user_id AND u.email LIKE 'plan-check-%'
+    CROSS JOIN generate_series(1, 5) AS k
+    JOIN product p ON p.sku = 'PLAN-' || ((hashtext(c.id::text || k) & 65535) % 40000 + 1)
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO "order" (id, created_at, user_id, order_number, status, total,
+                         shipping_address_id, updated_at, is_deleted)
+    SELECT gen_random_uuid(), now() - random() * interval '{SEED_MONTHS - 1} months',
+           a.user_id, 'PLAN-' || g, 'DELIVERED', 999.00, a.id, now(), false
+    FROM generate_series(1, {SEED_ORDERS}) AS g
+    JOIN (
+        SELECT row_number() OVER () AS n, id, user_id FROM address
+        WHERE street = '1 Plan Street'
+    ) a ON a.n = g % {SEED_USERS} + 1
+    """,
+    """
+    INSERT INTO order_item (id, order_id, order_created_at, product_id, quantity,
+                            unit_price, total_price, created_at, updated_at, is_deleted)
+    SELECT gen_random_uuid(), o.id, o.created_at, p.id, 1, 333.00, 333.00, now(), now(), false
+    FROM "order" o
+    CROSS JOIN generate_series(1, 3) AS k
+    JOIN product p ON p.sku = 'PLAN-' || ((hashtext(o.id::text || k) & 65535) % 40000 + 1)
+    WHERE o.order_number LIKE 'PLAN-%'
+    """,
+]
+
+
+@dataclass
+class Check:
+    """Expectations for the `statement`-th SELECT a scenario sends."""
+
+    statement: int = 0
+    # Substring of an index name that must appear (partition indexes get
+    # generated names, so match on the distinctive part)
+    index: str | None = None
+    no_sort: bool = False
+    # Relations (or partition name prefixes) that must not be sequentially scanned
+    no_seq_scan: tuple[str, ...] = ()
+    max_rows: int | None = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[AsyncSession, dict], Awaitable[object]]
+    checks: list[Check] = field(default_factory=list)
+
+
+async def _product_list(session: AsyncSession, seed: dict, **filters) -> object:
+    from api.routes.products import get_all_products
+
+    params = {
+        "limit": 20,
+        "cursor": None,
+        "category_id": None,
+        "search": None,
+        "fields": None,
+        "include": None,
+        "accept_encoding": "",
+    }
+    params.update(filters)
+    return await get_all_products(db=session, **params)
+
+
+async def _product_list_page_two(session: AsyncSession, seed: dict) -> object:
+    first = await _product_list(session, seed)
+    return await _product_list(session, seed, cursor=json.loads(first.body)["next_cursor"])
+
+
+async def _product_detail(session: AsyncSession, seed: dict) -> object:
+    from api.routes.products import get_product_details
+
+    return await get_product_details(
+        product_id=seed["product_id"], db=session, accept_encoding="", fields=None
+    )
+
+
+async def _cart(session: AsyncSession, seed: dict) -> object:
+    from services.cart import CartService
+
+    return await CartService(session).get_cart(seed["user_id"])
+
+
+async def _order_history(session: AsyncSession, seed: dict) -> object:
+    from services.order import OrderService
+
+    return await OrderService(session).list_orders(seed["user_id"], 20)
+
+
+SCENARIOS = [
+    Scenario(
+        "product_list",
+        _product_list,
+        [Check(index="ix_product_listing", no_sort=True, max_rows=21)],
+    ),
+    Scenario(
+        "product_list_category",
+        lambda session, seed: _product_list(session, seed, category_id=seed["category_id"]),
+        [Check(index="ix_product_category_listing", no_sort=True, max_rows=21)],
+    ),
+    Scenario(
+        "product_list_cursor",
+        _product_list_page_two,
+        # Statement 1 is the second page
+        [Check(statement=1, index="ix_product_listing", no_sort=True, max_rows=21)],
+    ),
+    Scenario(
+        "product_list_sparse",
+        lambda session, seed: _product_list(
+            session, seed, fields="id,name,price,stock_quantity", include="category"
+        ),
+        [
+            Check(index="ix_product_listing", no_sort=True, max_rows=21),
+            Check(statement=1, max_rows=21),
+        ],
+    ),
+    # Substring search has no supporting index yet; tracked for plan changes only
+    Scenario(
+        "product_list_search",
+        lambda session, seed: _product_list(session, seed, search="product 4242"),
+        [Check(max_rows=21)],
+    ),
+    Scenario(
+        "product_detail",
+        _product_detail,
+        [Check(index="product_pkey", max_rows=1)],
+    ),
+    Scenario(
+        "cart",
+        _cart,
+        [Check(no_seq_scan=("cart", "cart_item", "product"))],
+    ),
+    Scenario(
+        "order_history",
+        _order_history,
+        [
+            Check(index="user_id_created_at", no_sort=True, max_rows=20),
+            Check(statement=1, index="order_id", no_seq_scan=("order_item",)),
+        ],
+    ),
+]
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"_y\d{4}m\d{2}", "_yYYYYmMM", name)
+
+
+def plan_shape(plan: dict, depth: int = 0) -> list[str]:
+    """
+    Indented node/index/relation outline of a plan, without estimates.
+    Partition names are normalised and repeated sibling scans collapsed, so
+    the outline stays stable as monthly partitions come and go.
+    """
+    label = plan["Node Type"]
+    if "Index Name" in plan:
+        label += f" using {_normalize(plan['Index Name'])}"
+    if "Relation Name" in plan:
+        label += f" on {_normalize(plan['Relation Name'])}"
+    lines = ["  " * depth + label]
+    previous: list[str] | None = None
+    for child in plan.get("Plans", ()):
+        child_lines = plan_shape(child, depth + 1)
+        if child_lines != previous:
+            lines.extend(child_lines)
+        previous = child_lines
+    return lines
+
+
+def check_plan(plan: dict, check: Check) -> list[str]:
+    """Human-readable failures of `check` against `plan`; empty if it holds."""
+    failures = []
+    nodes = list(_nodes(plan))
+    if check.index and not any(check.index in n.get("Index Name", "") for n in nodes):
+        used = sorted({n["Index Name"] for n in nodes if "Index Name" in n}) or ["none"]
+        failures.append(f"expected an index matching {check.index!r}, used {', '.join(used)}")
+    if check.no_sort:
+        sorts = [n for n in nodes if n["Node Type"] in ("Sort", "Incremental Sort")]
+        if sorts:
+            keys = "; ".join(", ".join(n.get("Sort Key", [])) for n in sorts)
+            failures.append(f"unexpected sort on {keys}")
+    for relation in check.no_seq_scan:
+        for n in nodes:
+            name = n.get("Relation Name", "")
+            is_relation = name == relation or name.startswith(relation + "_y")
+            if n["Node Type"] == "Seq Scan" and is_relation:
+                failures.append(f"sequential scan on {name}")
+    if check.max_rows is not None and plan["Plan Rows"] > check.max_rows:
+        failures.append(f"estimated {plan['Plan Rows']} rows, expected at most {check.max_rows}")
+    return failures
+
+
+async def _seed(session: AsyncSession) -> dict:
+    today = date.today()
+    for month in months_between(add_months(today, -SEED_MONTHS), add_months(today, 1)):
+        for table in PARTITIONED_TABLES:
+            await session.execute(text(create_partition_sql(table, month)))
+    for statement in _SEED_SQL:
+        await session.execute(text(statement))
+    # ANALYZE sees this transaction's own rows, so estimates reflect the seed
+    await session.execute(text("ANALYZE"))
+
+    row = (
+        await session.execute(
+            text(
+                """
+                SELECT p.id AS product_id, p.category_id, c.user_id
+                FROM product p, cart c JOIN "user" u ON u.id = c.user_id
+                WHERE p.sku = 'PLAN-1' AND u.email = 'plan-check-1@example.com'
+                """
+            )
+        )
+    ).one()
+    return dict(row._mapping)
+
+
+async def _explain(session: AsyncSession, statements: list[tuple[str, object]]) -> list[dict]:
+    connection = await session.connection()
+    plans = []
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + statement, parameters
+        )
+        output = result.scalar_one()
+        if isinstance(output, str):
+            output = json.loads(output)
+        plans.append(output[0]["Plan"])
+    return plans
+
+
+@dataclass
+class PlanReport:
+    # Scenario name -> plan outline of every statement it sent
+    shapes: dict[str, list[str]] = field(default_factory=dict)
+    # Scenario name -> failed checks
+    failures: dict[str, list[str]] = field(default_factory=dict)
+
+
+def render_shapes(shapes: dict[str, list[str]]) -> str:
+    return "".join(
+        f"## {name}\n" + "".join(line + "\n" for line in lines) for name, lines in shapes.items()
+    )
+
+
+def parse_shapes(baseline: str) -> dict[str, list[str]]:
+    """Inverse of render_shapes."""
+    shapes: dict[str, list[str]] = {}
+    lines: list[str] = []
+    for line in baseline.splitlines():
+        if line.startswith("## "):
+            lines = shapes[line[3:]] = []
+        else:
+            lines.append(line)
+    return shapes
+
+
+async def collect_plans() -> PlanReport:
+    """Seed, run every scenario, and check its plans. Everything is rolled back."""
+    captured: list[tuple[str, object]] = []
+    capturing = False
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    report = PlanReport()
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.begin()
+            seed = await _seed(session)
+            for scenario in SCENARIOS:
+                cache.clear_all()
+                captured.clear()
+                capturing = True
+                try:
+                    await scenario.run(session, seed)
+                finally:
+                    capturing = False
+                plans = await _explain(session, list(captured))
+                shape = report.shapes[scenario.name] = []
+                failures = report.failures[scenario.name] = []
+                for i, plan in enumerate(plans):
+                    shape += [f"-- statement {i}", *plan_shape(plan)]
+                for check in scenario.checks:
+                    if check.statement >= len(plans):
+                        failures.append(
+                            f"expected a statement #{check.statement}, only {len(plans)} ran"
+                        )
+                        continue
+                    failures.extend(
+                        f"statement {check.statement}: {failure}"
+                        for failure in check_plan(plans[check.statement], check)
+                    )
+            await session.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        cache.clear_all()
+    return report
+
+
+async def run(update: bool) -> int:
+    try:
+        report = await collect_plans()
+    finally:
+        await engine.dispose()
+
+    failures = [
+        f"{name} ({failure})" for name, items in report.failures.items() for failure in items
+    ]
+    current = render_shapes(report.shapes)
+    if update:
+        BASELINE_PATH.write_text(current)
+        print(f"Baseline written to {BASELINE_PATH}")
+    elif BASELINE_PATH.exists():
+        diff = list(
+            difflib.unified_diff(
+                BASELINE_PATH.read_text().splitlines(keepends=True),
+                current.splitlines(keepends=True),
+                fromfile="baseline",
+                tofile="current",
+            )
+        )
+        if diff:
+            failures.append("plan shapes differ from the baseline:\n" + "".join(diff))
+    else:
+        print(f"No baseline at {BASELINE_PATH}; run with --update to create one")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not failures:
+        print(f"OK {len(SCENARIOS)} scenarios")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--update", action="store_true", help="accept current plans as baseline")
+    parser.add_argument(
+        "--force", action="store_true", help="allow running with APP_ENV=production"
+    )
+    args = parser.parse_args()
+    if settings.APP_ENV == "production" and not args.force:
+        parser.error("refusing to seed a production database; use a local Postgres")
+    sys.exit(asyncio.run(run(args.update)))
+
+
+if __name__ == "__main__":
+    main()
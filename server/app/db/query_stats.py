@@ -0,0 +1,153 @@
+"""
+Per-statement query timing for production.
+
+Every statement is timed (two perf_counter calls), and statements slower than
+SLOW_QUERY_THRESHOLD_MS are logged with the shape of their bind parameters,
+never the values. A QUERY_STATS_SAMPLE_RATE fraction of statements is also
+aggregated per normalised fingerprint (count, total, p95, max) for the admin
+report. Statistics are per worker process.
+"""
+import logging
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Durations kept per fingerprint for the p95
+_WINDOW = 512
+
+_NORMALIZERS = [
+    (re.compile(r"--[^\n]*|/\*.*?\*/", re.S), " "),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    # asyncpg binds carry casts such as $1::NUMERIC(10, 2)
+    (
+        re.compile(
+            r"::(?:TIMESTAMP WITH(?:OUT)? TIME ZONE|DOUBLE PRECISION|\w+)"
+            r"(?:\(\d+(?:,\s*\d+)?\))?(?:\[\])?"
+        ),
+        "",
+    ),
+    (re.compile(r"\$\d+"), "?"),
+    (re.compile(r"__\[POSTCOMPILE_\w+\]"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    # IN lists and multi-row VALUES vary in length with the input
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),
+    (re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+"), "(?)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """SQL with literals and parameters replaced by ?, so variants group together."""
+    for pattern, replacement in _NORMALIZERS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def parameter_shape(parameters: Any) -> str:
+    """Types (and sizes of collections) of bind parameters, without their values."""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {parameter_shape(v)}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > 10:
+            return f"{type(parameters).__name__}[{len(parameters)}]"
+        inner = ", ".join(parameter_shape(p) for p in parameters)
+        return f"({inner})" if isinstance(parameters, tuple) else f"[{inner}]"
+    if isinstance(parameters, (str, bytes)):
+        return f"{type(parameters).__name__}[{len(parameters)}]"
+    return type(parameters).__name__
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    recent_ms: deque = field(default_factory=lambda: deque(maxlen=_WINDOW))
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.recent_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+
+
+class QueryStats:
+    def __init__(self, sample_rate: float, slow_threshold_ms: float, max_statements: int):
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_statements = max_statements
+        self.statements: dict[str, StatementStats] = {}
+        self.dropped = 0
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        key = fingerprint(statement)
+        stats = self.statements.get(key)
+        if stats is None:
+            if len(self.statements) >= self.max_statements:
+                # Unbounded fingerprints mean a normaliser gap; don't grow forever
+                self.dropped += 1
+                return
+            stats = self.statements[key] = StatementStats()
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.recent_ms.append(elapsed_ms)
+
+    def top(self, limit: int, order_by: str = "total") -> list[tuple[str, StatementStats]]:
+        keys = {
+            "total": lambda item: item[1].total_ms,
+            "p95": lambda item: item[1].p95_ms,
+            "count": lambda item: item[1].count,
+            "max": lambda item: item[1].max_ms,
+        }
+        return sorted(self.statements.items(), key=keys[order_by], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.dropped = 0
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["query_started"].pop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= self.slow_threshold_ms:
+            logger.warning(
+                "Slow query (%.1f ms%s): %s params=%s",
+                elapsed_ms,
+                ", executemany" if executemany else "",
+                fingerprint(statement),
+                parameter_shape(parameters),
+            )
+        if random.random() < self.sample_rate:
+            self.record(statement, elapsed_ms)
+
+    def _error(self, exception_context) -> None:
+        # The statement failed; drop its start time so the stack stays aligned
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+
+query_stats = QueryStats(
+    settings.QUERY_STATS_SAMPLE_RATE,
+    settings.SLOW_QUERY_THRESHOLD_MS,
+    settings.QUERY_STATS_MAX_STATEMENTS,
+)
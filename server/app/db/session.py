@@ -1,13 +1,18 @@
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
 
 from core.config import settings
+from db.models.base import BaseModel
 
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -19,6 +24,28 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+@event.listens_for(Session, "do_orm_execute")
+def _filter_soft_deleted(execute_state: ORMExecuteState) -> None:
+    """
+    Hide soft-deleted rows from every ORM SELECT, including joined entities
+    and the relationship loads it triggers. Opt out per statement with
+    `.execution_options(include_deleted=True)`.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                BaseModel,
+                lambda cls: cls.is_deleted == False,
+                include_aliases=True,
+            )
+        )
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
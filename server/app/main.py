@@ -2,12 +2,34 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.router import router
+from core.config import settings
 from core.lifespan import lifespan
 from core.logging import setup_logging
+from middleware.compression import CompressionMiddleware
+from middleware.idempotency import IdempotencyMiddleware
+from middleware.query_budget import QueryBudgetMiddleware
+from middleware.rate_limit import RateLimitMiddleware
+from middleware.timing import FirstRequestTimingMiddleware
 
 setup_logging()
 app = FastAPI(lifespan=lifespan)
 
+# Innermost, so only the handler's own statements count against its budget
+if settings.QUERY_BUDGET_ENABLED:
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Inside rate limiting, so retries still count; inside compression, so
+# responses are stored uncompressed and replays are encoded per request
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware)
+
+# Added before CORS so that 429 responses still carry CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -16,6 +38,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the logged time covers the whole middleware stack
+app.add_middleware(FirstRequestTimingMiddleware)
+
 app.include_router(router)
 
 
@@ -0,0 +1,80 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from utils.compression import CompressedPayload, compress, negotiate_encoding
+
+
+class PrecompressedResponse(Response):
+    """
+    Serves a CompressedPayload in the encoding the client accepts. The
+    compression middleware leaves it alone because Content-Encoding is set.
+    """
+
+    def __init__(self, payload: CompressedPayload, accept_encoding: str, status_code: int = 200):
+        body, encoding = payload.variant(negotiate_encoding(accept_encoding))
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        super().__init__(
+            content=body,
+            status_code=status_code,
+            headers=headers,
+            media_type=payload.media_type,
+        )
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-message responses with gzip, or brotli
+    when installed. Streaming responses (e.g. Server-Sent Events) and bodies
+    below COMPRESSION_MINIMUM_SIZE pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE
+        self.content_types = frozenset(settings.COMPRESSION_CONTENT_TYPES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            content_type = headers.get("content-type", "").partition(";")[0].strip()
+
+            if content_type in self.content_types and not more_body:
+                headers.add_vary_header("Accept-Encoding")
+                if (
+                    encoding is not None
+                    and "content-encoding" not in headers
+                    and len(body) >= self.minimum_size
+                ):
+                    compressed = compress(body, encoding)
+                    if len(compressed) < len(body):
+                        body = compressed
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(body))
+
+            await send(start_message)
+            start_message = None
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
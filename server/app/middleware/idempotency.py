@@ -0,0 +1,304 @@
+"""
+Idempotency-Key support for the POST endpoints in IDEMPOTENCY_PATHS.
+
+A client that may retry sends the same `Idempotency-Key` header on every
+attempt. The first attempt claims the key (per user) in the idempotency_key
+table and runs; its response is stored and replayed, with an
+`Idempotent-Replayed: true` header, to every repeat for IDEMPOTENCY_TTL_SECONDS.
+A repeat that arrives while the first attempt is still running waits for it
+(up to IDEMPOTENCY_WAIT_SECONDS, then 409) instead of running the handler
+again. Reusing a key for a different request is a 422.
+
+5xx responses are not stored: the handler's transaction was rolled back, so
+the claim is released and the next retry runs afresh. A claim left behind by
+a crashed worker can be taken over once IDEMPOTENCY_LOCK_SECONDS pass.
+Requests without a valid bearer token pass through; the handler rejects them.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from db.models.idempotency_key import IdempotencyKey
+from utils.tokens import decode_token_subject
+
+logger = logging.getLogger(__name__)
+
+_MAX_KEY_LENGTH = 255
+# Polling backoff while the in-flight attempt runs in another worker
+_POLL_INITIAL_SECONDS = 0.05
+_POLL_MAX_SECONDS = 1.0
+
+
+def _seconds(value: float):
+    return func.make_interval(0, 0, 0, 0, 0, 0, value)
+
+
+class IdempotencyStore:
+    """Claims and stored responses in the idempotency_key table."""
+
+    def __init__(self, engine, ttl: float, lock_seconds: float):
+        self.engine = engine
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+        self.table = IdempotencyKey.__table__
+
+    async def claim(self, user_id: uuid.UUID, key: str, request_hash: bytes) -> datetime | None:
+        """
+        Claim the key for one execution. Returns the claim's locked_until, which
+        identifies it to complete() and release(), or None if another request
+        holds or has answered the key. Expired and abandoned rows are taken over.
+        """
+        t = self.table
+        stmt = insert(t).values(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            locked_until=func.now() + _seconds(self.lock_seconds),
+            expires_at=func.now() + _seconds(self.ttl),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.user_id, t.c.key],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "status_code": None,
+                "content_type": None,
+                "response_body": None,
+                "created_at": func.now(),
+                "locked_until": stmt.excluded.locked_until,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=(t.c.expires_at < func.now())
+            | (t.c.status_code.is_(None) & (t.c.locked_until < func.now())),
+        ).returning(t.c.locked_until)
+        async with self.engine.begin() as conn:
+            result = await conn.execute(stmt)
+            return result.scalar_one_or_none()
+
+    async def get(self, user_id: uuid.UUID, key: str) -> Row | None:
+        t = self.table
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(t.c.request_hash, t.c.status_code, t.c.content_type, t.c.response_body)
+                .where(t.c.user_id == user_id, t.c.key == key, t.c.expires_at >= func.now())
+            )
+            return result.one_or_none()
+
+    def _claimed(self, user_id: uuid.UUID, key: str, claim: datetime):
+        t = self.table
+        return (
+            t.c.user_id == user_id,
+            t.c.key == key,
+            t.c.locked_until == claim,
+            t.c.status_code.is_(None),
+        )
+
+    async def complete(
+        self,
+        user_id: uuid.UUID,
+        key: str,
+        claim: datetime,
+        status_code: int,
+        content_type: str | None,
+        body: bytes,
+    ) -> None:
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                update(self.table)
+                .where(*self._claimed(user_id, key, claim))
+                .values(status_code=status_code, content_type=content_type, response_body=body)
+            )
+
+    async def release(self, user_id: uuid.UUID, key: str, claim: datetime) -> None:
+        async with self.engine.begin() as conn:
+            await conn.execute(delete(self.table).where(*self._claimed(user_id, key, claim)))
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+class IdempotencyMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: list[str] | None = None,
+        store: IdempotencyStore | None = None,
+        wait_seconds: float = settings.IDEMPOTENCY_WAIT_SECONDS,
+    ):
+        self.app = app
+        self.paths = frozenset(paths if paths is not None else settings.IDEMPOTENCY_PATHS)
+        if store is None:
+            from db.session import engine
+
+            store = IdempotencyStore(
+                engine, settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_LOCK_SECONDS
+            )
+        self.store = store
+        self.wait_seconds = wait_seconds
+        # Keys executing in this process; local duplicates wait on these instead of polling
+        self._inflight: dict[tuple[uuid.UUID, str], asyncio.Event] = {}
+
+    @staticmethod
+    def _request_key(scope: Scope) -> tuple[uuid.UUID | None, str | None]:
+        user_id = key = None
+        for name, value in scope.get("headers", ()):
+            if name == b"idempotency-key":
+                key = value.decode("latin-1")
+            elif name == b"authorization" and value[:7].lower() == b"bearer ":
+                user_id = decode_token_subject(value[7:].decode("latin-1"))
+        return user_id, key
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        user_id, key = self._request_key(scope)
+        if key is None or user_id is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > _MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be 1 to {_MAX_KEY_LENGTH} characters"},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        request_hash = hashlib.sha256(
+            b"\0".join(
+                [
+                    scope["method"].encode(),
+                    scope["path"].encode(),
+                    scope.get("query_string", b""),
+                    body,
+                ]
+            )
+        ).digest()
+
+        deadline = time.monotonic() + self.wait_seconds
+        delay = _POLL_INITIAL_SECONDS
+        while True:
+            claim = await self.store.claim(user_id, key, request_hash)
+            if claim is not None:
+                await self._execute(scope, receive, send, body, user_id, key, claim)
+                return
+
+            record = await self.store.get(user_id, key)
+            if record is None:
+                # Released or expired since the claim attempt; try again
+                continue
+            if record.request_hash != request_hash:
+                response = JSONResponse(
+                    {"detail": "Idempotency-Key was already used for a different request"},
+                    status_code=422,
+                )
+                break
+            if record.status_code is not None:
+                logger.info("Replaying idempotent response: user_id=%s key=%s", user_id, key)
+                response = Response(
+                    record.response_body,
+                    status_code=record.status_code,
+                    media_type=record.content_type,
+                    headers={"Idempotent-Replayed": "true"},
+                )
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                response = JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still in progress"},
+                    status_code=409,
+                    headers={"Retry-After": "1"},
+                )
+                break
+            event = self._inflight.get((user_id, key))
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(min(delay, remaining))
+                delay = min(delay * 2, _POLL_MAX_SECONDS)
+
+        await response(scope, receive, send)
+
+    async def _execute(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        body: bytes,
+        user_id: uuid.UUID,
+        key: str,
+        claim: datetime,
+    ) -> None:
+        """Run the handler on the buffered body, then store or release the claim."""
+        event = self._inflight[(user_id, key)] = asyncio.Event()
+        body_sent = False
+        status_code = 500
+        content_type = None
+        chunks: list[bytes] = []
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        succeeded = False
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+            succeeded = status_code < 500
+        finally:
+            try:
+                if succeeded:
+                    await self.store.complete(
+                        user_id, key, claim, status_code, content_type, b"".join(chunks)
+                    )
+                else:
+                    await self.store.release(user_id, key, claim)
+            except Exception:
+                # The claim now lapses after IDEMPOTENCY_LOCK_SECONDS instead
+                logger.exception("Failed to record idempotent response: key=%s", key)
+            finally:
+                # A takeover in this process may have replaced the entry since
+                if self._inflight.get((user_id, key)) is event:
+                    del self._inflight[(user_id, key)]
+                event.set()
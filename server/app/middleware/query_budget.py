@@ -0,0 +1,120 @@
+"""
+Per-request query budgets, for development and CI.
+
+Endpoints declare how many statements a request may send with
+`@query_budget(n)`. While QUERY_BUDGET_ENABLED is set, every request counts
+its statements; going over budget, or repeating one statement shape
+QUERY_BUDGET_REPEAT_THRESHOLD times or more (the N+1 signature of a lazy
+load in a loop), is logged with the offending shapes. With
+QUERY_BUDGET_ENFORCE the request fails with a 500 instead, so a regression
+breaks the test run that exercises the route.
+
+The integration tests turn counting on and fail any test whose requests
+break a budget (the `query_budgets` fixture in tests/integration/conftest.py),
+through `violation_handlers`.
+"""
+import logging
+from collections import Counter
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import TypeVar
+
+from sqlalchemy import event
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from db.query_stats import fingerprint
+from db.session import engine
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+_statements: ContextVar[list[str] | None] = ContextVar("request_statements", default=None)
+
+# Called with ("METHOD /path", violations) for every request that breaks a budget
+violation_handlers: list[Callable[[str, list[str]], None]] = []
+
+
+def query_budget(max_statements: int) -> Callable[[F], F]:
+    """Declare the most statements one request to this endpoint may send."""
+
+    def decorator(endpoint: F) -> F:
+        endpoint.__query_budget__ = max_statements
+        return endpoint
+
+    return decorator
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+def repeated_shapes(statements: list[str], threshold: int) -> list[tuple[str, int]]:
+    """Statement fingerprints sent at least `threshold` times, most frequent first."""
+    counts = Counter(fingerprint(statement) for statement in statements)
+    return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+
+class QueryBudgetMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        enforce: bool = settings.QUERY_BUDGET_ENFORCE,
+        repeat_threshold: int = settings.QUERY_BUDGET_REPEAT_THRESHOLD,
+    ):
+        self.app = app
+        self.enforce = enforce
+        self.repeat_threshold = repeat_threshold
+        if not event.contains(engine.sync_engine, "before_cursor_execute", _count_statement):
+            event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+
+    def _violations(self, scope: Scope, statements: list[str]) -> list[str]:
+        violations = []
+        budget = getattr(scope.get("endpoint"), "__query_budget__", None)
+        if budget is not None and len(statements) > budget:
+            violations.append(f"sent {len(statements)} statements, budget is {budget}")
+        for shape, n in repeated_shapes(statements, self.repeat_threshold):
+            violations.append(f"possible N+1: {n}x {shape}")
+        return violations
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        statements: list[str] = []
+        token = _statements.set(statements)
+        replaced = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal replaced
+            if message["type"] == "http.response.start":
+                # The handler has finished its queries once the response starts
+                violations = self._violations(scope, statements)
+                if violations:
+                    request = f"{scope['method']} {scope['path']}"
+                    logger.warning(
+                        "Query budget violation on %s: %s", request, "; ".join(violations)
+                    )
+                    for handler in violation_handlers:
+                        handler(request, violations)
+                    if self.enforce:
+                        replaced = True
+                        response = JSONResponse(
+                            {"detail": "Query budget exceeded", "violations": violations},
+                            status_code=500,
+                        )
+                        await response(scope, receive, send)
+                        return
+            elif replaced:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _statements.reset(token)
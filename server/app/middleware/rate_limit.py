@@ -0,0 +1,225 @@
+import logging
+import math
+import time
+from typing import Protocol
+
+from sqlalchemy import text
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.config import RateLimitRule, settings
+from utils.tokens import decode_token_subject
+
+logger = logging.getLogger(__name__)
+
+_TOO_MANY_REQUESTS_BODY = b'{"detail":"Too many requests"}'
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """Take one token for `key`. Returns 0 if allowed, else seconds until retry."""
+        ...
+
+
+class InMemoryRateLimitBackend:
+    """Per-process token buckets. Limits are not shared between workers."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [tokens, last_refill, seconds to refill from empty]; mutated in
+        # place to avoid allocations. Keys under different rules refill at
+        # different speeds, so each bucket carries its own.
+        self._buckets: dict[str, list[float]] = {}
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            self._buckets[key] = [burst - 1.0, now, burst / rate]
+            return 0.0
+
+        tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1.0:
+            bucket[0] = tokens - 1.0
+            return 0.0
+        bucket[0] = tokens
+        return (1.0 - tokens) / rate
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled completely; they carry no state."""
+        stale = [k for k, (_, last, full_after) in self._buckets.items() if now - last >= full_after]
+        for k in stale:
+            del self._buckets[k]
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+
+class PostgresRateLimitBackend:
+    """Token buckets in an unlogged table so limits hold across uvicorn workers.
+
+    The refill and take happen in one upsert, so concurrent workers never
+    read-modify-write the same bucket. Rows are only ever added here; purge()
+    deletes the ones that have refilled completely.
+    """
+
+    _ACQUIRE = text(
+        """
+        INSERT INTO rate_limit_bucket AS b (key, tokens, allowed, updated_at)
+        VALUES (:key, :burst - 1, true, clock_timestamp())
+        ON CONFLICT (key) DO UPDATE SET
+            allowed = LEAST(:burst, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate) >= 1,
+            tokens = LEAST(:burst, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate)
+                - CASE WHEN LEAST(:burst, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate) >= 1
+                       THEN 1 ELSE 0 END,
+            updated_at = clock_timestamp()
+        RETURNING allowed, tokens
+        """
+    )
+
+    # One page of the primary key per statement. A row is deleted once it has
+    # been idle for its own rule's burst / rate seconds (rules are passed as
+    # arrays, keys start with "<prefix>|"); buckets of rules since removed
+    # from settings go at once. The idle check is re-evaluated against a row
+    # updated concurrently, so a bucket in use is never deleted.
+    _PURGE = text(
+        """
+        WITH batch AS (
+            SELECT key FROM rate_limit_bucket
+            WHERE key > :after
+            ORDER BY key
+            LIMIT :batch_size
+        ), rules AS (
+            SELECT * FROM unnest(CAST(:prefixes AS text[]), CAST(:full_after AS float8[]))
+                AS r(prefix, full_after)
+        ), purged AS (
+            DELETE FROM rate_limit_bucket b
+            USING batch
+            WHERE b.key = batch.key
+              AND b.updated_at < clock_timestamp() - make_interval(secs => COALESCE(
+                  (SELECT full_after FROM rules WHERE rules.prefix = split_part(b.key, '|', 1)),
+                  0))
+            RETURNING 1
+        )
+        SELECT (SELECT max(key) FROM batch) AS last_key, (SELECT count(*) FROM purged) AS purged
+        """
+    )
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                self._ACQUIRE, {"key": key, "rate": rate, "burst": burst}
+            )
+            allowed, tokens = result.one()
+        if allowed:
+            return 0.0
+        return (1.0 - float(tokens)) / rate
+
+    async def purge(self, rules: list[RateLimitRule], batch_size: int) -> int:
+        """Delete buckets that have refilled completely. Returns the number deleted."""
+        # Rules sharing a prefix share buckets; keep each until the slowest has refilled
+        full_after: dict[str, float] = {}
+        for rule in rules:
+            full_after[rule.prefix] = max(full_after.get(rule.prefix, 0.0), rule.burst / rule.rate)
+        params = {
+            "prefixes": list(full_after),
+            "full_after": list(full_after.values()),
+            "batch_size": batch_size,
+            "after": "",
+        }
+        purged = 0
+        while True:
+            async with self.engine.begin() as conn:
+                result = await conn.execute(self._PURGE, params)
+                last_key, deleted = result.one()
+            purged += deleted
+            if last_key is None:
+                return purged
+            params["after"] = last_key
+
+
+def create_backend(name: str) -> RateLimitBackend:
+    if name == "memory":
+        return InMemoryRateLimitBackend()
+    if name == "postgres":
+        from db.session import engine
+
+        return PostgresRateLimitBackend(engine)
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying per-user (when a bearer token is present) or
+    per-IP token buckets to the route prefixes configured in settings.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: list[RateLimitRule] | None = None,
+        backend: RateLimitBackend | None = None,
+    ):
+        self.app = app
+        self.rules = rules if rules is not None else settings.RATE_LIMIT_RULES
+        self.backend = backend or create_backend(settings.RATE_LIMIT_BACKEND)
+
+    def _match(self, scope: Scope) -> RateLimitRule | None:
+        path = scope["path"]
+        for rule in self.rules:
+            # Whole path segments only: /api/auth must not cover /api/authors
+            prefix = rule.prefix.rstrip("/")
+            if path != prefix and not path.startswith(prefix + "/"):
+                continue
+            if rule.query_param is not None:
+                query = scope.get("query_string", b"")
+                name = rule.query_param.encode()
+                if not (query.startswith(name + b"=") or b"&" + name + b"=" in query):
+                    continue
+            return rule
+        return None
+
+    @staticmethod
+    def _client_key(scope: Scope) -> str:
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization" and value[:7].lower() == b"bearer ":
+                user_id = decode_token_subject(value[7:].decode("latin-1"))
+                if user_id is not None:
+                    return f"user:{user_id}"
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._match(scope)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = f"{rule.prefix}|{self._client_key(scope)}"
+        retry_after = await self.backend.acquire(key, rule.rate, rule.burst)
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+
+        logger.warning("Rate limit exceeded: key=%s", key)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_TOO_MANY_REQUESTS_BODY)).encode()),
+                    (b"retry-after", str(math.ceil(retry_after)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": _TOO_MANY_REQUESTS_BODY})
@@ -0,0 +1,31 @@
+import logging
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class FirstRequestTimingMiddleware:
+    """Logs how long the first HTTP request of this worker took, then steps aside."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.timed = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.timed or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.timed = True
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            logger.info(
+                "First request %s %s took %.1f ms",
+                scope["method"],
+                scope["path"],
+                (time.perf_counter() - started) * 1000,
+            )
@@ -0,0 +1,74 @@
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class QueryStatResponse(BaseModel):
+    fingerprint: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class QueryStatsResponse(BaseModel):
+    sample_rate: float
+    slow_threshold_ms: float
+    # Fingerprints not tracked because the statement limit was reached
+    dropped: int
+    statements: list[QueryStatResponse]
+
+
+class ResultCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    coalesced: int
+    hit_ratio: float
+    entries: int
+    bytes: int
+    max_bytes: int
+    catalog_version: int
+
+
+class DailySalesResponse(BaseModel):
+    day: date
+    order_count: int
+    units: int
+    revenue: Decimal
+
+
+class CategorySalesResponse(BaseModel):
+    category_id: uuid.UUID
+    name: str
+    units: int
+    revenue: Decimal
+
+
+class ProductSalesResponse(BaseModel):
+    product_id: uuid.UUID
+    name: str
+    order_count: int
+    units: int
+    revenue: Decimal
+
+
+class SalesReportResponse(BaseModel):
+    start: date
+    end: date
+    # Orders changed after this time may not be reflected yet
+    rollup_watermark: datetime
+
+
+class DailySalesReportResponse(SalesReportResponse):
+    days: list[DailySalesResponse]
+
+
+class CategorySalesReportResponse(SalesReportResponse):
+    categories: list[CategorySalesResponse]
+
+
+class ProductSalesReportResponse(SalesReportResponse):
+    products: list[ProductSalesResponse]
@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+
+class AddCartItemRequest(BaseModel):
+    product_id: uuid.UUID
+    quantity: int = Field(1, ge=1, le=100)
+
+
+class CartItemResponse(BaseModel):
+    product_id: uuid.UUID
+    name: str
+    price: Decimal
+    image_url: str | None = None
+    quantity: int
+    subtotal: Decimal
+
+    model_config = {"from_attributes": True}
+
+
+class CartResponse(BaseModel):
+    items: list[CartItemResponse]
+    total_items: int
+    total: Decimal
+
+
+class CartReservationResponse(BaseModel):
+    expires_at: datetime
@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+from db.models.order import OrderStatus
+
+
+class CheckoutRequest(BaseModel):
+    shipping_address_id: uuid.UUID
+    notes: str | None = Field(None, max_length=1000)
+
+
+class OrderStatusUpdateRequest(BaseModel):
+    status: OrderStatus
+
+
+class OrderItemProductResponse(BaseModel):
+    id: uuid.UUID
+    name: str
+    slug: str
+    image_url: str | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class OrderItemResponse(BaseModel):
+    id: uuid.UUID
+    product_id: uuid.UUID
+    product: OrderItemProductResponse
+    quantity: int
+    unit_price: Decimal
+    total_price: Decimal
+
+    model_config = {"from_attributes": True}
+
+
+class OrderResponse(BaseModel):
+    id: uuid.UUID
+    order_number: str
+    status: OrderStatus
+    total: Decimal
+    shipping_address_id: uuid.UUID
+    notes: str | None = None
+    created_at: datetime
+    items: list[OrderItemResponse]
+
+    model_config = {"from_attributes": True}
+
+
+class OrderListResponse(BaseModel):
+    orders: list[OrderResponse]
+    next_cursor: str | None = None
+    has_more: bool
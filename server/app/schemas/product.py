@@ -2,7 +2,10 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, create_model
 
 
 class CategoryResponse(BaseModel):
@@ -24,6 +27,7 @@ class ProductResponse(BaseModel):
     compare_price: Decimal | None = None
     sku: str | None = None
     stock_quantity: int
+    available_quantity: int
     is_active: bool
     image_url: str | None = None
     category_id: uuid.UUID
@@ -41,3 +45,54 @@ class ProductListResponse(BaseModel):
     products: list[ProductResponse]
     next_cursor: str | None = None
     has_more: bool
+
+
+@lru_cache(maxsize=256)
+def sparse_product_model(fields: tuple[str, ...], include_category: bool) -> type[BaseModel]:
+    """
+    ProductResponse cut down to `fields` (optionally with the category), for
+    `fields=` / `include=` requests. Validating only reads those attributes,
+    so products loaded with just the matching columns serialize safely.
+    """
+    definitions = {name: (ProductResponse.model_fields[name].annotation, ...) for name in fields}
+    if include_category:
+        definitions["category"] = (CategoryResponse, ...)
+    return create_model(
+        "SparseProductResponse",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+class ProductRecommendationsResponse(BaseModel):
+    product_id: uuid.UUID
+    products: list[ProductResponse]
+
+
+class ProductSearchResponse(BaseModel):
+    query: str
+    mode: str
+    products: list[ProductResponse]
+
+
+class ProductBulkUpdateItem(BaseModel):
+    sku: str = Field(..., min_length=1, max_length=100)
+    price: Decimal = Field(..., ge=0, max_digits=10, decimal_places=2)
+    compare_price: Decimal | None = Field(None, ge=0, max_digits=10, decimal_places=2)
+    stock_quantity: int = Field(..., ge=0)
+
+
+class ProductBulkUpdateRequest(BaseModel):
+    items: list[ProductBulkUpdateItem] = Field(..., min_length=1, max_length=10_000)
+
+
+class ProductBulkUpdateResult(BaseModel):
+    sku: str
+    # below_reserved: the new stock would not cover units already held in carts
+    status: Literal["updated", "not_found", "below_reserved", "duplicate"]
+    product_id: uuid.UUID | None = None
+
+
+class ProductBulkUpdateResponse(BaseModel):
+    updated: int
+    results: list[ProductBulkUpdateResult]
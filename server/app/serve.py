@@ -0,0 +1,37 @@
+"""
+Production entry point: `python serve.py`.
+
+Runs WEB_CONCURRENCY uvicorn worker processes (default: the CPUs this process
+may use) with uvloop and httptools when installed. The supervisor restarts
+workers that die; send SIGHUP to restart them all gracefully, e.g. after a
+config change. Each worker drains in-flight requests for up to
+GRACEFUL_SHUTDOWN_SECONDS before exiting.
+"""
+import os
+
+import uvicorn
+
+from core.config import settings
+
+
+def worker_count() -> int:
+    if settings.WEB_CONCURRENCY is not None:
+        return settings.WEB_CONCURRENCY
+    # Respects CPU affinity / container cpusets where available
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=worker_count(),
+        loop="auto",
+        http="auto",
+        proxy_headers=True,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+        access_log=settings.DEBUG,
+    )
@@ -0,0 +1,108 @@
+import logging
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.cart import Cart
+from db.models.cart_item import CartItem
+from db.models.product import Product
+from schemas.cart import CartItemResponse, CartResponse
+from utils.ids import uuid7
+
+logger = logging.getLogger(__name__)
+
+
+class CartService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_item(self, user_id: uuid.UUID, product_id: uuid.UUID, quantity: int) -> bool:
+        """
+        Add `quantity` of a product to the user's cart in a single statement.
+        The cart is created on first use inside the same statement.
+        Returns False if the product does not exist or is not purchasable.
+        """
+        cart_cte = (
+            insert(Cart)
+            .values(id=uuid7(), user_id=user_id, is_deleted=False)
+            .on_conflict_do_update(
+                index_elements=[Cart.user_id],
+                set_={"updated_at": func.now(), "is_deleted": False},
+            )
+            .returning(Cart.id)
+            .cte("upserted_cart")
+        )
+
+        source = select(
+            literal(uuid7(), CartItem.id.type),
+            cart_cte.c.id,
+            Product.id,
+            literal(quantity),
+            literal(False),
+        ).where(
+            Product.id == product_id,
+            Product.is_active == True,
+            Product.is_deleted == False,
+        )
+
+        stmt = insert(CartItem).from_select(
+            ["id", "cart_id", "product_id", "quantity", "is_deleted"], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_cart_product",
+            set_={
+                # A soft-deleted line starts over instead of reviving its old quantity
+                "quantity": case(
+                    (CartItem.is_deleted == True, stmt.excluded.quantity),
+                    else_=CartItem.quantity + stmt.excluded.quantity,
+                ),
+                "is_deleted": False,
+                "updated_at": func.now(),
+            },
+        ).returning(CartItem.id)
+
+        result = await self.db.execute(stmt)
+        added = result.scalar_one_or_none() is not None
+        await self.db.commit()
+        return added
+
+    async def get_lines(self, user_id: uuid.UUID) -> tuple[uuid.UUID | None, dict[uuid.UUID, int]]:
+        """Return the user's cart ID and its lines as {product_id: quantity}."""
+        result = await self.db.execute(
+            select(Cart.id, CartItem.product_id, CartItem.quantity)
+            .join(CartItem, CartItem.cart_id == Cart.id)
+            .where(Cart.user_id == user_id)
+        )
+        rows = result.all()
+        if not rows:
+            return None, {}
+        return rows[0].id, {row.product_id: row.quantity for row in rows}
+
+    async def get_cart(self, user_id: uuid.UUID) -> CartResponse:
+        """Read all cart lines with current product prices in one joined query."""
+        subtotal = (Product.price * CartItem.quantity).label("subtotal")
+        query = (
+            select(
+                CartItem.product_id,
+                Product.name,
+                Product.price,
+                Product.image_url,
+                CartItem.quantity,
+                subtotal,
+            )
+            .join(Cart, Cart.id == CartItem.cart_id)
+            .join(Product, Product.id == CartItem.product_id)
+            .where(Cart.user_id == user_id)
+            .order_by(CartItem.created_at, CartItem.id)
+        )
+        result = await self.db.execute(query)
+        items = [CartItemResponse.model_validate(row) for row in result.all()]
+
+        return CartResponse(
+            items=items,
+            total_items=sum(item.quantity for item in items),
+            total=sum((item.subtotal for item in items), Decimal("0")),
+        )
@@ -0,0 +1,102 @@
+import logging
+import uuid
+from collections import Counter
+
+from sqlalchemy import Integer, Numeric, String, cast, column, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import invalidation
+from db.models.product import Product
+from schemas.product import ProductBulkUpdateItem, ProductBulkUpdateResult
+
+logger = logging.getLogger(__name__)
+
+# Four bind parameters per row; asyncpg allows 32767 per statement
+_ROWS_PER_STATEMENT = 5000
+
+
+class CatalogService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _apply(self, items: list[ProductBulkUpdateItem]) -> dict[str, uuid.UUID]:
+        """One UPDATE ... FROM (VALUES ...) for `items`. Returns {sku: id} updated."""
+        incoming = values(
+            column("sku", String(100)),
+            column("price", Numeric(10, 2)),
+            column("compare_price", Numeric(10, 2)),
+            column("stock_quantity", Integer),
+            name="incoming",
+        ).data([(i.sku, i.price, i.compare_price, i.stock_quantity) for i in items])
+        result = await self.db.execute(
+            update(Product)
+            .where(
+                Product.sku == incoming.c.sku,
+                # Never drop stock below what carts already hold
+                Product.reserved_quantity <= incoming.c.stock_quantity,
+                Product.is_deleted == False,
+            )
+            .values(
+                price=incoming.c.price,
+                # NULLs are sent untyped; when every row has one, Postgres
+                # takes the column as text
+                compare_price=cast(incoming.c.compare_price, Numeric(10, 2)),
+                stock_quantity=incoming.c.stock_quantity,
+            )
+            .returning(Product.sku, Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        return {row.sku: row.id for row in result.all()}
+
+    async def bulk_update(
+        self, items: list[ProductBulkUpdateItem]
+    ) -> list[ProductBulkUpdateResult]:
+        """
+        Apply price and stock updates keyed by SKU in one transaction and
+        report the outcome of each row, in input order.
+        """
+        counts = Counter(item.sku for item in items)
+        unique = [item for item in items if counts[item.sku] == 1]
+
+        updated: dict[str, uuid.UUID] = {}
+        for i in range(0, len(unique), _ROWS_PER_STATEMENT):
+            updated.update(await self._apply(unique[i:i + _ROWS_PER_STATEMENT]))
+
+        # Tell "unknown SKU" apart from "stock below reservations"
+        missed = [item.sku for item in unique if item.sku not in updated]
+        existing: dict[str, uuid.UUID] = {}
+        if missed:
+            result = await self.db.execute(
+                select(Product.sku, Product.id).where(Product.sku.in_(missed))
+            )
+            existing = {row.sku: row.id for row in result.all()}
+
+        if updated:
+            # A single whole-entity event: per-key messages would need one
+            # NOTIFY per 150 SKUs for an ERP batch
+            await invalidation.publish(self.db, "product")
+        await self.db.commit()
+
+        results = []
+        for item in items:
+            if counts[item.sku] > 1:
+                results.append(ProductBulkUpdateResult(sku=item.sku, status="duplicate"))
+            elif item.sku in updated:
+                results.append(
+                    ProductBulkUpdateResult(
+                        sku=item.sku, status="updated", product_id=updated[item.sku]
+                    )
+                )
+            elif item.sku in existing:
+                results.append(
+                    ProductBulkUpdateResult(
+                        sku=item.sku, status="below_reserved", product_id=existing[item.sku]
+                    )
+                )
+            else:
+                results.append(ProductBulkUpdateResult(sku=item.sku, status="not_found"))
+
+        logger.info(
+            "Bulk product update: %d updated, %d rejected", len(updated), len(items) - len(updated)
+        )
+        return results
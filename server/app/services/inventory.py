@@ -0,0 +1,178 @@
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, Integer, Uuid, column, delete, func, insert, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import invalidation
+from core.config import settings
+from db.models.product import Product
+from db.models.stock_reservation import StockReservation
+from services.cart import CartService
+from utils.ids import uuid7
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientStockError(ValueError):
+    """Raised when one or more cart lines cannot be fulfilled."""
+
+    def __init__(self, product_ids: list[uuid.UUID]):
+        self.product_ids = product_ids
+        super().__init__("Insufficient stock for one or more products")
+
+
+def _quantities(lines: dict[uuid.UUID, int]):
+    """VALUES list of (product_id, quantity) usable in UPDATE ... FROM."""
+    return values(
+        column("product_id", Uuid),
+        column("quantity", Integer),
+        name="requested",
+    ).data(sorted(lines.items()))
+
+
+def _locked(product_ids):
+    """
+    CTE that locks the products in ID order. An UPDATE ... FROM locks rows in
+    join order, which follows its input (the cart's insertion order) once the
+    catalog is large enough for index lookups, so two statements sharing
+    products in opposite orders could deadlock. Joining this first makes every
+    multi-product update lock in the same order.
+    """
+    return (
+        select(Product.id)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update()
+        .cte("locked")
+    )
+
+
+class InventoryService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def decrement_stock(self, lines: dict[uuid.UUID, int]) -> dict[uuid.UUID, Decimal]:
+        """
+        Decrement stock for every line in one set-based UPDATE.
+        Rows without enough unreserved stock are simply not matched, so no
+        row-by-row SELECT ... FOR UPDATE is needed. Returns {product_id: price}
+        for the lines that were decremented.
+        """
+        requested = _quantities(lines)
+        locked = _locked(list(lines))
+        stmt = (
+            update(Product)
+            .where(
+                Product.id == locked.c.id,
+                Product.id == requested.c.product_id,
+                Product.stock_quantity - Product.reserved_quantity >= requested.c.quantity,
+                Product.is_active == True,
+                Product.is_deleted == False,
+            )
+            .values(stock_quantity=Product.stock_quantity - requested.c.quantity)
+            .returning(Product.id, Product.price)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        prices = {row.id: row.price for row in result.all()}
+        await invalidation.publish(self.db, "product", prices)
+        return prices
+
+    async def release(self, criteria: ColumnElement[bool]) -> int:
+        """
+        Delete the reservations matching `criteria` and give their quantities
+        back to Product.reserved_quantity, in one statement.
+        Returns the number of products whose reserved quantity changed.
+        """
+        released = (
+            delete(StockReservation)
+            .where(criteria)
+            .returning(StockReservation.product_id, StockReservation.quantity)
+            .cte("released")
+        )
+        totals = (
+            select(
+                released.c.product_id,
+                func.sum(released.c.quantity).label("quantity"),
+            )
+            .group_by(released.c.product_id)
+            .cte("totals")
+        )
+        locked = _locked(select(totals.c.product_id))
+        stmt = (
+            update(Product)
+            .where(Product.id == locked.c.id, Product.id == totals.c.product_id)
+            .values(reserved_quantity=Product.reserved_quantity - totals.c.quantity)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        product_ids = result.scalars().all()
+        await invalidation.publish(self.db, "product", product_ids)
+        return len(product_ids)
+
+    async def release_for_user(self, user_id: uuid.UUID) -> int:
+        """Release all of the user's holds, expired or not. Does not commit."""
+        return await self.release(StockReservation.user_id == user_id)
+
+    async def reserve_cart(self, user_id: uuid.UUID) -> datetime:
+        """
+        Hold the user's cart quantities for RESERVATION_TTL_MINUTES.
+        Any previous holds of the user are replaced. Raises ValueError if the
+        cart is empty and InsufficientStockError if any line cannot be held.
+        """
+        logger.info("Reserving cart stock for user_id=%s", user_id)
+        await self.release_for_user(user_id)
+
+        _, lines = await CartService(self.db).get_lines(user_id)
+        if not lines:
+            await self.db.rollback()
+            raise ValueError("Cart is empty")
+
+        requested = _quantities(lines)
+        locked = _locked(list(lines))
+        result = await self.db.execute(
+            update(Product)
+            .where(
+                Product.id == locked.c.id,
+                Product.id == requested.c.product_id,
+                Product.stock_quantity - Product.reserved_quantity >= requested.c.quantity,
+                Product.is_active == True,
+                Product.is_deleted == False,
+            )
+            .values(reserved_quantity=Product.reserved_quantity + requested.c.quantity)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        held = set(result.scalars().all())
+        if len(held) != len(lines):
+            await self.db.rollback()
+            short = [product_id for product_id in lines if product_id not in held]
+            logger.warning("Reservation failed: insufficient stock for product_ids=%s", short)
+            raise InsufficientStockError(short)
+
+        await invalidation.publish(self.db, "product", held)
+
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            minutes=settings.RESERVATION_TTL_MINUTES
+        )
+        await self.db.execute(
+            insert(StockReservation),
+            [
+                {
+                    "id": uuid7(),
+                    "user_id": user_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "expires_at": expires_at,
+                    "is_deleted": False,
+                }
+                for product_id, quantity in lines.items()
+            ],
+        )
+        await self.db.commit()
+        logger.info("Cart stock reserved for user_id=%s until %s", user_id, expires_at)
+        return expires_at
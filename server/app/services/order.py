@@ -0,0 +1,193 @@
+import logging
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, delete, insert, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from core.events import publish_order_status
+from db.models.address import Address
+from db.models.cart_item import CartItem
+from db.models.order import Order, OrderStatus
+from db.models.order_item import OrderItem
+from services.cart import CartService
+from services.inventory import InsufficientStockError, InventoryService
+from utils.ids import uuid7, uuid7_time
+
+logger = logging.getLogger(__name__)
+
+
+# Items and their products are each loaded with one IN query for the whole
+# page, so a page costs three queries whatever its size.
+_ORDER_ITEMS_LOADER = (
+    selectinload(Order.items.and_(OrderItem.is_deleted == False))
+    .selectinload(OrderItem.product)
+)
+
+
+def _select_orders():
+    """
+    Live orders with their live items. The soft-delete filter is applied here
+    rather than globally, because the global one would also reach the product
+    loader: an order keeps showing the products it was placed for after they
+    are deleted from the catalog.
+    """
+    return (
+        select(Order)
+        .options(_ORDER_ITEMS_LOADER)
+        .where(Order.is_deleted == False)
+        .execution_options(include_deleted=True)
+    )
+
+# Slack between the time in a UUIDv7 order ID and the order's created_at
+_ID_TIME_SLACK = timedelta(hours=1)
+
+
+def _partition_bounds(order_id: uuid.UUID) -> list[ColumnElement[bool]]:
+    """
+    created_at range implied by a UUIDv7 order ID, so lookups by ID are pruned
+    to one or two monthly partitions. Older uuid4 IDs carry no time.
+    """
+    id_time = uuid7_time(order_id)
+    if id_time is None:
+        return []
+    return [
+        Order.created_at >= id_time - _ID_TIME_SLACK,
+        Order.created_at < id_time + _ID_TIME_SLACK,
+    ]
+
+
+class OrderService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_orders(
+        self,
+        user_id: uuid.UUID,
+        limit: int,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Order]:
+        """
+        Get up to `limit` of the user's orders, newest first, with items.
+        `after` is the (created_at, id) keyset of the last order already seen.
+        """
+        query = _select_orders().where(Order.user_id == user_id)
+        if after is not None:
+            cursor_created_at, cursor_id = after
+            query = query.where(
+                or_(
+                    Order.created_at < cursor_created_at,
+                    tuple_(Order.created_at, Order.id) < tuple_(cursor_created_at, cursor_id),
+                )
+            )
+        query = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_order(self, user_id: uuid.UUID, order_id: uuid.UUID) -> Order | None:
+        """Get one of the user's orders with its items."""
+        result = await self.db.execute(
+            _select_orders()
+            .where(Order.id == order_id, Order.user_id == user_id, *_partition_bounds(order_id))
+        )
+        return result.scalar_one_or_none()
+
+    async def checkout(
+        self,
+        user_id: uuid.UUID,
+        shipping_address_id: uuid.UUID,
+        notes: str | None = None,
+    ) -> Order:
+        """
+        Place an order from the user's cart.
+        Raises ValueError if the cart is empty or the address is invalid, and
+        InsufficientStockError if any line is short; nothing is written then.
+        """
+        logger.info("Processing checkout for user_id=%s", user_id)
+
+        address_id = await self.db.scalar(
+            select(Address.id).where(
+                Address.id == shipping_address_id,
+                Address.user_id == user_id,
+            )
+        )
+        if address_id is None:
+            raise ValueError("Shipping address not found")
+
+        cart_id, lines = await CartService(self.db).get_lines(user_id)
+        if not lines:
+            raise ValueError("Cart is empty")
+
+        # The user's own holds are released in this transaction, so the stock
+        # they covered is available to the decrement below and to nobody else.
+        inventory = InventoryService(self.db)
+        await inventory.release_for_user(user_id)
+        prices = await inventory.decrement_stock(lines)
+        if len(prices) != len(lines):
+            await self.db.rollback()
+            short = [product_id for product_id in lines if product_id not in prices]
+            logger.warning("Checkout failed: insufficient stock for product_ids=%s", short)
+            raise InsufficientStockError(short)
+
+        order_id = uuid7()
+        total = sum(
+            (prices[product_id] * quantity for product_id, quantity in lines.items()),
+            Decimal("0"),
+        )
+
+        # order_number and created_at are filled in by server defaults in this same INSERT
+        result = await self.db.execute(
+            insert(Order).values(
+                id=order_id,
+                user_id=user_id,
+                status=OrderStatus.PENDING,
+                total=total,
+                shipping_address_id=shipping_address_id,
+                notes=notes,
+                is_deleted=False,
+            ).returning(Order.order_number, Order.created_at)
+        )
+        order_number, created_at = result.one()
+
+        item_rows = [
+            {
+                "id": uuid7(),
+                "order_id": order_id,
+                "order_created_at": created_at,
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": prices[product_id],
+                "total_price": prices[product_id] * quantity,
+                "is_deleted": False,
+            }
+            for product_id, quantity in lines.items()
+        ]
+        await self.db.execute(insert(OrderItem), item_rows)
+        await self.db.execute(delete(CartItem).where(CartItem.cart_id == cart_id))
+        await publish_order_status(
+            self.db, user_id, order_id, order_number, OrderStatus.PENDING
+        )
+        await self.db.commit()
+
+        logger.info("Checkout completed: order_id=%s, total=%s", order_id, total)
+        return await self.get_order(user_id, order_id)
+
+    async def set_status(self, order_id: uuid.UUID, status: OrderStatus) -> Order | None:
+        """Change an order's status and notify its owner. Returns None if not found."""
+        logger.info("Setting order status: order_id=%s, status=%s", order_id, status.value)
+        result = await self.db.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.is_deleted == False, *_partition_bounds(order_id))
+            .values(status=status)
+            .returning(Order.user_id, Order.order_number)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        await publish_order_status(self.db, row.user_id, order_id, row.order_number, status)
+        await self.db.commit()
+        return await self.get_order(row.user_id, order_id)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import uuid
+from array import array
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import invalidation
+from core.cache import LocalCache, register_cache
+from db.models.order_item import OrderItem
+from db.models.product import Product
+from db.models.product_recommendation import ProductRecommendation
+
+logger = logging.getLogger(__name__)
+
+# str(product_id) -> recommended product IDs in rank order. Cleared on every
+# worker when a rebuild publishes a "recommendation" invalidation.
+_recommendation_cache = register_cache(
+    "recommendation", LocalCache(maxsize=50_000, ttl=6 * 60 * 60)
+)
+
+
+def compute_top_k(
+    order_index: np.ndarray,
+    product_index: np.ndarray,
+    n_products: int,
+    k: int,
+    min_co_count: int = 2,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Item-item co-purchase top-K from (order, product) pairs given as dense
+    integer indexes. Scores are co-occurrence counts normalised by
+    sqrt(orders(i) * orders(j)), so best-sellers do not dominate every list.
+
+    Returns parallel arrays (product, recommended product, score), sorted by
+    product and then by descending score.
+    """
+    n_orders = int(order_index.max()) + 1 if order_index.size else 0
+    # Binary order x product incidence; duplicates within an order collapse to 1
+    incidence = sparse.csr_matrix(
+        (np.ones(order_index.size, dtype=np.float32), (order_index, product_index)),
+        shape=(n_orders, n_products),
+    )
+    incidence.data[:] = 1.0
+
+    co_counts = (incidence.T @ incidence).tocsr()
+    co_counts.setdiag(0)
+    co_counts.data[co_counts.data < min_co_count] = 0
+    co_counts.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(incidence.sum(axis=0)).ravel())
+    rows = np.repeat(np.arange(n_products), np.diff(co_counts.indptr))
+    scores = co_counts.data / (norms[rows] * norms[co_counts.indices])
+
+    sources, targets, values = [], [], []
+    for product in range(n_products):
+        start, end = co_counts.indptr[product], co_counts.indptr[product + 1]
+        if start == end:
+            continue
+        row_scores = scores[start:end]
+        if end - start > k:
+            top = np.argpartition(row_scores, -k)[-k:]
+        else:
+            top = np.arange(end - start)
+        top = top[np.argsort(-row_scores[top], kind="stable")]
+        sources.append(np.full(top.size, product, dtype=np.int32))
+        targets.append(co_counts.indices[start:end][top])
+        values.append(row_scores[top])
+
+    if not sources:
+        empty = np.empty(0, dtype=np.int32)
+        return empty, empty, np.empty(0, dtype=np.float32)
+    return np.concatenate(sources), np.concatenate(targets), np.concatenate(values)
+
+
+class RecommendationService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def rebuild(self, k: int, min_co_count: int) -> int:
+        """
+        Recompute every product's top-K co-purchases from order history and
+        replace the stored lists in one transaction. Returns rows written.
+        """
+        result = await self.db.stream(
+            select(OrderItem.order_id, OrderItem.product_id)
+            .execution_options(yield_per=50_000, include_deleted=True)
+        )
+        order_ids: dict[uuid.UUID, int] = {}
+        product_ids: dict[uuid.UUID, int] = {}
+        # Typed buffers: ~8 bytes per pair instead of a Python int object each
+        order_index = array("q")
+        product_index = array("q")
+        async for order_id, product_id in result:
+            order_index.append(order_ids.setdefault(order_id, len(order_ids)))
+            product_index.append(product_ids.setdefault(product_id, len(product_ids)))
+
+        # The matrix work releases the GIL; keep it off the event loop
+        sources, targets, scores = await asyncio.to_thread(
+            compute_top_k,
+            np.frombuffer(order_index, dtype=np.int64),
+            np.frombuffer(product_index, dtype=np.int64),
+            len(product_ids),
+            k,
+            min_co_count,
+        )
+
+        ids = list(product_ids)
+        ranks = np.zeros(sources.size, dtype=np.int32)
+        if sources.size:
+            # Position of each entry within its product's run
+            starts = np.flatnonzero(np.r_[True, sources[1:] != sources[:-1]])
+            run_lengths = np.diff(np.r_[starts, sources.size])
+            ranks = np.arange(sources.size) - np.repeat(starts, run_lengths)
+
+        rows = [
+            {
+                "product_id": ids[source],
+                "rank": int(rank),
+                "recommended_product_id": ids[target],
+                "score": float(score),
+            }
+            for source, target, score, rank in zip(sources, targets, scores, ranks)
+        ]
+
+        await self.db.execute(delete(ProductRecommendation))
+        for i in range(0, len(rows), 10_000):
+            await self.db.execute(insert(ProductRecommendation), rows[i:i + 10_000])
+        await invalidation.publish(self.db, "recommendation")
+        await self.db.commit()
+        return len(rows)
+
+    async def _recommended_ids(self, product_id: uuid.UUID) -> list[uuid.UUID]:
+        key = str(product_id)
+        ids = _recommendation_cache.get(key)
+        if ids is None:
+            result = await self.db.execute(
+                select(ProductRecommendation.recommended_product_id)
+                .where(ProductRecommendation.product_id == product_id)
+                .order_by(ProductRecommendation.rank)
+            )
+            ids = list(result.scalars().all())
+            _recommendation_cache.set(key, ids)
+        return ids
+
+    async def recommend(self, product_id: uuid.UUID, limit: int) -> list[Product]:
+        """Top co-purchased products for `product_id` that are still for sale."""
+        ids = await self._recommended_ids(product_id)
+        if not ids:
+            return []
+        # Over-fetch a little: some recommendations may be inactive by now
+        candidates = ids[: limit * 2]
+        result = await self.db.execute(
+            select(Product).where(Product.id.in_(candidates), Product.is_active == True)
+        )
+        by_id = {product.id: product for product in result.scalars().all()}
+        return [by_id[i] for i in candidates if i in by_id][:limit]
@@ -0,0 +1,272 @@
+"""
+Daily sales rollups (see db.models.sales_rollup) and the reports read from them.
+
+Rollups are maintained by day rather than by adding deltas: an order change
+(checkout, status change, soft delete) marks its day dirty, and dirty days are
+recomputed from order_item in full. Recomputing is idempotent, handles
+cancellations without tracking what an order contributed before, and costs one
+day's orders. Dirty days are found through order.updated_at, up to a
+watermark that trails now() by SALES_ROLLUP_LAG_SECONDS: updated_at is the
+writing transaction's start time, so a change becomes visible some time after
+its timestamp and the lag leaves room for it to commit.
+"""
+import logging
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, cast, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.models.category import Category
+from db.models.order import Order, OrderStatus
+from db.models.order_item import OrderItem
+from db.models.product import Product
+from db.models.sales_rollup import (
+    RollupWatermark,
+    SalesDaily,
+    SalesDailyCategory,
+    SalesDailyProduct,
+)
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "sales"
+
+
+@dataclass
+class SalesTotals:
+    key: date | uuid.UUID
+    name: str | None
+    order_count: int | None
+    units: int
+    revenue: Decimal
+
+
+def order_day():
+    """Order.created_at as a calendar day in SALES_ROLLUP_TIMEZONE."""
+    return cast(func.timezone(settings.SALES_ROLLUP_TIMEZONE, Order.created_at), Date)
+
+
+def today() -> date:
+    """The current calendar day in SALES_ROLLUP_TIMEZONE, which the rollups are keyed by."""
+    return datetime.now(ZoneInfo(settings.SALES_ROLLUP_TIMEZONE)).date()
+
+
+def created_at_bounds(start: date, end: date) -> tuple[datetime, datetime]:
+    """created_at range covering days start..end inclusive, for partition pruning."""
+    zone = ZoneInfo(settings.SALES_ROLLUP_TIMEZONE)
+    return (
+        datetime.combine(start, time(), zone),
+        datetime.combine(end + timedelta(days=1), time(), zone),
+    )
+
+
+def counted_orders(start: date, end: date):
+    """Join of the order lines that count as sales on days start..end."""
+    lower, upper = created_at_bounds(start, end)
+    return (
+        select()
+        .select_from(Order)
+        .join(
+            OrderItem,
+            (OrderItem.order_id == Order.id) & (OrderItem.order_created_at == Order.created_at),
+        )
+        .where(
+            Order.created_at >= lower,
+            Order.created_at < upper,
+            Order.status != OrderStatus.CANCELLED,
+            Order.is_deleted == False,
+            OrderItem.is_deleted == False,
+        )
+        # Deleted orders and lines are excluded above; sales of since-deleted
+        # products or categories joined onto this still count
+        .execution_options(include_deleted=True)
+    )
+
+
+class SalesRollupService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _lock_watermark(self) -> datetime:
+        """
+        Lock the watermark row for the rest of the transaction. Every rollup
+        writer takes it first, so recomputations of a day never interleave.
+        """
+        result = await self.db.execute(
+            select(RollupWatermark.value)
+            .where(RollupWatermark.name == WATERMARK)
+            .with_for_update()
+        )
+        return result.scalar_one()
+
+    async def _rebuild_days(self, days: Sequence[date]) -> None:
+        """Replace the rollup rows of `days` with fresh aggregates. Caller commits."""
+        day = order_day()
+        for model in (SalesDaily, SalesDailyCategory, SalesDailyProduct):
+            await self.db.execute(delete(model).where(model.day.in_(days)))
+
+        lines = counted_orders(min(days), max(days)).where(day.in_(days))
+        await self.db.execute(
+            insert(SalesDailyProduct).from_select(
+                ["day", "product_id", "order_count", "units", "revenue"],
+                lines.add_columns(
+                    day,
+                    OrderItem.product_id,
+                    func.count(func.distinct(Order.id)),
+                    func.sum(OrderItem.quantity),
+                    func.sum(OrderItem.total_price),
+                ).group_by(day, OrderItem.product_id),
+            )
+        )
+        # Category and day totals aggregate the product rows just written,
+        # except distinct order counts, which only the order lines can give
+        await self.db.execute(
+            insert(SalesDailyCategory).from_select(
+                ["day", "category_id", "units", "revenue"],
+                select(
+                    SalesDailyProduct.day,
+                    Product.category_id,
+                    func.sum(SalesDailyProduct.units),
+                    func.sum(SalesDailyProduct.revenue),
+                )
+                .join(Product, Product.id == SalesDailyProduct.product_id)
+                .where(SalesDailyProduct.day.in_(days))
+                .group_by(SalesDailyProduct.day, Product.category_id),
+            )
+        )
+        await self.db.execute(
+            insert(SalesDaily).from_select(
+                ["day", "order_count", "units", "revenue"],
+                lines.add_columns(
+                    day,
+                    func.count(func.distinct(Order.id)),
+                    func.sum(OrderItem.quantity),
+                    func.sum(OrderItem.total_price),
+                ).group_by(day),
+            )
+        )
+
+    async def refresh(self, lag_seconds: float) -> int:
+        """Recompute the days of orders changed since the watermark. Returns days rebuilt."""
+        watermark = await self._lock_watermark()
+        result = await self.db.execute(
+            select(func.now() - func.make_interval(0, 0, 0, 0, 0, 0, lag_seconds))
+        )
+        cutoff = result.scalar_one()
+        if cutoff <= watermark:
+            await self.db.rollback()
+            return 0
+
+        result = await self.db.execute(
+            select(order_day())
+            .where(Order.updated_at > watermark, Order.updated_at <= cutoff)
+            .distinct()
+            # A soft-deleted order still dirties the day it is removed from
+            .execution_options(include_deleted=True)
+        )
+        days = sorted(result.scalars().all())
+        if days:
+            await self._rebuild_days(days)
+        await self.db.execute(
+            update(RollupWatermark).where(RollupWatermark.name == WATERMARK).values(value=cutoff)
+        )
+        await self.db.commit()
+        return len(days)
+
+    async def backfill(self, start: date, end: date, days_per_batch: int) -> int:
+        """Recompute days start..end inclusive, a batch per transaction. Returns days rebuilt."""
+        rebuilt = 0
+        batch_start = start
+        while batch_start <= end:
+            batch_end = min(end, batch_start + timedelta(days=days_per_batch - 1))
+            days = [batch_start + timedelta(days=i) for i in range((batch_end - batch_start).days + 1)]
+            await self._lock_watermark()
+            await self._rebuild_days(days)
+            await self.db.commit()
+            logger.info("Backfilled sales rollups for %s..%s", batch_start, batch_end)
+            rebuilt += len(days)
+            batch_start = batch_end + timedelta(days=1)
+        return rebuilt
+
+    async def watermark(self) -> datetime:
+        result = await self.db.execute(
+            select(RollupWatermark.value).where(RollupWatermark.name == WATERMARK)
+        )
+        return result.scalar_one()
+
+    async def daily(self, start: date, end: date) -> list[SalesTotals]:
+        result = await self.db.execute(
+            select(SalesDaily)
+            .where(SalesDaily.day >= start, SalesDaily.day <= end)
+            .order_by(SalesDaily.day)
+        )
+        return [
+            SalesTotals(
+                key=row.day,
+                name=None,
+                order_count=row.order_count,
+                units=row.units,
+                revenue=row.revenue,
+            )
+            for row in result.scalars()
+        ]
+
+    async def top_categories(self, start: date, end: date, limit: int) -> list[SalesTotals]:
+        revenue = func.sum(SalesDailyCategory.revenue)
+        result = await self.db.execute(
+            select(
+                SalesDailyCategory.category_id,
+                Category.name,
+                func.sum(SalesDailyCategory.units),
+                revenue,
+            )
+            .join(Category, Category.id == SalesDailyCategory.category_id)
+            .where(SalesDailyCategory.day >= start, SalesDailyCategory.day <= end)
+            .group_by(SalesDailyCategory.category_id, Category.name)
+            .order_by(revenue.desc())
+            .limit(limit)
+            .execution_options(include_deleted=True)
+        )
+        return [
+            SalesTotals(key=category_id, name=name, order_count=None, units=units, revenue=total)
+            for category_id, name, units, total in result.all()
+        ]
+
+    async def top_products(self, start: date, end: date, limit: int) -> list[SalesTotals]:
+        revenue = func.sum(SalesDailyProduct.revenue)
+        # Aggregate first, then join the names of the winners only
+        ranked = (
+            select(
+                SalesDailyProduct.product_id,
+                func.sum(SalesDailyProduct.order_count).label("order_count"),
+                func.sum(SalesDailyProduct.units).label("units"),
+                revenue.label("revenue"),
+            )
+            .where(SalesDailyProduct.day >= start, SalesDailyProduct.day <= end)
+            .group_by(SalesDailyProduct.product_id)
+            .order_by(revenue.desc())
+            .limit(limit)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(ranked, Product.name)
+            .join(Product, Product.id == ranked.c.product_id)
+            .order_by(ranked.c.revenue.desc())
+            .execution_options(include_deleted=True)
+        )
+        return [
+            SalesTotals(
+                key=row.product_id,
+                name=row.name,
+                order_count=row.order_count,
+                units=row.units,
+                revenue=row.revenue,
+            )
+            for row in result.all()
+        ]
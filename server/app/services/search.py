@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.models.category import Category
+from db.models.product import Product
+from services.semantic_index import SemanticIndex, product_text
+from utils.phonetics import search_keys
+
+logger = logging.getLogger(__name__)
+
+# One per worker process; the matrix itself is a shared memory map
+semantic_index = SemanticIndex(settings.SEMANTIC_SEARCH_INDEX_DIR)
+
+
+class SemanticIndexUnavailableError(RuntimeError):
+    pass
+
+
+def _searchable_text_query():
+    return select(
+        Product.id,
+        Product.name,
+        Product.description,
+        Category.name.label("category_name"),
+        Product.updated_at,
+    ).join(Category, Product.category_id == Category.id)
+
+
+class ProductSearchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _fetch_ordered(self, ids: list[uuid.UUID]) -> list[Product]:
+        if not ids:
+            return []
+        result = await self.db.execute(
+            select(Product).where(Product.id.in_(ids), Product.is_active == True)
+        )
+        by_id = {product.id: product for product in result.scalars().all()}
+        return [by_id[i] for i in ids if i in by_id]
+
+    async def keyword(self, query: str, limit: int) -> list[Product]:
+        pattern = f"%{query}%"
+        result = await self.db.execute(
+            select(Product)
+            .where(
+                Product.is_active == True,
+                or_(Product.name.ilike(pattern), Product.description.ilike(pattern)),
+            )
+            .order_by(Product.created_at.desc(), Product.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def phonetic(self, query: str, limit: int) -> list[Product]:
+        """
+        Products whose names sound like the query, for when speech-to-text
+        misheard a brand. Ranked by how many sound keys they share, then
+        by fewest keys overall, so the bare brand beats long names that
+        merely mention it.
+        """
+        keys = search_keys(query)
+        if not keys:
+            return []
+        shared = sum(
+            case((Product.name_phonetic_keys.contains([key]), 1), else_=0) for key in keys
+        )
+        result = await self.db.execute(
+            select(Product)
+            .where(Product.is_active == True, Product.name_phonetic_keys.overlap(keys))
+            .order_by(
+                shared.desc(),
+                func.cardinality(Product.name_phonetic_keys),
+                Product.id,
+            )
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def semantic(self, query: str, limit: int) -> list[Product]:
+        """Rank products by meaning rather than substring, best match first."""
+        if not semantic_index.ready:
+            raise SemanticIndexUnavailableError("Semantic search index is not built yet")
+        # A full-catalog matrix-vector product; numpy releases the GIL
+        matches = await asyncio.to_thread(semantic_index.search, query, limit)
+        return await self._fetch_ordered([product_id for product_id, _ in matches])
+
+    async def load_documents(self) -> tuple[list[uuid.UUID], list[str], datetime | None]:
+        """All active products' searchable text, plus the newest updated_at seen."""
+        result = await self.db.stream(
+            _searchable_text_query()
+            .where(Product.is_active == True)
+            .execution_options(yield_per=10_000)
+        )
+        product_ids: list[uuid.UUID] = []
+        documents: list[str] = []
+        watermark = None
+        async for product_id, name, description, category, updated_at in result:
+            product_ids.append(product_id)
+            documents.append(product_text(name, description, category))
+            watermark = updated_at if watermark is None else max(watermark, updated_at)
+        return product_ids, documents, watermark
+
+    async def refresh_semantic_index(self) -> None:
+        """Pick up a newer build, then fold in products changed since it."""
+        semantic_index.load()
+        since = semantic_index.watermark
+        if since is None:
+            return
+        result = await self.db.execute(
+            _searchable_text_query()
+            .add_columns(Product.is_active, Product.is_deleted)
+            .where(Product.updated_at > since)
+            .execution_options(include_deleted=True)
+        )
+        rows = result.all()
+        if not rows:
+            return
+        semantic_index.apply_updates(
+            [
+                (
+                    row.id,
+                    product_text(row.name, row.description, row.category_name)
+                    if row.is_active and not row.is_deleted
+                    else None,
+                )
+                for row in rows
+            ],
+            max(row.updated_at for row in rows),
+        )
+        logger.info("Folded %d changed product(s) into the semantic index", len(rows))
@@ -0,0 +1,273 @@
+"""
+Offline semantic product index.
+
+Products are embedded with TF-IDF followed by a truncated SVD (latent
+semantic analysis), so related wording ("keeps coffee hot" / "insulated
+flask") lands close together without any external model service. A rebuild
+writes the embedding matrix as a .npy file; every API worker memory-maps the
+same file, so the page cache holds one copy however many workers run.
+
+Products edited after a build are folded into a small per-worker overlay
+using the build's vocabulary and projection until the next full rebuild.
+"""
+import logging
+import math
+import os
+import re
+import uuid
+from array import array
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import svds
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have i in is it its my of on or "
+    "something that the this to want was with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) < 2 or token in _STOPWORDS:
+            continue
+        # Cheap plural folding: "mugs" -> "mug", but leave "glass" alone
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def product_text(name: str, description: str | None, category: str | None) -> str:
+    # Name twice: it is the strongest signal and descriptions can be long
+    return " ".join(filter(None, (name, name, category, description)))
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+@dataclass(frozen=True)
+class _Build:
+    version: str
+    product_ids: list[uuid.UUID]
+    positions: dict[uuid.UUID, int]
+    vocabulary: dict[str, int]
+    idf: np.ndarray
+    components: np.ndarray  # (terms, dims) projection from TF-IDF to embedding space
+    embeddings: np.ndarray  # (products, dims), memory-mapped, rows L2-normalised
+    watermark: datetime
+
+
+@dataclass(frozen=True)
+class _Overlay:
+    product_ids: list[uuid.UUID]
+    vectors: np.ndarray
+    masked_rows: np.ndarray  # build rows superseded by the overlay or removed
+
+
+def build_index(
+    directory: str,
+    product_ids: list[uuid.UUID],
+    documents: list[str],
+    dims: int,
+    watermark: datetime,
+) -> str:
+    """Embed `documents` and write a new index version. Returns the version."""
+    vocabulary: dict[str, int] = {}
+    indptr = array("q", [0])
+    indices = array("i")
+    counts = array("f")
+    for document in documents:
+        for term, count in Counter(tokenize(document)).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+
+    n_docs, n_terms = len(documents), len(vocabulary)
+    tf = sparse.csr_matrix(
+        (np.frombuffer(counts, dtype=np.float32), np.frombuffer(indices, dtype=np.int32),
+         np.frombuffer(indptr, dtype=np.int64)),
+        shape=(n_docs, n_terms),
+    )
+    tf.data = 1.0 + np.log(tf.data)
+    df = np.bincount(tf.indices, minlength=n_terms)
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1.0).astype(np.float32)
+    tfidf = tf.multiply(idf).tocsr()
+    row_norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    row_norms[row_norms == 0] = 1.0
+    tfidf = sparse.diags(1.0 / row_norms) @ tfidf
+
+    k = min(dims, min(tfidf.shape) - 1)
+    if k < 1:
+        raise ValueError("Not enough products to build a semantic index")
+    # ARPACK starts from a random vector; seeded so a catalog always builds the same index
+    _, _, vt = svds(tfidf, k=k, random_state=0)
+    components = np.ascontiguousarray(vt.T, dtype=np.float32)
+    embeddings = _normalize_rows(np.asarray(tfidf @ components, dtype=np.float32))
+
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    np.save(path / f"embeddings-{version}.npy", embeddings)
+    np.savez(
+        path / f"meta-{version}.npz",
+        product_ids=np.array([p.bytes for p in product_ids], dtype="S16"),
+        vocabulary=np.array(list(vocabulary), dtype=str),
+        idf=idf,
+        components=components,
+        watermark=np.array(watermark.timestamp()),
+    )
+    # Publish atomically; readers switch on their next refresh
+    tmp = path / "CURRENT.tmp"
+    tmp.write_text(version)
+    os.replace(tmp, path / "CURRENT")
+
+    # Older versions may still be mapped by workers; unlinking keeps their pages valid
+    for stale in path.glob("*-*.np[yz]"):
+        if version not in stale.name:
+            stale.unlink(missing_ok=True)
+    logger.info(
+        "Wrote semantic index %s (%d products, %d terms, %d dims)",
+        version, n_docs, n_terms, k,
+    )
+    return version
+
+
+class SemanticIndex:
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._build: _Build | None = None
+        self._overlay: _Overlay | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._build is not None
+
+    @property
+    def published(self) -> bool:
+        """Whether any version has been built into the directory yet."""
+        return (self.directory / "CURRENT").exists()
+
+    @property
+    def watermark(self) -> datetime | None:
+        return self._build.watermark if self._build else None
+
+    def load(self) -> bool:
+        """Map the current index version if it changed. Returns True on a switch."""
+        try:
+            version = (self.directory / "CURRENT").read_text().strip()
+        except FileNotFoundError:
+            return False
+        if self._build is not None and self._build.version == version:
+            return False
+
+        with np.load(self.directory / f"meta-{version}.npz") as meta:
+            # Fixed-width bytes come back without trailing NULs; pad them again
+            product_ids = [
+                uuid.UUID(bytes=bytes(b).ljust(16, b"\0")) for b in meta["product_ids"]
+            ]
+            vocabulary = {term: i for i, term in enumerate(meta["vocabulary"].tolist())}
+            idf = meta["idf"]
+            components = meta["components"]
+            watermark = datetime.fromtimestamp(float(meta["watermark"]), timezone.utc)
+        embeddings = np.load(self.directory / f"embeddings-{version}.npy", mmap_mode="r")
+
+        # Swap whole snapshots so a concurrent search never sees a mix
+        self._overlay = None
+        self._build = _Build(
+            version=version,
+            product_ids=product_ids,
+            positions={p: i for i, p in enumerate(product_ids)},
+            vocabulary=vocabulary,
+            idf=idf,
+            components=components,
+            embeddings=embeddings,
+            watermark=watermark,
+        )
+        logger.info("Loaded semantic index %s (%d products)", version, len(product_ids))
+        return True
+
+    def _embed(self, build: _Build, text: str) -> np.ndarray | None:
+        counts = Counter(
+            build.vocabulary[t] for t in tokenize(text) if t in build.vocabulary
+        )
+        if not counts:
+            return None
+        terms = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = np.array(
+            [1.0 + math.log(c) for c in counts.values()], dtype=np.float32
+        ) * build.idf[terms]
+        vector = weights @ build.components[terms]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def apply_updates(
+        self, rows: list[tuple[uuid.UUID, str | None]], watermark: datetime
+    ) -> None:
+        """
+        Fold changed products in. `rows` pairs a product ID with its new text,
+        or None when the product is no longer searchable.
+        """
+        build = self._build
+        if build is None or not rows:
+            return
+        overlay = self._overlay
+        vectors = dict(zip(overlay.product_ids, overlay.vectors)) if overlay else {}
+        masked = set(overlay.masked_rows.tolist()) if overlay else set()
+        for product_id, text in rows:
+            position = build.positions.get(product_id)
+            if position is not None:
+                masked.add(position)
+            vector = self._embed(build, text) if text is not None else None
+            if vector is None:
+                vectors.pop(product_id, None)
+            else:
+                vectors[product_id] = vector
+        dims = build.components.shape[1]
+        self._overlay = _Overlay(
+            product_ids=list(vectors),
+            vectors=np.array(list(vectors.values()), dtype=np.float32).reshape(-1, dims),
+            masked_rows=np.fromiter(masked, dtype=np.int64, count=len(masked)),
+        )
+        self._build = replace(build, watermark=max(build.watermark, watermark))
+
+    def search(self, query: str, limit: int) -> list[tuple[uuid.UUID, float]]:
+        """Cosine top-`limit` products for a free-text query, best first."""
+        build, overlay = self._build, self._overlay
+        if build is None:
+            return []
+        vector = self._embed(build, query)
+        if vector is None:
+            return []
+
+        scores = np.asarray(build.embeddings @ vector)
+        n_built = len(build.product_ids)
+        if overlay is not None:
+            scores[overlay.masked_rows] = -np.inf
+            if overlay.product_ids:
+                scores = np.concatenate([scores, overlay.vectors @ vector])
+
+        if scores.size > limit:
+            top = np.argpartition(scores, -limit)[-limit:]
+        else:
+            top = np.arange(scores.size)
+        top = top[np.argsort(-scores[top])]
+        return [
+            (
+                build.product_ids[i] if i < n_built else overlay.product_ids[i - n_built],
+                float(scores[i]),
+            )
+            for i in top
+            if scores[i] > 0
+        ]
@@ -0,0 +1,62 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional: pip install "server[compression]"
+    brotli = None
+
+from core.config import settings
+
+# Preference order when the client accepts several
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the preferred supported encoding the client accepts, if any."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in SUPPORTED_ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressedPayload:
+    """
+    An encoded response body plus its compressed variants, each produced the
+    first time a client asks for it. Cache these instead of raw objects so hot
+    responses are serialized and compressed once, not on every request.
+    """
+
+    __slots__ = ("body", "media_type", "_variants")
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.body = body
+        self.media_type = media_type
+        self._variants: dict[str, bytes] = {}
+
+    def variant(self, encoding: str | None) -> tuple[bytes, str | None]:
+        """Body to send for `encoding` and the Content-Encoding to declare."""
+        if encoding is None or len(self.body) < settings.COMPRESSION_MINIMUM_SIZE:
+            return self.body, None
+        compressed = self._variants.get(encoding)
+        if compressed is None:
+            compressed = compress(self.body, encoding)
+            self._variants[encoding] = compressed
+        if len(compressed) >= len(self.body):
+            return self.body, None
+        return compressed, encoding
@@ -0,0 +1,19 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, item_id: uuid.UUID) -> str:
+    """Encode created_at and item_id into a cursor string."""
+    data = {"created_at": created_at.isoformat(), "id": str(item_id)}
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID] | None:
+    """Decode cursor string into created_at and item_id."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return datetime.fromisoformat(data["created_at"]), uuid.UUID(data["id"])
+    except (ValueError, KeyError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,131 @@
+import re
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_VOWELS = frozenset("aeiou")
+_SILENT_STARTS = ("kn", "gn", "pn", "wr", "ps")
+MAX_KEY_LENGTH = 6
+# Shorter keys ("nk", "ar") are shared by a large slice of any catalog
+MIN_SEARCH_KEY_LENGTH = 3
+
+
+def phonetic_key(word: str) -> str:
+    """
+    Metaphone-style sound key for one word: "Fillips" and "Philips" both give
+    "flps", "Nykaa" and "Nikka" both give "nk". Digits pass through unchanged
+    so model numbers still have to match exactly.
+    """
+    w = word.lower()
+    if not w:
+        return ""
+    if w.isdigit():
+        return w
+    if w.startswith(_SILENT_STARTS):
+        w = w[1:]
+    elif w.startswith("x"):
+        w = "s" + w[1:]
+    elif w.startswith("wh"):
+        w = "w" + w[2:]
+
+    out: list[str] = []
+    i, n = 0, len(w)
+    while i < n:
+        c = w[i]
+        nxt = w[i + 1] if i + 1 < n else ""
+        after = w[i + 2] if i + 2 < n else ""
+        code = ""
+        step = 1
+
+        if c in _VOWELS:
+            # Vowels only matter as a leading sound
+            code = "a" if i == 0 else ""
+        elif c.isdigit():
+            code = c
+        elif c == "b":
+            # Silent in a trailing "mb" ("thumb")
+            code = "" if i == n - 1 and i > 0 and w[i - 1] == "m" else "p"
+        elif c == "c":
+            if nxt == "h":
+                code, step = "x", 2
+            elif nxt in ("i", "e", "y"):
+                code = "s"
+            elif nxt == "k":
+                code, step = "k", 2
+            else:
+                code = "k"
+        elif c == "d":
+            if nxt == "g" and after in ("e", "i", "y"):
+                code, step = "j", 2
+            else:
+                code = "t"
+        elif c == "g":
+            if nxt == "h":
+                # "gh" is silent mid-word ("light") and hard at the start ("ghost")
+                code, step = ("k" if i == 0 else ""), 2
+            elif nxt in ("e", "i", "y"):
+                code = "j"
+            elif nxt == "n" and i + 2 >= n:
+                code = ""
+            else:
+                code = "k"
+        elif c == "h":
+            prev = w[i - 1] if i > 0 else ""
+            code = "h" if nxt in _VOWELS and prev not in _VOWELS else ""
+        elif c == "p":
+            code, step = ("f", 2) if nxt == "h" else ("p", 1)
+        elif c == "q":
+            code = "k"
+        elif c == "s":
+            if nxt == "h" or (nxt == "i" and after in ("o", "a")):
+                code, step = "x", 2
+            elif nxt == "c" and after == "h":
+                code, step = "sk", 3
+            else:
+                code = "s"
+        elif c == "t":
+            if nxt == "h":
+                code, step = "0", 2
+            elif nxt == "i" and after in ("o", "a"):
+                code = "x"
+            else:
+                code = "t"
+        elif c == "v":
+            code = "f"
+        elif c in ("w", "y"):
+            code = c if nxt in _VOWELS else ""
+        elif c == "x":
+            code = "ks"
+        elif c == "z":
+            code = "s"
+        else:
+            code = c
+
+        for ch in code:
+            # Doubled letters sound once ("Nikka" / "Nika")
+            if not out or out[-1] != ch:
+                out.append(ch)
+        i += step
+
+    return "".join(out)[:MAX_KEY_LENGTH]
+
+
+def phonetic_keys(text: str) -> list[str]:
+    """
+    Keys for every word and every adjacent word pair joined, so a brand that
+    speech-to-text splits ("air pods") still meets the one-word form
+    ("airpods") and vice versa.
+    """
+    words = _WORD_RE.findall(text.lower())
+    keys = {phonetic_key(w) for w in words}
+    keys.update(phonetic_key(a + b) for a, b in zip(words, words[1:]))
+    # Single consonants match far too much to be useful
+    return sorted(key for key in keys if len(key) > 1)
+
+
+def search_keys(text: str) -> list[str]:
+    """
+    The query keys worth matching on: those of MIN_SEARCH_KEY_LENGTH or more,
+    or all of them when the query has nothing longer, as with a short
+    one-word brand ("Nikka").
+    """
+    keys = phonetic_keys(text)
+    return [key for key in keys if len(key) >= MIN_SEARCH_KEY_LENGTH] or keys
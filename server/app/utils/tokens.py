@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from jose import jwt
+from jose import JWTError, jwt
 
 from core.config import settings
 
@@ -24,3 +24,20 @@ def create_refresh_token(user_id: UUID) -> str:
     )
     to_encode = {"sub": str(user_id), "exp": expire, "type": "refresh"}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
+def decode_token_subject(token: str, token_type: str = "access") -> UUID | None:
+    """Return the user ID of a valid token of the given type, else None."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type") != token_type:
+        return None
+    user_id = payload.get("sub")
+    if user_id is None:
+        return None
+    try:
+        return UUID(user_id)
+    except ValueError:
+        return None
@@ -0,0 +1,77 @@
+"""
+Job worker entry point.
+
+    python -m workers --concurrency 8 --batch-size 200
+    python -m workers --priorities 0      # dedicated high-priority lane
+
+Each process also runs the periodic job scheduler (workers.scheduler) unless
+started with --no-scheduler.
+"""
+import argparse
+import asyncio
+import contextlib
+import signal
+
+from core.config import settings
+from core.logging import setup_logging
+from db.session import engine
+from workers import tasks  # noqa: F401 - registers job handlers
+from workers.queue import Worker
+from workers.scheduler import run_scheduler
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run background job workers.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.JOB_WORKER_CONCURRENCY,
+        help="Claim loops to run in this process",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.JOB_BATCH_SIZE,
+        help="Jobs claimed per round trip",
+    )
+    parser.add_argument(
+        "--priorities",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Only claim jobs with these priorities (default: all)",
+    )
+    parser.add_argument(
+        "--no-scheduler",
+        action="store_true",
+        help="Do not enqueue the periodic maintenance jobs from this process",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    worker = Worker(
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        priorities=args.priorities,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    scheduler = None
+    if not args.no_scheduler:
+        scheduler = asyncio.create_task(run_scheduler(settings.JOB_SCHEDULER_INTERVAL_SECONDS))
+    try:
+        await worker.run()
+    finally:
+        if scheduler is not None:
+            scheduler.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await scheduler
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
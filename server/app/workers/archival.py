@@ -0,0 +1,96 @@
+"""
+Moves long soft-deleted rows out of the live tables into `<table>_archive`.
+
+Each batch is one statement: a DELETE ... RETURNING of rows claimed with
+FOR UPDATE SKIP LOCKED, feeding an INSERT into the archive table. Rows that
+are still referenced by live foreign keys (e.g. a product on an old order)
+stay where they are.
+"""
+import logging
+
+from sqlalchemy import ColumnElement, Table, delete, exists, func, insert, literal_column, select
+
+from core.config import settings
+from db.models.address import Address
+from db.models.archive import address_archive, cart_item_archive, product_archive
+from db.models.cart_item import CartItem
+from db.models.order import Order
+from db.models.order_item import OrderItem
+from db.models.product import Product
+from db.models.stock_reservation import StockReservation
+from db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _archivable() -> list[tuple[Table, Table, list[ColumnElement[bool]]]]:
+    """(live table, archive table, conditions that must hold for a row to be moved)."""
+    product = Product.__table__
+    address = Address.__table__
+    return [
+        (CartItem.__table__, cart_item_archive, []),
+        (
+            product,
+            product_archive,
+            [
+                ~exists().where(OrderItem.__table__.c.product_id == product.c.id),
+                ~exists().where(CartItem.__table__.c.product_id == product.c.id),
+                ~exists().where(StockReservation.__table__.c.product_id == product.c.id),
+            ],
+        ),
+        (
+            address,
+            address_archive,
+            [~exists().where(Order.__table__.c.shipping_address_id == address.c.id)],
+        ),
+    ]
+
+
+def _archive_statement(
+    table: Table,
+    archive: Table,
+    conditions: list[ColumnElement[bool]],
+    batch_size: int,
+):
+    claimed = (
+        select(table.c.id)
+        .where(
+            table.c.is_deleted == True,
+            table.c.updated_at
+            < func.now() - func.make_interval(0, 0, 0, settings.SOFT_DELETE_ARCHIVE_AFTER_DAYS),
+            *conditions,
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        # Keep FROM <table>; it would otherwise correlate to the DELETE target
+        .correlate(None)
+    )
+    moved = (
+        delete(table)
+        .where(table.c.id.in_(claimed.scalar_subquery()))
+        .returning(*table.c)
+        .cte("moved")
+    )
+    names = [column.name for column in table.c]
+    return insert(archive).from_select(
+        names, select(*(moved.c[name] for name in names))
+    ).returning(literal_column("1"))
+
+
+async def archive_soft_deleted(batch_size: int = settings.ARCHIVE_BATCH_SIZE) -> dict[str, int]:
+    """Archive eligible rows of every table, batch by batch. Returns rows moved per table."""
+    moved: dict[str, int] = {}
+    for table, archive, conditions in _archivable():
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(_archive_statement(table, archive, conditions, batch_size))
+                count = len(result.all())
+                await session.commit()
+            total += count
+            if count < batch_size:
+                break
+        if total:
+            logger.info("Archived %d soft-deleted rows from %s", total, table.name)
+        moved[table.name] = total
+    return moved
@@ -0,0 +1,68 @@
+"""
+Purges expired idempotency keys (see middleware.idempotency) in batches.
+
+Run standalone with `python -m workers.idempotency`, or let the job worker
+schedule it (IDEMPOTENCY_ENABLED, see workers.scheduler). Each batch is claimed
+with FOR UPDATE SKIP LOCKED, so concurrent purgers never block on each other.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import delete, func, select, tuple_
+
+from core.config import settings
+from db.models.idempotency_key import IdempotencyKey
+from db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_expired_idempotency_keys(batch_size: int) -> int:
+    """Delete expired keys batch by batch. Returns the number of keys deleted."""
+    purged = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at < func.now())
+            .order_by(IdempotencyKey.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            # Keep FROM idempotency_key; it would otherwise correlate to the DELETE target
+            .correlate(None)
+        )
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(IdempotencyKey).where(
+                    tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            return purged
+
+
+async def run_idempotency_purger(interval: float, batch_size: int) -> None:
+    """Purge expired keys forever, sleeping `interval` seconds between runs."""
+    logger.info("Idempotency key purger started (interval=%ss)", interval)
+    while True:
+        try:
+            purged = await purge_expired_idempotency_keys(batch_size)
+            if purged:
+                logger.info("Purged %d expired idempotency keys", purged)
+        except Exception:
+            logger.exception("Idempotency key purge failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(
+        run_idempotency_purger(
+            settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+            settings.IDEMPOTENCY_PURGE_BATCH_SIZE,
+        )
+    )
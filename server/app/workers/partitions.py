@@ -0,0 +1,124 @@
+"""
+Keeps monthly partitions of the order tables ahead of time and, optionally,
+detaches old ones.
+
+Run standalone with `python -m workers.partitions`, or let the job worker
+schedule it (PARTITION_MAINTENANCE_ENABLED, see workers.scheduler). Creating a
+partition is idempotent, so several workers may run this at once.
+"""
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+
+from core.config import settings
+from db.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition_sql,
+    detach_partition_sql,
+    month_start,
+)
+from db.session import engine
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+_ATTACHED_PARTITIONS = text(
+    """
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table
+    """
+)
+
+# Foreign keys a detached partition still has to the partitioned tables
+_PARTITIONED_FOREIGN_KEYS = text(
+    """
+    SELECT conname
+    FROM pg_constraint
+    WHERE conrelid = CAST(:partition AS regclass)
+      AND contype = 'f'
+      AND confrelid = ANY(CAST(:tables AS regclass[]))
+    """
+)
+
+
+async def ensure_partitions(months_ahead: int) -> None:
+    """Create partitions from the current month through `months_ahead` months on."""
+    current = month_start(datetime.now(timezone.utc))
+    for table in PARTITIONED_TABLES:
+        for offset in range(months_ahead + 1):
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(text(create_partition_sql(table, add_months(current, offset))))
+            except Exception:
+                # Another worker may have created it between IF NOT EXISTS and CREATE
+                logger.warning("Could not create partition of %s", table, exc_info=True)
+
+
+async def detach_old_partitions(retention_months: int, tablespace: str | None = None) -> list[str]:
+    """
+    Detach partitions entirely older than `retention_months` without blocking
+    traffic, optionally moving them to `tablespace`. order_item partitions go
+    first because they reference the order partitions of the same month, and
+    lose that foreign key once detached: it still points at the partitioned
+    "order", which would refuse to let go of the rows it references.
+    """
+    partitioned = [f'"{table}"' for table in PARTITIONED_TABLES]
+    cutoff = add_months(month_start(datetime.now(timezone.utc)), -retention_months)
+    detached = []
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in reversed(list(PARTITIONED_TABLES)):
+            result = await conn.execute(_ATTACHED_PARTITIONS, {"table": table})
+            for name in sorted(result.scalars().all()):
+                match = _PARTITION_SUFFIX.search(name)
+                if match is None:
+                    continue
+                month = date(int(match[1]), int(match[2]), 1)
+                if month >= cutoff:
+                    continue
+                await conn.execute(text(detach_partition_sql(table, month)))
+                result = await conn.execute(
+                    _PARTITIONED_FOREIGN_KEYS, {"partition": f'"{name}"', "tables": partitioned}
+                )
+                for constraint in result.scalars().all():
+                    await conn.execute(text(f'ALTER TABLE "{name}" DROP CONSTRAINT "{constraint}"'))
+                if tablespace:
+                    await conn.execute(text(f'ALTER TABLE "{name}" SET TABLESPACE "{tablespace}"'))
+                logger.info("Detached partition %s", name)
+                detached.append(name)
+    return detached
+
+
+async def maintain_partitions() -> None:
+    await ensure_partitions(settings.ORDER_PARTITION_MONTHS_AHEAD)
+    if settings.ORDER_PARTITION_RETENTION_MONTHS is not None:
+        await detach_old_partitions(
+            settings.ORDER_PARTITION_RETENTION_MONTHS,
+            settings.ORDER_PARTITION_ARCHIVE_TABLESPACE,
+        )
+
+
+async def run_partition_maintenance(interval: float) -> None:
+    """Maintain partitions forever, sleeping `interval` seconds between runs."""
+    logger.info("Partition maintenance started (interval=%ss)", interval)
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception:
+            logger.exception("Partition maintenance failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(maintain_partitions())
@@ -0,0 +1,243 @@
+"""
+Durable background job queue on the `job` table.
+
+Producers call `enqueue` inside their own transaction, so a job only becomes
+visible if the work that scheduled it commits. Workers claim batches with
+FOR UPDATE SKIP LOCKED, so any number of them can poll the same table
+without blocking each other or running a job twice. A claimed job stays
+locked until it finishes: its worker refreshes locked_at while the batch
+runs, so only a dead worker's jobs pass JOB_LOCK_TIMEOUT_SECONDS and are
+claimed again.
+"""
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import bindparam, delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.models.job import Job, JobPriority, JobStatus
+from db.session import AsyncSessionLocal
+from utils.ids import uuid7
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def task(name: str) -> Callable[[JobHandler], JobHandler]:
+    """Register an async function as the handler for jobs called `name`."""
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        if name in _handlers:
+            raise ValueError(f"Duplicate job handler: {name}")
+        _handlers[name] = handler
+        return handler
+
+    return decorator
+
+
+async def enqueue(
+    db: AsyncSession,
+    name: str,
+    payload: dict[str, Any] | None = None,
+    priority: JobPriority = JobPriority.NORMAL,
+    run_at: datetime | None = None,
+    max_attempts: int = 5,
+) -> uuid.UUID:
+    """Add a job in the caller's transaction. Does not commit."""
+    job_id = uuid7()
+    values = {
+        "id": job_id,
+        "name": name,
+        "payload": payload or {},
+        "status": JobStatus.PENDING,
+        "priority": priority,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "is_deleted": False,
+    }
+    if run_at is not None:
+        values["run_at"] = run_at
+    await db.execute(insert(Job).values(**values))
+    return job_id
+
+
+class Worker:
+    """
+    Runs `concurrency` claim loops in one process. Each loop claims up to
+    `batch_size` due jobs at a time, runs them one after another, then
+    deletes the successes in one statement and reschedules failures with
+    exponential backoff. Small batches keep a slow job from holding up the
+    rest of its batch while other loops sit idle.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.JOB_WORKER_CONCURRENCY,
+        batch_size: int = settings.JOB_BATCH_SIZE,
+        priorities: list[int] | None = None,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+    ):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.priorities = priorities
+        self.poll_interval = poll_interval
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _claim_statement(self):
+        stale_before = func.now() - func.make_interval(
+            0, 0, 0, 0, 0, 0, settings.JOB_LOCK_TIMEOUT_SECONDS
+        )
+        due = (
+            select(Job.id)
+            .where(
+                or_(
+                    (Job.status == JobStatus.PENDING) & (Job.run_at <= func.now()),
+                    # Jobs left running by a worker that died
+                    (Job.status == JobStatus.RUNNING) & (Job.locked_at < stale_before),
+                )
+            )
+            .order_by(Job.priority, Job.run_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            # Keep FROM job; it would otherwise correlate to the UPDATE target
+            .correlate(None)
+        )
+        if self.priorities is not None:
+            due = due.where(Job.priority.in_(self.priorities))
+
+        return (
+            update(Job)
+            .where(Job.id.in_(due.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_at=func.now(),
+            )
+            .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _claim(self) -> list:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(self._claim_statement())
+            jobs = result.all()
+            await session.commit()
+        return jobs
+
+    async def _finish(self, succeeded: list[uuid.UUID], failed: list[dict[str, Any]]) -> None:
+        async with AsyncSessionLocal() as session:
+            if succeeded:
+                await session.execute(delete(Job).where(Job.id.in_(succeeded)))
+            if failed:
+                # Core table statement so the list of params runs as one executemany
+                job_table = Job.__table__
+                # Retry after base * 2^(attempts - 1) seconds, or give up
+                backoff = func.make_interval(
+                    0, 0, 0, 0, 0, 0,
+                    settings.JOB_RETRY_BASE_SECONDS * func.power(2, job_table.c.attempts - 1),
+                )
+                await session.execute(
+                    update(job_table)
+                    .where(job_table.c.id == bindparam("job_id"))
+                    .values(
+                        status=bindparam("new_status"),
+                        last_error=bindparam("error"),
+                        run_at=func.now() + backoff,
+                        locked_at=None,
+                    ),
+                    failed,
+                )
+            await session.commit()
+
+    async def _refresh_locks(self, claims: list[tuple[uuid.UUID, int]]) -> None:
+        """
+        Touch locked_at of a claimed batch, as (id, attempts) pairs, every
+        third of the lock timeout until cancelled. The attempt count identifies
+        this claim, so a job that was reclaimed elsewhere is left alone.
+        """
+        while True:
+            await asyncio.sleep(settings.JOB_LOCK_TIMEOUT_SECONDS / 3)
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(
+                        update(Job)
+                        .where(
+                            Job.status == JobStatus.RUNNING,
+                            tuple_(Job.id, Job.attempts).in_(claims),
+                        )
+                        .values(locked_at=func.now())
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to refresh job locks")
+
+    async def _run_batch(self, jobs: list) -> None:
+        succeeded: list[uuid.UUID] = []
+        failed: list[dict[str, Any]] = []
+        # Jobs stay RUNNING until _finish commits, finished ones included, so
+        # the whole batch is kept locked until then
+        heartbeat = asyncio.create_task(
+            self._refresh_locks([(job.id, job.attempts) for job in jobs])
+        )
+        try:
+            for job in jobs:
+                handler = _handlers.get(job.name)
+                try:
+                    if handler is None:
+                        raise LookupError(f"No handler registered for job {job.name!r}")
+                    await handler(job.payload)
+                except Exception as e:
+                    exhausted = job.attempts >= job.max_attempts
+                    logger.warning(
+                        "Job failed: job_id=%s, name=%s, attempt=%d, giving_up=%s",
+                        job.id, job.name, job.attempts, exhausted,
+                        exc_info=True,
+                    )
+                    failed.append(
+                        {
+                            "job_id": job.id,
+                            "new_status": JobStatus.FAILED if exhausted else JobStatus.PENDING,
+                            "error": f"{type(e).__name__}: {e}"[:2000],
+                        }
+                    )
+                else:
+                    succeeded.append(job.id)
+            await self._finish(succeeded, failed)
+        finally:
+            heartbeat.cancel()
+
+    async def _loop(self, index: int) -> None:
+        while not self._stopping.is_set():
+            try:
+                jobs = await self._claim()
+                if jobs:
+                    await self._run_batch(jobs)
+            except Exception:
+                logger.exception("Job worker loop %d failed", index)
+                jobs = []
+            # A full batch means there is probably more waiting; poll again at once
+            if len(jobs) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def run(self) -> None:
+        logger.info(
+            "Job worker started: concurrency=%d, batch_size=%d, priorities=%s",
+            self.concurrency, self.batch_size, self.priorities,
+        )
+        await asyncio.gather(*(self._loop(i) for i in range(self.concurrency)))
+        logger.info("Job worker stopped")
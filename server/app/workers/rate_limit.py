@@ -0,0 +1,48 @@
+"""
+Purges idle rate limit buckets (see middleware.rate_limit) from Postgres.
+
+Only needed with RATE_LIMIT_BACKEND="postgres"; the in-memory backend prunes
+itself. Run standalone with `python -m workers.rate_limit`, or let the job
+worker schedule it (see workers.scheduler). A bucket that has refilled
+completely carries no state, so deleting it only costs the next request an
+insert.
+"""
+import asyncio
+import logging
+
+from core.config import settings
+from db.session import engine
+from middleware.rate_limit import PostgresRateLimitBackend
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_idle_rate_limit_buckets(batch_size: int) -> int:
+    """Delete the buckets of every rule that have refilled. Returns buckets deleted."""
+    backend = PostgresRateLimitBackend(engine)
+    return await backend.purge(settings.RATE_LIMIT_RULES, batch_size)
+
+
+async def run_rate_limit_purger(interval: float, batch_size: int) -> None:
+    """Purge idle buckets forever, sleeping `interval` seconds between runs."""
+    logger.info("Rate limit bucket purger started (interval=%ss)", interval)
+    while True:
+        try:
+            purged = await purge_idle_rate_limit_buckets(batch_size)
+            if purged:
+                logger.info("Purged %d idle rate limit buckets", purged)
+        except Exception:
+            logger.exception("Rate limit bucket purge failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(
+        run_rate_limit_purger(
+            settings.RATE_LIMIT_PURGE_INTERVAL_SECONDS,
+            settings.RATE_LIMIT_PURGE_BATCH_SIZE,
+        )
+    )
@@ -0,0 +1,50 @@
+"""
+Rebuilds the co-purchase recommendation lists from order history.
+
+Run standalone with `python -m workers.recommendations`, or enqueue the
+`rebuild_recommendations` job. API workers only read the stored top-K lists
+(cached in memory), so the matrix build never runs on a serving process.
+"""
+import asyncio
+import logging
+import time
+
+from core.config import settings
+from db.session import AsyncSessionLocal
+from services.recommendations import RecommendationService
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_recommendations() -> int:
+    """Recompute and store every product's top-K. Returns rows written."""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        written = await RecommendationService(session).rebuild(
+            settings.RECOMMENDATIONS_TOP_K,
+            settings.RECOMMENDATIONS_MIN_CO_COUNT,
+        )
+    logger.info(
+        "Rebuilt recommendations: %d rows in %.1f s",
+        written,
+        time.perf_counter() - started,
+    )
+    return written
+
+
+async def run_recommendation_rebuilder(interval: float) -> None:
+    """Rebuild recommendations forever, sleeping `interval` seconds between runs."""
+    logger.info("Recommendation rebuilder started (interval=%ss)", interval)
+    while True:
+        try:
+            await rebuild_recommendations()
+        except Exception:
+            logger.exception("Recommendation rebuild failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(run_recommendation_rebuilder(settings.RECOMMENDATIONS_REBUILD_INTERVAL_SECONDS))
@@ -0,0 +1,67 @@
+"""
+Releases expired stock reservations in batches.
+
+Run standalone with `python -m workers.reservations`, or let the job worker
+schedule it (RESERVATION_SWEEPER_ENABLED, see workers.scheduler). Several
+sweepers can run at once: each batch is claimed with FOR UPDATE SKIP LOCKED,
+so they never block on or double-release the same rows.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import func, select
+
+from core.config import settings
+from db.models.stock_reservation import StockReservation
+from db.session import AsyncSessionLocal
+from services.inventory import InventoryService
+
+logger = logging.getLogger(__name__)
+
+
+async def release_expired_reservations(batch_size: int) -> int:
+    """Release expired holds batch by batch. Returns the number of batches run."""
+    batches = 0
+    while True:
+        expired_ids = (
+            select(StockReservation.id)
+            .where(StockReservation.expires_at < func.now())
+            .order_by(StockReservation.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            # Keep FROM stock_reservation; it would otherwise correlate to the DELETE target
+            .correlate(None)
+        )
+        async with AsyncSessionLocal() as session:
+            released = await InventoryService(session).release(
+                StockReservation.id.in_(expired_ids.scalar_subquery())
+            )
+            await session.commit()
+        if released == 0:
+            return batches
+        batches += 1
+
+
+async def run_reservation_sweeper(interval: float, batch_size: int) -> None:
+    """Sweep expired reservations forever, sleeping `interval` seconds between runs."""
+    logger.info("Reservation sweeper started (interval=%ss)", interval)
+    while True:
+        try:
+            batches = await release_expired_reservations(batch_size)
+            if batches:
+                logger.info("Released expired reservations in %d batch(es)", batches)
+        except Exception:
+            logger.exception("Reservation sweep failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(
+        run_reservation_sweeper(
+            settings.RESERVATION_SWEEP_INTERVAL_SECONDS,
+            settings.RESERVATION_SWEEP_BATCH_SIZE,
+        )
+    )
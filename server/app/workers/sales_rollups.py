@@ -0,0 +1,162 @@
+"""
+Keeps the daily sales rollups current (see services.sales_rollup).
+
+    python -m workers.sales_rollups                                   # refresh loop
+    python -m workers.sales_rollups backfill --start 2025-01-01 --end 2026-10-19
+    python -m workers.sales_rollups benchmark --start 2026-01-01 --end 2026-10-19
+
+The job worker also enqueues a refresh every SALES_ROLLUP_INTERVAL_SECONDS
+when SALES_ROLLUP_ENABLED is set (see workers.scheduler); the watermark row
+lock keeps concurrent refreshers from overlapping. `backfill`
+rebuilds a date range from raw orders, for history older than the rollup
+tables or after changing SALES_ROLLUP_TIMEZONE. `benchmark` times the admin
+report queries against the same aggregates computed from order_item.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date
+
+from sqlalchemy import func
+
+from core.config import settings
+from db.models.order import Order
+from db.models.order_item import OrderItem
+from db.models.product import Product
+from db.session import AsyncSessionLocal, engine
+from services.sales_rollup import SalesRollupService, counted_orders, order_day, today
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_sales_rollups() -> int:
+    """Rebuild the days changed since the last run. Returns days rebuilt."""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        rebuilt = await SalesRollupService(session).refresh(settings.SALES_ROLLUP_LAG_SECONDS)
+    if rebuilt:
+        logger.info(
+            "Refreshed sales rollups: %d days in %.1f ms",
+            rebuilt,
+            (time.perf_counter() - started) * 1000,
+        )
+    return rebuilt
+
+
+async def backfill_sales_rollups(
+    start: date,
+    end: date,
+    days_per_batch: int = settings.SALES_ROLLUP_BACKFILL_DAYS_PER_BATCH,
+) -> int:
+    """Rebuild every day from start to end inclusive. Returns days rebuilt."""
+    async with AsyncSessionLocal() as session:
+        return await SalesRollupService(session).backfill(start, end, days_per_batch)
+
+
+async def run_sales_rollup_refresher(interval: float) -> None:
+    """Refresh the rollups forever, sleeping `interval` seconds between runs."""
+    logger.info("Sales rollup refresher started (interval=%ss)", interval)
+    while True:
+        try:
+            await refresh_sales_rollups()
+        except Exception:
+            logger.exception("Sales rollup refresh failed")
+        await asyncio.sleep(interval)
+
+
+async def benchmark(start: date, end: date, repeat: int, limit: int) -> None:
+    """Print median latencies of each report from the rollups and from raw order lines."""
+    day = order_day()
+    lines = counted_orders(start, end)
+    raw = {
+        "daily": lines.add_columns(
+            day,
+            func.count(func.distinct(Order.id)),
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.total_price),
+        )
+        .group_by(day)
+        .order_by(day),
+        "categories": lines.add_columns(
+            Product.category_id,
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.total_price),
+        )
+        .join(Product, Product.id == OrderItem.product_id)
+        .group_by(Product.category_id)
+        .order_by(func.sum(OrderItem.total_price).desc())
+        .limit(limit),
+        "products": lines.add_columns(
+            OrderItem.product_id,
+            func.count(func.distinct(Order.id)),
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.total_price),
+        )
+        .group_by(OrderItem.product_id)
+        .order_by(func.sum(OrderItem.total_price).desc())
+        .limit(limit),
+    }
+
+    async def median_ms(run: Callable[[], Awaitable[object]]) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    async with AsyncSessionLocal() as session:
+        service = SalesRollupService(session)
+        rollup = {
+            "daily": lambda: service.daily(start, end),
+            "categories": lambda: service.top_categories(start, end, limit),
+            "products": lambda: service.top_products(start, end, limit),
+        }
+        print(f"{'report':<12}{'rollup ms':>12}{'raw ms':>12}{'speedup':>10}")
+        for name, statement in raw.items():
+            rollup_ms = await median_ms(rollup[name])
+            raw_ms = await median_ms(lambda: session.execute(statement))
+            print(f"{name:<12}{rollup_ms:>12.2f}{raw_ms:>12.2f}{raw_ms / rollup_ms:>9.1f}x")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain the daily sales rollups.")
+    commands = parser.add_subparsers(dest="command")
+    backfill = commands.add_parser("backfill", help="Rebuild a range of days from raw orders")
+    bench = commands.add_parser("benchmark", help="Time rollup reads against raw aggregation")
+    for command in (backfill, bench):
+        command.add_argument("--start", type=date.fromisoformat, required=True)
+        command.add_argument("--end", type=date.fromisoformat, default=today())
+    backfill.add_argument(
+        "--days-per-batch",
+        type=int,
+        default=settings.SALES_ROLLUP_BACKFILL_DAYS_PER_BATCH,
+        help="Days rebuilt per transaction",
+    )
+    bench.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    bench.add_argument("--limit", type=int, default=20, help="Rows in the top-N reports")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        if args.command == "backfill":
+            rebuilt = await backfill_sales_rollups(args.start, args.end, args.days_per_batch)
+            logger.info("Backfilled %d days", rebuilt)
+        elif args.command == "benchmark":
+            await benchmark(args.start, args.end, args.repeat, args.limit)
+        else:
+            await run_sales_rollup_refresher(settings.SALES_ROLLUP_INTERVAL_SECONDS)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(main())
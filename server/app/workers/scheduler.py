@@ -0,0 +1,135 @@
+"""
+Enqueues the periodic maintenance jobs (reservation sweep, partition
+maintenance, purges, rollup refresh, search index rebuild) on the job queue.
+
+Every `python -m workers` process runs the scheduler next to its claim loops,
+so maintenance runs in the worker tier and never inside API workers. Each
+run is claimed by advancing the job's job_schedule row in the transaction
+that enqueues it: with several worker processes, the first to move
+next_run_at wins and the rest find the row no longer due. A job whose
+previous run is still pending or running is not enqueued again, so a slow or
+retrying job never piles up behind itself.
+"""
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Float, String, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+
+from core.config import settings
+from db.models.job import Job, JobSchedule, JobStatus
+from db.session import AsyncSessionLocal
+from services.search import semantic_index
+from workers.queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PeriodicJob:
+    name: str
+    interval: float
+    payload: dict[str, Any] | None = None
+    # Also due whenever this returns True, whatever next_run_at says
+    overdue: Callable[[], bool] | None = None
+
+
+def periodic_jobs() -> list[PeriodicJob]:
+    """The jobs to schedule under the current settings."""
+    jobs = []
+    if settings.RESERVATION_SWEEPER_ENABLED:
+        jobs.append(
+            PeriodicJob("release_expired_reservations", settings.RESERVATION_SWEEP_INTERVAL_SECONDS)
+        )
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        jobs.append(
+            PeriodicJob("maintain_partitions", settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+        )
+    if settings.IDEMPOTENCY_ENABLED:
+        jobs.append(
+            PeriodicJob("purge_idempotency_keys", settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+        )
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND == "postgres":
+        jobs.append(
+            PeriodicJob("purge_rate_limit_buckets", settings.RATE_LIMIT_PURGE_INTERVAL_SECONDS)
+        )
+    if settings.SALES_ROLLUP_ENABLED:
+        jobs.append(PeriodicJob("refresh_sales_rollups", settings.SALES_ROLLUP_INTERVAL_SECONDS))
+    if settings.SEMANTIC_SEARCH_ENABLED:
+        # Built at once when the index directory is empty, as on a first deploy
+        jobs.append(
+            PeriodicJob(
+                "rebuild_search_index",
+                settings.SEMANTIC_SEARCH_REBUILD_INTERVAL_SECONDS,
+                overdue=lambda: not semantic_index.published,
+            )
+        )
+    return jobs
+
+
+async def enqueue_due_jobs(jobs: list[PeriodicJob]) -> list[str]:
+    """Enqueue the jobs that are due and not already queued. Returns their names."""
+    if not jobs:
+        return []
+    by_name = {job.name: job for job in jobs}
+    names = sorted(by_name)
+    overdue = [job.name for job in jobs if job.overdue is not None and job.overdue()]
+    intervals = values(
+        column("name", String(100)), column("seconds", Float), name="intervals"
+    ).data([(name, by_name[name].interval) for name in names])
+
+    async with AsyncSessionLocal() as session:
+        # New jobs are due at once. Sorted, so concurrent schedulers lock rows in one order.
+        await session.execute(
+            insert(JobSchedule)
+            .values([{"name": name, "next_run_at": func.now()} for name in names])
+            .on_conflict_do_nothing(index_elements=[JobSchedule.name])
+        )
+        result = await session.execute(
+            update(JobSchedule)
+            .where(
+                JobSchedule.name == intervals.c.name,
+                or_(JobSchedule.next_run_at <= func.now(), JobSchedule.name.in_(overdue)),
+            )
+            .values(
+                next_run_at=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, intervals.c.seconds)
+            )
+            .returning(JobSchedule.name)
+            .execution_options(synchronize_session=False)
+        )
+        due = set(result.scalars().all())
+        if due:
+            queued = await session.scalars(
+                select(Job.name)
+                .where(
+                    Job.name.in_(due),
+                    Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+                )
+                .distinct()
+            )
+            due -= set(queued.all())
+        for name in sorted(due):
+            await enqueue(session, name, by_name[name].payload)
+        await session.commit()
+    if due:
+        logger.info("Scheduled jobs: %s", ", ".join(sorted(due)))
+    return sorted(due)
+
+
+async def run_scheduler(interval: float) -> None:
+    """Enqueue due periodic jobs forever, checking every `interval` seconds."""
+    jobs = periodic_jobs()
+    logger.info(
+        "Job scheduler started (interval=%ss, jobs=%s)",
+        interval,
+        ", ".join(job.name for job in jobs) or "none",
+    )
+    while True:
+        try:
+            await enqueue_due_jobs(jobs)
+        except Exception:
+            logger.exception("Job scheduling failed")
+        await asyncio.sleep(interval)
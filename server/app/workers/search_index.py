@@ -0,0 +1,141 @@
+"""
+Builds the semantic search index and keeps serving workers current.
+
+    python -m workers.search_index                         # rebuild loop
+    python -m workers.search_index benchmark --products 100000
+
+The full rebuild (the loop above, or the `rebuild_search_index` job that
+workers.scheduler enqueues daily, and at once while no version is published)
+refits vocabulary and projection and publishes a new index version. Each API
+worker runs the refresher from its lifespan: it maps new versions as they
+appear and folds in products edited since the last build, but never builds.
+`benchmark` times queries against a synthetic catalog.
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+from core.config import settings
+from db.session import AsyncSessionLocal, engine
+from services.search import ProductSearchService
+from services.semantic_index import SemanticIndex, build_index
+
+logger = logging.getLogger(__name__)
+
+# Synthetic catalog for `benchmark`
+_BENCHMARK_TERMS = 20_000
+_BENCHMARK_DOCUMENT_TERMS = 40
+
+
+async def rebuild_search_index() -> str | None:
+    """Embed every active product and publish a new index version."""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        product_ids, documents, watermark = await ProductSearchService(session).load_documents()
+    if not product_ids:
+        logger.info("No active products; skipping semantic index build")
+        return None
+    version = await asyncio.to_thread(
+        build_index,
+        settings.SEMANTIC_SEARCH_INDEX_DIR,
+        product_ids,
+        documents,
+        settings.SEMANTIC_SEARCH_DIMENSIONS,
+        watermark,
+    )
+    logger.info("Rebuilt semantic index in %.1f s", time.perf_counter() - started)
+    return version
+
+
+async def run_search_index_rebuilder(interval: float) -> None:
+    """Rebuild the index forever, sleeping `interval` seconds between runs."""
+    logger.info("Semantic index rebuilder started (interval=%ss)", interval)
+    while True:
+        try:
+            await rebuild_search_index()
+        except Exception:
+            logger.exception("Semantic index rebuild failed")
+        await asyncio.sleep(interval)
+
+
+async def run_search_index_refresher(interval: float) -> None:
+    """Keep this process's semantic index current, every `interval` seconds."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                await ProductSearchService(session).refresh_semantic_index()
+        except Exception:
+            logger.exception("Semantic index refresh failed")
+        await asyncio.sleep(interval)
+
+
+def benchmark(products: int, queries: int, limit: int) -> None:
+    """Print build time and query latencies for a synthetic catalog of `products`."""
+    rng = random.Random(0)
+    terms = [f"t{i}" for i in range(_BENCHMARK_TERMS)]
+    # Zipf-like term frequencies, as in real product text
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(_BENCHMARK_TERMS)))
+    documents = [
+        " ".join(rng.choices(terms, cum_weights=weights, k=_BENCHMARK_DOCUMENT_TERMS))
+        for _ in range(products)
+    ]
+    product_ids = [uuid.uuid4() for _ in range(products)]
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        build_index(
+            directory,
+            product_ids,
+            documents,
+            settings.SEMANTIC_SEARCH_DIMENSIONS,
+            datetime.now(timezone.utc),
+        )
+        build_seconds = time.perf_counter() - started
+        index = SemanticIndex(directory)
+        index.load()
+        timings = []
+        for _ in range(queries):
+            query = " ".join(rng.choices(terms, cum_weights=weights, k=rng.randint(2, 5)))
+            started = time.perf_counter()
+            index.search(query, limit)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(
+        f"{products} products, {settings.SEMANTIC_SEARCH_DIMENSIONS} dims: "
+        f"build {build_seconds:.1f} s, query p50 {statistics.median(timings):.2f} ms, "
+        f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms, max {timings[-1]:.2f} ms"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build and serve the semantic search index.")
+    commands = parser.add_subparsers(dest="command")
+    bench = commands.add_parser("benchmark", help="Time queries against a synthetic catalog")
+    bench.add_argument("--products", type=int, default=100_000, help="Catalog size")
+    bench.add_argument("--queries", type=int, default=200, help="Queries to time")
+    bench.add_argument("--limit", type=int, default=20, help="Results per query")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        if args.command == "benchmark":
+            benchmark(args.products, args.queries, args.limit)
+        else:
+            await run_search_index_rebuilder(settings.SEMANTIC_SEARCH_REBUILD_INTERVAL_SECONDS)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    from core.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""Job handlers. Importing this module registers them with the queue."""
+from datetime import date
+from typing import Any
+
+from core.config import settings
+from workers.archival import archive_soft_deleted
+from workers.idempotency import purge_expired_idempotency_keys
+from workers.partitions import maintain_partitions
+from workers.queue import task
+from workers.rate_limit import purge_idle_rate_limit_buckets
+from workers.recommendations import rebuild_recommendations
+from workers.reservations import release_expired_reservations
+from workers.sales_rollups import backfill_sales_rollups, refresh_sales_rollups
+from workers.search_index import rebuild_search_index
+
+
+@task("release_expired_reservations")
+async def release_expired_reservations_task(payload: dict[str, Any]) -> None:
+    await release_expired_reservations(
+        payload.get("batch_size", settings.RESERVATION_SWEEP_BATCH_SIZE)
+    )
+
+
+@task("archive_soft_deleted")
+async def archive_soft_deleted_task(payload: dict[str, Any]) -> None:
+    await archive_soft_deleted(payload.get("batch_size", settings.ARCHIVE_BATCH_SIZE))
+
+
+@task("maintain_partitions")
+async def maintain_partitions_task(payload: dict[str, Any]) -> None:
+    await maintain_partitions()
+
+
+@task("rebuild_recommendations")
+async def rebuild_recommendations_task(payload: dict[str, Any]) -> None:
+    await rebuild_recommendations()
+
+
+@task("rebuild_search_index")
+async def rebuild_search_index_task(payload: dict[str, Any]) -> None:
+    await rebuild_search_index()
+
+
+@task("refresh_sales_rollups")
+async def refresh_sales_rollups_task(payload: dict[str, Any]) -> None:
+    await refresh_sales_rollups()
+
+
+@task("backfill_sales_rollups")
+async def backfill_sales_rollups_task(payload: dict[str, Any]) -> None:
+    await backfill_sales_rollups(
+        date.fromisoformat(payload["start"]),
+        date.fromisoformat(payload["end"]),
+        payload.get("days_per_batch", settings.SALES_ROLLUP_BACKFILL_DAYS_PER_BATCH),
+    )
+
+
+@task("purge_idempotency_keys")
+async def purge_idempotency_keys_task(payload: dict[str, Any]) -> None:
+    await purge_expired_idempotency_keys(
+        payload.get("batch_size", settings.IDEMPOTENCY_PURGE_BATCH_SIZE)
+    )
+
+
+@task("purge_rate_limit_buckets")
+async def purge_rate_limit_buckets_task(payload: dict[str, Any]) -> None:
+    await purge_idle_rate_limit_buckets(
+        payload.get("batch_size", settings.RATE_LIMIT_PURGE_BATCH_SIZE)
+    )
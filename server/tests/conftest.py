@@ -0,0 +1,24 @@
+"""
+Shared test setup.
+
+Unit tests need no services. Integration tests run against the Postgres
+database named by TEST_DATABASE_URL (postgresql+asyncpg://...), which they
+wipe and migrate; without it they are skipped. Never point it at a database
+you want to keep.
+"""
+import os
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# Settings are read at import time, so configure them before the app is imported
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("APP_ENV", "test")
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test")
+os.environ.setdefault("GOOGLE_REDIRECT_URI", "http://localhost/callback")
+# Count every request's statements; the query_budgets fixture fails tests that break a budget
+os.environ.setdefault("QUERY_BUDGET_ENABLED", "true")
@@ -0,0 +1,104 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+
+from tests.conftest import TEST_DATABASE_URL
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope="session")
+def database() -> str:
+    """Empty the test database and migrate it to head, once per session."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    import psycopg
+
+    dsn = TEST_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute("DROP SCHEMA public CASCADE")
+        conn.execute("CREATE SCHEMA public")
+    # Alembic's env.py runs its own event loop, so keep it out of pytest's
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=SERVER_DIR,
+        check=True,
+        capture_output=True,
+    )
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture(autouse=True)
+async def clean_database(database):
+    """Give every test empty tables and caches."""
+    from core.cache import clear_all
+    from db.session import engine
+
+    yield
+    async with engine.begin() as conn:
+        tables = await conn.scalars(
+            text(
+                "SELECT quote_ident(tablename) FROM pg_tables WHERE schemaname = 'public' "
+                "AND tablename NOT IN ('alembic_version', 'rollup_watermark')"
+            )
+        )
+        await conn.execute(text(f"TRUNCATE {', '.join(tables)} CASCADE"))
+    clear_all()
+
+
+@pytest.fixture(autouse=True)
+def query_budgets():
+    """
+    Fail the test if any request it makes breaks its endpoint's @query_budget
+    or repeats one statement shape (N+1). Yields the violations so far.
+    """
+    from middleware import query_budget
+
+    violations: list[str] = []
+
+    def record(request: str, found: list[str]) -> None:
+        violations.extend(f"{request}: {violation}" for violation in found)
+
+    query_budget.violation_handlers.append(record)
+    try:
+        yield violations
+    finally:
+        query_budget.violation_handlers.remove(record)
+    assert not violations, "Query budget violations:\n" + "\n".join(violations)
+
+
+@pytest.fixture
+async def db():
+    from db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def client():
+    import httpx
+
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def statements() -> list[str]:
+    """SQL statements sent through the app's engine while the test runs."""
+    from db.session import engine
+
+    captured: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        captured.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
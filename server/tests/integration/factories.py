@@ -0,0 +1,66 @@
+"""Rows for integration tests, committed so other sessions see them."""
+import uuid
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.address import Address, AddressType
+from db.models.category import Category
+from db.models.product import Product
+from db.models.users import User, UserRole
+from utils.tokens import create_access_token
+
+
+async def create_user(db: AsyncSession, role: UserRole = UserRole.USER) -> User:
+    user = User(name="Test User", email=f"{uuid.uuid4().hex}@example.com", role=role)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def create_address(db: AsyncSession, user: User) -> Address:
+    address = Address(
+        user_id=user.id,
+        type=AddressType.SHIPPING,
+        street="1 MG Road",
+        city="Bengaluru",
+        state="Karnataka",
+        postal_code="560001",
+    )
+    db.add(address)
+    await db.commit()
+    return address
+
+
+async def create_category(db: AsyncSession, name: str | None = None) -> Category:
+    name = name or f"Category {uuid.uuid4().hex[:8]}"
+    category = Category(name=name, slug=name.lower().replace(" ", "-"))
+    db.add(category)
+    await db.commit()
+    return category
+
+
+async def create_product(
+    db: AsyncSession,
+    category: Category,
+    name: str | None = None,
+    stock: int = 10,
+    price: str = "100.00",
+) -> Product:
+    suffix = uuid.uuid4().hex[:8]
+    name = name or f"Product {suffix}"
+    product = Product(
+        name=name,
+        slug=f"{name.lower().replace(' ', '-')}-{suffix}",
+        sku=f"SKU-{suffix}",
+        price=Decimal(price),
+        stock_quantity=stock,
+        category_id=category.id,
+    )
+    db.add(product)
+    await db.commit()
+    return product
+
+
+def auth_headers(user: User) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
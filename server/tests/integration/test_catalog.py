@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from db.models.product import Product
+from schemas.product import ProductBulkUpdateItem
+from services.catalog import CatalogService
+from tests.integration.factories import create_category, create_product
+
+
+async def test_bulk_update_without_compare_prices(db):
+    category = await create_category(db)
+    product = await create_product(db, category)
+
+    results = await CatalogService(db).bulk_update(
+        [
+            ProductBulkUpdateItem(sku=product.sku, price=Decimal("90.00"), stock_quantity=5),
+            ProductBulkUpdateItem(sku="missing", price=Decimal("1.00"), stock_quantity=1),
+        ]
+    )
+
+    assert [result.status for result in results] == ["updated", "not_found"]
+    row = (
+        await db.execute(
+            select(Product.price, Product.compare_price, Product.stock_quantity)
+            .where(Product.id == product.id)
+            .execution_options(populate_existing=True)
+        )
+    ).one()
+    assert row == (Decimal("90.00"), None, 5)
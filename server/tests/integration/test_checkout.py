@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+
+from db.models.order import Order
+from db.models.order_item import OrderItem
+from db.models.product import Product
+from db.session import AsyncSessionLocal, engine
+from services.cart import CartService
+from services.inventory import InsufficientStockError, InventoryService
+from services.order import OrderService
+from tests.integration.factories import (
+    create_address,
+    create_category,
+    create_product,
+    create_user,
+)
+
+BUYERS = 16
+
+
+async def _checkout(user, address) -> bool:
+    async with AsyncSessionLocal() as session:
+        try:
+            await OrderService(session).checkout(user.id, address.id)
+        except InsufficientStockError:
+            return False
+        return True
+
+
+async def test_parallel_checkouts_never_oversell(db):
+    category = await create_category(db)
+    scarce = await create_product(db, category, stock=5)
+    plentiful = await create_product(db, category, stock=1000)
+    buyers = []
+    for _ in range(BUYERS):
+        user = await create_user(db)
+        address = await create_address(db, user)
+        await CartService(db).add_item(user.id, scarce.id, 1)
+        await CartService(db).add_item(user.id, plentiful.id, 2)
+        buyers.append((user, address))
+
+    results = await asyncio.gather(*(_checkout(user, address) for user, address in buyers))
+
+    assert results.count(True) == 5
+    stock = dict((await db.execute(select(Product.id, Product.stock_quantity))).all())
+    assert stock[scarce.id] == 0
+    # A failed checkout writes nothing, not even the lines that were in stock
+    assert stock[plentiful.id] == 1000 - 2 * 5
+    assert await db.scalar(select(func.count()).select_from(Order)) == 5
+    assert await db.scalar(select(func.sum(OrderItem.quantity))) == 5 * 3
+
+
+async def test_checkout_with_short_line_raises(db):
+    category = await create_category(db)
+    product_id = (await create_product(db, category, stock=1)).id
+    user = await create_user(db)
+    user_id, address_id = user.id, (await create_address(db, user)).id
+    await CartService(db).add_item(user_id, product_id, 2)
+
+    with pytest.raises(InsufficientStockError) as excinfo:
+        await OrderService(db).checkout(user_id, address_id)
+    assert excinfo.value.product_ids == [product_id]
+    assert await db.scalar(select(Product.stock_quantity).where(Product.id == product_id)) == 1
+
+
+@pytest.fixture
+async def slow_product_updates(db):
+    """
+    Hold each product row lock for 0.2 s before updating it, with a catalog big
+    enough that updates join their input in order, as in production.
+    """
+    category = await create_category(db)
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE FUNCTION slow_product_update() RETURNS trigger LANGUAGE plpgsql "
+                "AS $$ BEGIN PERFORM pg_sleep(0.2); RETURN NEW; END $$"
+            )
+        )
+        await conn.execute(
+            text(
+                "CREATE TRIGGER slow_product_update BEFORE UPDATE ON product "
+                "FOR EACH ROW EXECUTE FUNCTION slow_product_update()"
+            )
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO product (id, name, slug, sku, price, stock_quantity, is_active, "
+                "category_id, is_deleted, reserved_quantity) "
+                "SELECT gen_random_uuid(), 'Filler ' || i, 'filler-' || i, 'FILLER-' || i, "
+                "1, 1, true, :category_id, false, 0 FROM generate_series(1, 5000) i"
+            ),
+            {"category_id": category.id},
+        )
+        await conn.execute(text("ANALYZE product"))
+    yield
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TRIGGER slow_product_update ON product"))
+        await conn.execute(text("DROP FUNCTION slow_product_update()"))
+
+
+async def test_stock_updates_sharing_products_in_opposite_order_do_not_deadlock(
+    db, slow_product_updates
+):
+    category = await create_category(db)
+    first = (await create_product(db, category, stock=10)).id
+    second = (await create_product(db, category, stock=10)).id
+    users = [await create_user(db) for _ in range(2)]
+    for user, order in zip(users, [(first, second), (second, first)]):
+        for product_id in order:
+            await CartService(db).add_item(user.id, product_id, 1)
+
+    async def decrement(lines):
+        async with AsyncSessionLocal() as session:
+            await InventoryService(session).decrement_stock(lines)
+            await session.commit()
+
+    async def reserve(user):
+        async with AsyncSessionLocal() as session:
+            await InventoryService(session).reserve_cart(user.id)
+
+    await asyncio.gather(decrement({first: 1, second: 1}), decrement({second: 1, first: 1}))
+    await asyncio.gather(*(reserve(user) for user in users))
+
+    rows = await db.execute(
+        select(Product.stock_quantity, Product.reserved_quantity)
+        .where(Product.id.in_([first, second]))
+        .execution_options(populate_existing=True)
+    )
+    assert rows.all() == [(8, 2), (8, 2)]
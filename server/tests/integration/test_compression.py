@@ -0,0 +1,28 @@
+import utils.compression
+from tests.integration.factories import create_category, create_product
+
+
+async def test_cached_product_list_is_compressed_once(db, client, monkeypatch):
+    category = await create_category(db)
+    for _ in range(30):
+        product = await create_product(db, category)
+        product.description = "Double-walled steel bottle that keeps drinks cold for a day. " * 3
+    await db.commit()
+
+    calls = []
+    compress = utils.compression.compress
+
+    def counting_compress(body: bytes, encoding: str) -> bytes:
+        calls.append(encoding)
+        return compress(body, encoding)
+
+    monkeypatch.setattr(utils.compression, "compress", counting_compress)
+
+    plain = await client.get("/api/products?limit=100", headers={"Accept-Encoding": "identity"})
+    for _ in range(3):
+        response = await client.get("/api/products?limit=100", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(plain.content) / 3
+        assert response.json() == plain.json()
+
+    assert calls == ["gzip"]
@@ -0,0 +1,68 @@
+import asyncio
+
+from services.cart import CartService
+from tests.integration.factories import auth_headers, create_category, create_product, create_user
+
+
+async def test_retry_replays_the_stored_response(client, db):
+    user = await create_user(db)
+    product = await create_product(db, await create_category(db))
+    headers = {**auth_headers(user), "Idempotency-Key": "add-1"}
+    body = {"product_id": str(product.id), "quantity": 2}
+
+    first = await client.post("/api/cart/items", json=body, headers=headers)
+    retry = await client.post("/api/cart/items", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    cart = await client.get("/api/cart", headers=auth_headers(user))
+    assert cart.json()["items"][0]["quantity"] == 2
+
+
+async def test_key_reused_for_a_different_request_is_rejected(client, db):
+    user = await create_user(db)
+    category = await create_category(db)
+    product, other = await create_product(db, category), await create_product(db, category)
+    headers = {**auth_headers(user), "Idempotency-Key": "add-1"}
+
+    first = await client.post(
+        "/api/cart/items", json={"product_id": str(product.id)}, headers=headers
+    )
+    reused = await client.post(
+        "/api/cart/items", json={"product_id": str(other.id)}, headers=headers
+    )
+
+    assert first.status_code == 200
+    assert reused.status_code == 422
+    cart = await client.get("/api/cart", headers=auth_headers(user))
+    assert [item["product_id"] for item in cart.json()["items"]] == [str(product.id)]
+
+
+async def test_concurrent_duplicate_waits_for_the_first_attempt(client, db, monkeypatch):
+    user = await create_user(db)
+    product = await create_product(db, await create_category(db))
+    headers = {**auth_headers(user), "Idempotency-Key": "add-1"}
+    body = {"product_id": str(product.id), "quantity": 1}
+    calls = 0
+    add_item = CartService.add_item
+
+    async def slow_add_item(self, *args):
+        nonlocal calls
+        calls += 1
+        # Keep the first attempt in flight while the duplicate arrives
+        await asyncio.sleep(0.3)
+        return await add_item(self, *args)
+
+    monkeypatch.setattr(CartService, "add_item", slow_add_item)
+    responses = await asyncio.gather(
+        *(client.post("/api/cart/items", json=body, headers=headers) for _ in range(2))
+    )
+
+    assert calls == 1
+    assert [r.status_code for r in responses] == [200, 200]
+    assert sorted(r.headers.get("Idempotent-Replayed", "") for r in responses) == ["", "true"]
+    assert responses[0].json() == responses[1].json()
+    cart = await client.get("/api/cart", headers=auth_headers(user))
+    assert cart.json()["items"][0]["quantity"] == 1
@@ -0,0 +1,108 @@
+import asyncio
+import re
+
+from sqlalchemy import select, update
+
+from db.models.order import Order
+from db.models.order_item import OrderItem
+from db.session import AsyncSessionLocal
+from services.cart import CartService
+from services.order import OrderService
+from tests.integration.factories import (
+    auth_headers,
+    create_address,
+    create_category,
+    create_product,
+    create_user,
+)
+
+
+async def _place_order(db, user, address, products) -> None:
+    for product in products:
+        await CartService(db).add_item(user.id, product.id, 1)
+    await OrderService(db).checkout(user.id, address.id)
+
+
+async def _history_statements(user_id, statements) -> int:
+    async with AsyncSessionLocal() as session:
+        statements.clear()
+        await OrderService(session).list_orders(user_id, 20)
+        return len(statements)
+
+
+async def test_order_history_query_count_is_independent_of_item_count(db, statements):
+    category = await create_category(db)
+    products = [await create_product(db, category) for _ in range(12)]
+
+    small = await create_user(db)
+    small_address = await create_address(db, small)
+    await _place_order(db, small, small_address, products[:1])
+
+    large = await create_user(db)
+    large_address = await create_address(db, large)
+    for _ in range(5):
+        await _place_order(db, large, large_address, products)
+
+    # Orders, their items, the items' products
+    assert await _history_statements(small.id, statements) == 3
+    assert await _history_statements(large.id, statements) == 3
+
+
+async def test_order_history_keeps_soft_deleted_products(db, client):
+    category = await create_category(db)
+    product = await create_product(db, category, name="Discontinued Kettle")
+    user = await create_user(db)
+    address = await create_address(db, user)
+    await _place_order(db, user, address, [product])
+    product.is_deleted = True
+    await db.commit()
+
+    history = await client.get("/api/orders", headers=auth_headers(user))
+    assert history.status_code == 200
+    (order,) = history.json()["orders"]
+    assert order["items"][0]["product"]["name"] == "Discontinued Kettle"
+
+    detail = await client.get(f"/api/orders/{order['id']}", headers=auth_headers(user))
+    assert detail.status_code == 200
+    assert detail.json()["items"][0]["product"]["name"] == "Discontinued Kettle"
+
+
+async def test_order_history_hides_soft_deleted_orders_and_items(db, client):
+    category = await create_category(db)
+    kept, removed = await create_product(db, category), await create_product(db, category)
+    user = await create_user(db)
+    address = await create_address(db, user)
+    await _place_order(db, user, address, [kept, removed])
+    await _place_order(db, user, address, [kept])
+    await db.execute(
+        update(OrderItem).where(OrderItem.product_id == removed.id).values(is_deleted=True)
+    )
+    newest = await db.scalar(select(Order.id).order_by(Order.created_at.desc()).limit(1))
+    await db.execute(update(Order).where(Order.id == newest).values(is_deleted=True))
+    await db.commit()
+
+    history = await client.get("/api/orders", headers=auth_headers(user))
+    (order,) = history.json()["orders"]
+    assert [item["product_id"] for item in order["items"]] == [str(kept.id)]
+
+
+async def test_concurrent_checkouts_get_distinct_sequential_order_numbers(db):
+    category = await create_category(db)
+    product = await create_product(db, category, stock=100)
+    buyers = []
+    for _ in range(10):
+        user = await create_user(db)
+        address = await create_address(db, user)
+        await CartService(db).add_item(user.id, product.id, 1)
+        buyers.append((user.id, address.id))
+
+    async def checkout(user_id, address_id) -> str:
+        async with AsyncSessionLocal() as session:
+            order = await OrderService(session).checkout(user_id, address_id)
+            return order.order_number
+
+    numbers = await asyncio.gather(*(checkout(*buyer) for buyer in buyers))
+
+    assert all(re.fullmatch(r"ORD-\d{6}-\d{6,}", number) for number in numbers)
+    sequence = sorted(int(number.rsplit("-", 1)[1]) for number in numbers)
+    assert sequence == list(range(sequence[0], sequence[0] + len(buyers)))
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, insert, select, text
+
+from db.models.order import Order, OrderStatus
+from db.models.order_item import OrderItem
+from db.partitions import PARTITIONED_TABLES, add_months, create_partition_sql, month_start, partition_name
+from db.session import engine
+from tests.integration.factories import create_address, create_category, create_product, create_user
+from utils.ids import uuid7
+from workers.partitions import detach_old_partitions
+
+
+@pytest.fixture
+async def old_month():
+    """A month two years back, partitioned; its partitions are dropped afterwards."""
+    month = add_months(month_start(datetime.now(timezone.utc)), -24)
+    async with engine.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            await conn.execute(text(create_partition_sql(table, month)))
+    yield month
+    async with engine.begin() as conn:
+        for table in reversed(list(PARTITIONED_TABLES)):
+            await conn.execute(text(f'DROP TABLE IF EXISTS "{partition_name(table, month)}"'))
+
+
+async def test_detach_old_partitions_detaches_referenced_order_partition(db, old_month):
+    category = await create_category(db)
+    product = await create_product(db, category)
+    user = await create_user(db)
+    address = await create_address(db, user)
+    created_at = datetime(old_month.year, old_month.month, 15, tzinfo=timezone.utc)
+    order_id = uuid7()
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Order).values(
+                id=order_id,
+                created_at=created_at,
+                user_id=user.id,
+                status=OrderStatus.DELIVERED,
+                total=Decimal("100.00"),
+                shipping_address_id=address.id,
+                is_deleted=False,
+            )
+        )
+        await conn.execute(
+            insert(OrderItem).values(
+                id=uuid7(),
+                order_id=order_id,
+                order_created_at=created_at,
+                product_id=product.id,
+                quantity=1,
+                unit_price=Decimal("100.00"),
+                total_price=Decimal("100.00"),
+                is_deleted=False,
+            )
+        )
+
+    detached = await detach_old_partitions(retention_months=12)
+
+    assert detached == [partition_name("order_item", old_month), partition_name("order", old_month)]
+    async with engine.connect() as conn:
+        assert await conn.scalar(select(func.count()).select_from(Order)) == 0
+        # The detached rows stay queryable in their own tables
+        archived = await conn.scalar(
+            text(f'SELECT count(*) FROM "{partition_name("order_item", old_month)}"')
+        )
+        assert archived == 1
+        # Its foreign key to the partitioned "order" went before that partition was detached
+        foreign_keys = await conn.scalar(
+            text(
+                "SELECT count(*) FROM pg_constraint "
+                "WHERE conrelid = CAST(:partition AS regclass) AND contype = 'f' "
+                "AND confrelid = CAST('\"order\"' AS regclass)"
+            ),
+            {"partition": f'"{partition_name("order_item", old_month)}"'},
+        )
+        assert foreign_keys == 0
@@ -0,0 +1,57 @@
+"""
+Every budgeted route, exercised once with data so the query_budgets fixture
+checks its @query_budget.
+"""
+from api.routes.products import get_all_products
+from db.models.users import UserRole
+from tests.integration.factories import auth_headers, create_category, create_product, create_user
+
+
+async def test_product_routes_stay_within_budget(client, db):
+    category = await create_category(db)
+    products = [await create_product(db, category, name=f"Steel Kettle {n}") for n in range(5)]
+
+    for path in [
+        "/api/products",
+        f"/api/products?category_id={category.id}&include=category",
+        "/api/products/search?q=kettle",
+        "/api/products/search?q=ketle",
+        f"/api/products/{products[0].id}",
+        f"/api/products/{products[0].id}/recommendations",
+    ]:
+        response = await client.get(path)
+        assert response.status_code == 200, path
+
+
+async def test_admin_routes_stay_within_budget(client, db):
+    admin = await create_user(db, role=UserRole.ADMIN)
+    category = await create_category(db)
+    products = [await create_product(db, category) for _ in range(3)]
+
+    response = await client.patch(
+        "/api/products/bulk",
+        json={
+            "items": [
+                {"sku": product.sku, "price": "90.00", "stock_quantity": 5}
+                for product in products
+            ]
+            + [{"sku": "missing", "price": "1.00", "stock_quantity": 1}]
+        },
+        headers=auth_headers(admin),
+    )
+    assert response.status_code == 200
+    for report in ("daily", "categories", "products"):
+        response = await client.get(f"/api/admin/sales/{report}", headers=auth_headers(admin))
+        assert response.status_code == 200, report
+
+
+async def test_over_budget_request_is_reported(client, db, query_budgets, monkeypatch):
+    monkeypatch.setattr(get_all_products, "__query_budget__", 0)
+    await create_product(db, await create_category(db))
+
+    response = await client.get("/api/products")
+
+    assert response.status_code == 200
+    assert query_budgets == ["GET /api/products: sent 1 statements, budget is 0"]
+    # Expected here; keep the fixture from failing the test
+    query_budgets.clear()
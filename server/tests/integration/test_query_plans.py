@@ -0,0 +1,35 @@
+import difflib
+
+import pytest
+
+from db.plan_check import BASELINE_PATH, SCENARIOS, collect_plans, parse_shapes, render_shapes
+
+
+@pytest.fixture(scope="module")
+async def plans(database):
+    """Plans of every scenario, seeded and collected once for the module."""
+    return await collect_plans()
+
+
+@pytest.mark.parametrize("scenario", [scenario.name for scenario in SCENARIOS])
+async def test_plan_checks(plans, scenario):
+    assert plans.failures[scenario] == []
+
+
+@pytest.mark.parametrize("scenario", [scenario.name for scenario in SCENARIOS])
+async def test_plan_matches_baseline(plans, scenario):
+    baseline = parse_shapes(BASELINE_PATH.read_text())
+    assert scenario in baseline, f"{scenario} is not in {BASELINE_PATH.name}"
+    expected = render_shapes({scenario: baseline[scenario]})
+    current = render_shapes({scenario: plans.shapes[scenario]})
+    diff = "".join(
+        difflib.unified_diff(
+            expected.splitlines(keepends=True),
+            current.splitlines(keepends=True),
+            fromfile="baseline",
+            tofile="current",
+        )
+    )
+    assert not diff, (
+        f"Plan changed; review it, then run `python -m db.plan_check --update`:\n{diff}"
+    )
@@ -0,0 +1,37 @@
+import asyncio
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from core.config import settings
+from db.models.job import Job
+from db.session import AsyncSessionLocal
+from workers import queue
+from workers.queue import Worker, enqueue
+
+
+async def test_batch_outlasting_the_lock_timeout_runs_each_job_once(monkeypatch):
+    runs = Counter()
+
+    async def slow_job(payload):
+        runs[payload["n"]] += 1
+        await asyncio.sleep(0.5)
+
+    monkeypatch.setitem(queue._handlers, "slow_job", slow_job)
+    # The batch takes 2 s, twice the timeout
+    monkeypatch.setattr(settings, "JOB_LOCK_TIMEOUT_SECONDS", 1)
+    async with AsyncSessionLocal() as session:
+        for n in range(4):
+            await enqueue(session, "slow_job", {"n": n})
+        await session.commit()
+
+    workers = [Worker(concurrency=1, batch_size=4, poll_interval=0.1) for _ in range(2)]
+    running = [asyncio.create_task(worker.run()) for worker in workers]
+    async with AsyncSessionLocal() as session:
+        while await session.scalar(select(func.count()).select_from(Job)):
+            await asyncio.sleep(0.1)
+    for worker in workers:
+        worker.stop()
+    await asyncio.gather(*running)
+
+    assert runs == {0: 1, 1: 1, 2: 1, 3: 1}
@@ -0,0 +1,43 @@
+from sqlalchemy import text
+
+from core.config import RateLimitRule
+from db.session import engine
+from middleware.rate_limit import PostgresRateLimitBackend
+
+RULES = [
+    RateLimitRule(prefix="/api/auth", rate=0.2, burst=10),
+    RateLimitRule(prefix="/api/products", rate=5, burst=30),
+]
+
+
+async def _age(key: str, seconds: float) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "UPDATE rate_limit_bucket "
+                "SET updated_at = clock_timestamp() - make_interval(secs => :seconds) "
+                "WHERE key = :key"
+            ),
+            {"key": key, "seconds": seconds},
+        )
+
+
+async def test_purge_deletes_only_refilled_buckets():
+    backend = PostgresRateLimitBackend(engine)
+    # /api/auth refills in 50 s, /api/products in 6 s; /api/old has no rule any more
+    ages = {
+        "/api/auth|ip:fresh": 10,
+        "/api/auth|ip:idle": 60,
+        "/api/products|ip:fresh": 1,
+        "/api/products|ip:idle": 10,
+        "/api/old|ip:a": 1,
+    }
+    for key, age in ages.items():
+        await backend.acquire(key, rate=1, burst=5)
+        await _age(key, age)
+
+    assert await backend.purge(RULES, batch_size=2) == 3
+
+    async with engine.connect() as conn:
+        remaining = await conn.scalars(text("SELECT key FROM rate_limit_bucket ORDER BY key"))
+        assert remaining.all() == ["/api/auth|ip:fresh", "/api/products|ip:fresh"]
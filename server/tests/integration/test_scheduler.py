@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy import delete, func, select, update
+
+from db.models.job import Job, JobSchedule, JobStatus
+from db.session import AsyncSessionLocal
+from workers.scheduler import PeriodicJob, enqueue_due_jobs
+
+JOBS = [PeriodicJob("sweep", 60), PeriodicJob("purge", 600, {"batch_size": 10})]
+
+
+async def queued_jobs() -> list[tuple[str, dict]]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Job.name, Job.payload).order_by(Job.name))
+        return [tuple(row) for row in result.all()]
+
+
+async def test_concurrent_schedulers_enqueue_each_due_job_once():
+    results = await asyncio.gather(*(enqueue_due_jobs(JOBS) for _ in range(4)))
+
+    assert sorted(name for names in results for name in names) == ["purge", "sweep"]
+    assert await queued_jobs() == [("purge", {"batch_size": 10}), ("sweep", {})]
+    async with AsyncSessionLocal() as session:
+        wait = await session.scalar(
+            select(JobSchedule.next_run_at - func.now()).where(JobSchedule.name == "purge")
+        )
+    assert 590 < wait.total_seconds() <= 600
+
+
+async def test_job_still_queued_is_not_enqueued_again():
+    assert await enqueue_due_jobs(JOBS) == ["purge", "sweep"]
+    async with AsyncSessionLocal() as session:
+        # The sweep finished; the purge is still running. Both are due again.
+        await session.execute(update(Job).where(Job.name == "purge").values(status=JobStatus.RUNNING))
+        await session.execute(delete(Job).where(Job.name == "sweep"))
+        await session.execute(update(JobSchedule).values(next_run_at=func.now()))
+        await session.commit()
+
+    assert await enqueue_due_jobs(JOBS) == ["sweep"]
+    assert await enqueue_due_jobs(JOBS) == []
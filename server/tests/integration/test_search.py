@@ -0,0 +1,17 @@
+from services.search import ProductSearchService
+from tests.integration.factories import create_category, create_product
+
+
+async def test_phonetic_ranks_in_sql_before_limiting(db):
+    category = await create_category(db)
+    for n in range(12):
+        await create_product(db, category, name=f"Philips Kettle {n}")
+    await create_product(db, category, name="Philips Trimmer")
+    await create_product(db, category, name="Philips")
+
+    service = ProductSearchService(db)
+    (best,) = await service.phonetic("Fillips trimmer", 1)
+    assert best.name == "Philips Trimmer"
+    # Equal overlap: the bare brand beats names that merely mention it
+    (best,) = await service.phonetic("Fillips", 1)
+    assert best.name == "Philips"
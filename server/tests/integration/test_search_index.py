@@ -0,0 +1,65 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import func, insert, select
+
+from core.config import settings
+from db.models.job import Job, JobSchedule
+from db.session import AsyncSessionLocal
+from services.search import semantic_index
+from tests.integration.factories import create_category, create_product
+from workers import tasks  # noqa: F401 - registers job handlers
+from workers.queue import Worker
+from workers.scheduler import enqueue_due_jobs, periodic_jobs
+
+
+async def test_first_start_schedules_one_index_build_then_serves_semantic_search(
+    db, client, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "SEMANTIC_SEARCH_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(semantic_index, "directory", tmp_path)
+    # Restored afterwards, so later tests see no index mapped
+    monkeypatch.setattr(semantic_index, "_build", None)
+    monkeypatch.setattr(semantic_index, "_overlay", None)
+    category = await create_category(db)
+    # The flasks share terms, so they span the index's strongest component
+    for name in (
+        "Insulated steel flask",
+        "Steel vacuum flask",
+        "Steel travel flask",
+        "Ceramic coffee mug",
+        "Cotton bath towel",
+    ):
+        await create_product(db, category, name=name)
+
+    unavailable = await client.get("/api/products/search", params={"q": "flask", "mode": "semantic"})
+    assert unavailable.status_code == 503
+
+    # The index directory is empty but the daily rebuild is not due, as after
+    # a deploy onto a fresh volume
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            insert(JobSchedule).values(
+                name="rebuild_search_index", next_run_at=func.now() + timedelta(days=1)
+            )
+        )
+        await session.commit()
+    jobs = [job for job in periodic_jobs() if job.name == "rebuild_search_index"]
+    # Every worker process's scheduler ticks at once; one build is enqueued
+    scheduled = await asyncio.gather(*(enqueue_due_jobs(jobs) for _ in range(3)))
+    assert sorted(scheduled) == [[], [], ["rebuild_search_index"]]
+
+    worker = Worker(concurrency=1, poll_interval=0.1)
+    running = asyncio.create_task(worker.run())
+    async with AsyncSessionLocal() as session:
+        while await session.scalar(select(func.count()).select_from(Job)):
+            await asyncio.sleep(0.1)
+    worker.stop()
+    await running
+    assert semantic_index.published
+    assert await enqueue_due_jobs(jobs) == []
+
+    semantic_index.load()
+    response = await client.get("/api/products/search", params={"q": "flask", "mode": "semantic"})
+    assert response.status_code == 200
+    assert "flask" in response.json()["products"][0]["name"]
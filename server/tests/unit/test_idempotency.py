@@ -0,0 +1,69 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from middleware.idempotency import IdempotencyMiddleware
+from utils.tokens import create_access_token
+
+
+class ClaimEverythingStore:
+    """Every claim succeeds, as when each attempt takes over an abandoned one."""
+
+    async def claim(self, user_id, key, request_hash):
+        return datetime.now(timezone.utc)
+
+    async def complete(self, user_id, key, claim, status_code, content_type, body):
+        pass
+
+    async def release(self, user_id, key, claim):
+        pass
+
+
+async def test_takeover_in_the_same_process_keeps_the_new_inflight_entry():
+    gates = [asyncio.Event(), asyncio.Event()]
+    started = asyncio.Queue()
+
+    async def app(scope, receive, send):
+        gate = gates[await started.get()]
+        await gate.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    middleware = IdempotencyMiddleware(app, paths=["/api/orders"], store=ClaimEverythingStore())
+    user_id = uuid.uuid4()
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/orders",
+        "query_string": b"",
+        "headers": [
+            (b"idempotency-key", b"k"),
+            (b"authorization", f"Bearer {create_access_token(user_id)}".encode()),
+        ],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def request(n):
+        await started.put(n)
+        await middleware(scope, receive, send)
+
+    first = asyncio.create_task(request(0))
+    await asyncio.sleep(0.01)
+    first_event = middleware._inflight[(user_id, "k")]
+    second = asyncio.create_task(request(1))
+    await asyncio.sleep(0.01)
+    second_event = middleware._inflight[(user_id, "k")]
+    assert second_event is not first_event
+
+    gates[0].set()
+    await first
+    # The first attempt must not remove the entry the second one installed
+    assert middleware._inflight[(user_id, "k")] is second_event
+    gates[1].set()
+    await second
+    assert middleware._inflight == {}
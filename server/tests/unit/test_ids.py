@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from utils.ids import uuid7, uuid7_time
+
+
+def test_uuid7_is_version_7_and_time_ordered():
+    ids = [uuid7() for _ in range(10_000)]
+
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in ids)
+    # Many share a millisecond; the counter keeps them in generation order
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_uuid7_time_round_trips():
+    before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    created = uuid7_time(uuid7())
+    assert before <= created <= datetime.now(timezone.utc)
+    assert uuid7_time(uuid.uuid4()) is None
@@ -0,0 +1,47 @@
+import pytest
+
+from utils.phonetics import phonetic_keys, search_keys
+
+# (catalog name, what speech-to-text heard)
+MISRECOGNITIONS = [
+    ("Philips", "Fillips"),
+    ("Nykaa", "Nikka"),
+    ("AirPods", "air pods"),
+    ("Xiaomi", "Shaomi"),
+    ("Skullcandy", "skull candy"),
+    ("Whirlpool", "Wirlpul"),
+    ("Knorr", "Nor"),
+    ("Samsung", "Samsang"),
+    ("boAt", "Bote"),
+    ("Lakme", "Lakmay"),
+    ("Prestige", "Presteej"),
+    ("Havells", "Havels"),
+    ("Bajaj", "Bajaaj"),
+    ("Tupperware", "Tapperwear"),
+    ("Pigeon", "Pijan"),
+    ("Nescafe", "Nescafay"),
+    ("Godrej", "Godrage"),
+    ("Milton", "Miltan"),
+]
+
+
+@pytest.mark.parametrize(("name", "heard"), MISRECOGNITIONS)
+def test_misheard_brand_shares_a_search_key_with_its_name(name, heard):
+    assert set(search_keys(heard)) & set(phonetic_keys(name))
+
+
+@pytest.mark.parametrize(
+    ("name", "heard"),
+    [("Philips", "Havels"), ("Samsung", "Milton"), ("Nykaa", "Nescafay"), ("Prestige", "Pigeon")],
+)
+def test_different_brands_share_no_key(name, heard):
+    assert not set(search_keys(heard)) & set(phonetic_keys(name))
+
+
+def test_search_keys_drop_short_keys_unless_nothing_longer():
+    assert search_keys("boat speaker") == ["ptspkr", "spkr"]
+    assert search_keys("Nikka") == ["nk"]
+
+
+def test_digits_must_match_exactly():
+    assert phonetic_keys("Galaxy S23") != phonetic_keys("Galaxy S24")
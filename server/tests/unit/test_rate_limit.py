@@ -0,0 +1,29 @@
+from core.config import RateLimitRule
+from middleware.rate_limit import InMemoryRateLimitBackend, RateLimitMiddleware
+
+
+async def test_prune_uses_each_buckets_own_rule(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("middleware.rate_limit.time.monotonic", lambda: now)
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    # Refills in 2 s and in 50 s respectively
+    await backend.acquire("/api/products/search|ip:a", rate=5, burst=10)
+    await backend.acquire("/api/auth|ip:a", rate=0.2, burst=10)
+
+    now += 10
+    await backend.acquire("/api/products/search|ip:b", rate=5, burst=10)
+
+    # The slow bucket is still refilling and keeps its state
+    assert set(backend._buckets) == {"/api/auth|ip:a", "/api/products/search|ip:b"}
+
+
+def test_rule_prefix_matches_whole_path_segments():
+    auth = RateLimitRule(prefix="/api/auth", rate=1, burst=1)
+    middleware = RateLimitMiddleware(None, rules=[auth], backend=InMemoryRateLimitBackend())
+
+    def match(path):
+        return middleware._match({"path": path, "query_string": b""})
+
+    assert match("/api/auth") is auth
+    assert match("/api/auth/google/login") is auth
+    assert match("/api/authors") is None
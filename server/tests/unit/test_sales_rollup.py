@@ -0,0 +1,17 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from api.routes.admin import _report_range
+from core.config import settings
+
+
+def test_report_range_defaults_to_today_in_the_rollup_timezone(monkeypatch):
+    ends = {}
+    # UTC+14 and UTC-11 are always on different calendar days
+    for zone in ("Pacific/Kiritimati", "Pacific/Pago_Pago"):
+        monkeypatch.setattr(settings, "SALES_ROLLUP_TIMEZONE", zone)
+        start, end = _report_range(None, None)
+        ends[zone] = end
+        assert end == datetime.now(ZoneInfo(zone)).date()
+        assert (end - start).days == 29
+    assert ends["Pacific/Kiritimati"] != ends["Pacific/Pago_Pago"]